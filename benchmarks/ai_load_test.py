@@ -0,0 +1,120 @@
+"""Offline load test of the /ask pipeline against the mock completions API.
+
+Starts benchmarks/mock_ai_server.py in-process, points main.ai_backend at
+it and fires many concurrent run_ai_request calls from distinct users
+spread over a few guilds. Discord is replaced by in-memory channels and
+messages, so everything up to the HTTP call to the model is the bot's
+real code path. Reports throughput, end-to-end latency and the peak
+number of concurrent upstream calls.
+
+    python benchmarks/ai_load_test.py --requests 300 --max-in-flight 16
+    python benchmarks/ai_load_test.py --requests 300 --distinct 10  # cache/coalescing
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MONGO_URI"] = ""  # keep load_dotenv from connecting to Atlas
+
+import main  # noqa: E402
+from mock_ai_server import make_app  # noqa: E402
+
+
+class FakeMessage:
+
+    async def edit(self, **kwargs):
+        pass
+
+    async def delete(self):
+        pass
+
+
+class FakeGuild:
+
+    def __init__(self, guild_id):
+        self.id = guild_id
+
+
+class FakeChannel:
+
+    def __init__(self, guild_id):
+        self.guild = FakeGuild(guild_id)
+
+    def typing(self):
+        return contextlib.nullcontext()
+
+
+async def fake_send(**kwargs):
+    return FakeMessage()
+
+
+async def one_request(i, args, latencies):
+    channel = FakeChannel(i % args.guilds)
+    prompt = f"Explain question number {i % args.distinct} about the weather today"
+    started = time.perf_counter()
+    result = await main.run_ai_request(10_000 + i, prompt, channel, fake_send)
+    if result is not None:
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args):
+    runner = web.AppRunner(make_app(args.latency, args.token_delay, args.tokens))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    main.ai_backend = main.AIBackend("mock", f"http://127.0.0.1:{args.port}/v1",
+                                     "mock-model", "load-test")
+    main.ai_admission = main.AdmissionController(args.max_in_flight)
+    await main.http_pool.start()
+
+    latencies = []
+    try:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*(one_request(i, args, latencies)
+                                   for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await main.http_pool.close()
+        stats = runner.app["stats"]
+        await runner.cleanup()
+
+    latencies.sort()
+    answered = len(latencies)
+    print(f"answered={answered}/{args.requests} total={elapsed:.2f}s "
+          f"throughput={answered / elapsed:.1f} req/s")
+    if latencies:
+        print(f"latency p50={latencies[answered // 2] * 1000:.0f}ms "
+              f"p95={latencies[int(answered * 0.95) - 1] * 1000:.0f}ms "
+              f"max={latencies[-1] * 1000:.0f}ms")
+    print(f"upstream calls={stats['requests']} "
+          f"peak concurrent={stats['max_in_flight']} "
+          f"(cap {args.max_in_flight})")
+    cache = main.ai_response_cache
+    print(f"response cache hits={cache.hits} coalesced={cache.coalesced} "
+          f"misses={cache.misses}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--distinct", type=int, default=10**9,
+                        help="number of distinct prompts (lower to exercise caching)")
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--port", type=int, default=8933)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main_cli()
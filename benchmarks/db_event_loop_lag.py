@@ -0,0 +1,84 @@
+"""Event-loop lag under concurrent commands: blocking pymongo vs run_db.
+
+Swaps the rates collection for a stand-in whose find_one sleeps like a slow
+Atlas round-trip, then fires a burst of concurrent "commands" while a probe
+task measures how late the loop wakes it up.
+
+    python benchmarks/db_event_loop_lag.py --commands 50 --latency 0.08
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MONGO_URI"] = ""  # keep load_dotenv from connecting to Atlas
+
+import main  # noqa: E402
+
+
+class SlowCollection:
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def find_one(self, query):
+        time.sleep(self.latency)
+        return {"guild_id": query["guild_id"], "payout_rate": 330.0}
+
+
+async def probe(lags, stop, interval=0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - expected)
+
+
+async def blocking_command(guild_id):
+    main.rates_collection.find_one({"guild_id": str(guild_id)})
+
+
+async def executor_command(guild_id):
+    await main.find_rates(guild_id)
+
+
+async def run(command, commands):
+    lags = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await asyncio.gather(*(command(i) for i in range(commands)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    lags.sort()
+    return {
+        "elapsed": elapsed,
+        "max_lag": lags[-1],
+        "p95_lag": lags[int(len(lags) * 0.95) - 1] if lags else 0.0,
+        "mean_lag": statistics.fmean(lags) if lags else 0.0,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.08)
+    args = parser.parse_args()
+
+    main.rates_collection = SlowCollection(args.latency)
+    for name, command in (("before (sync pymongo)", blocking_command),
+                          ("after (run_db)", executor_command)):
+        result = asyncio.run(run(command, args.commands))
+        print(f"{name:<22} total={result['elapsed'] * 1000:8.1f}ms "
+              f"max_lag={result['max_lag'] * 1000:8.1f}ms "
+              f"p95_lag={result['p95_lag'] * 1000:8.1f}ms "
+              f"mean_lag={result['mean_lag'] * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main_cli()
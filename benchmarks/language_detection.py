@@ -0,0 +1,162 @@
+"""Per-prompt cost and accuracy: langdetect.detect vs LanguageDetector.
+
+Runs a small corpus of Tagalog, English and Taglish prompts through plain
+langdetect (what get_language_instruction used to call) and through the
+preloaded, cached LanguageDetector, reporting time per prompt and how many
+prompts got the expected reply language. Taglish is expected to get a
+Tagalog reply; plain-ASCII Spanish, French, Indonesian and German must not
+be mistaken for English. A second check makes sure a user's remembered
+language only carries over to short follow-ups. --strict exits non-zero if
+LanguageDetector gets anything wrong.
+
+    python benchmarks/language_detection.py --rounds 200 --strict
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from langdetect import LangDetectException, detect
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MONGO_URI"] = ""  # keep load_dotenv from connecting to Atlas
+
+import main  # noqa: E402
+
+CORPUS = [
+    ("tl", "Paano ko ba malalaman kung tama ang sagot ko sa math?"),
+    ("tl", "Ano ang pinakamagandang gawin kapag wala akong pera ngayon?"),
+    ("tl", "Bakit hindi gumagana yung bot sa server namin?"),
+    ("tl", "Pwede mo ba akong tulungan sa assignment ko sa Filipino?"),
+    ("tl", "Saan ako pwedeng bumili ng murang robux dito sa Pilipinas?"),
+    ("tl", "Sino ang unang presidente ng Pilipinas at kailan siya naupo?"),
+    ("tl", "Gusto kong matuto mag code pero hindi ko alam kung saan magsisimula"),
+    ("tl", "Salamat po sa tulong ninyo kanina, ang galing talaga"),
+    ("en", "What is the best way to learn Python as a beginner?"),
+    ("en", "Can you explain how compound interest works?"),
+    ("en", "Write me a short poem about the rain in Manila."),
+    ("en", "How do I convert robux to pesos using the payout rate?"),
+    ("en", "Why is my Discord bot not responding to slash commands?"),
+    ("en", "Give me three ideas for a birthday gift for my sister."),
+    ("en", "What are the rules of basketball in the Philippines?"),
+    ("en", "Please summarize the plot of Noli Me Tangere for me."),
+    ("tl", "Can you help me po sa homework ko, hindi ko gets yung question"),
+    ("tl", "Bro ang hirap ng exam kanina, what should I do para pumasa?"),
+    ("tl", "Sobrang laggy ng game, paano ko ma-fix yung ping ko?"),
+    ("tl", "I need help with my resume, ano ba dapat ilagay sa skills?"),
+    ("tl", "Grabe yung traffic sa EDSA, any tips kung paano mag commute?"),
+    ("tl", "Pwede ba mag pay via GCash or bank transfer lang talaga?"),
+    ("tl", "Ano ang difference ng gift rate at payout rate sa group?"),
+    ("tl", "Nag error yung command, it says missing permissions daw"),
+    ("fr", "Je voudrais savoir la capitale"),
+    ("fr", "Bonjour, pouvez-vous m'aider avec mon devoir de maths?"),
+    ("fr", "Quelle est la meilleure facon d'apprendre le francais?"),
+    ("es", "como estas amigo mio hoy"),
+    ("es", "Hola, necesito ayuda con mi tarea de historia por favor"),
+    ("es", "Cual es la mejor manera de aprender a programar?"),
+    ("id", "Apa kabar, saya mau tanya tentang cara bayar"),
+    ("id", "Bagaimana cara membuat akun baru di aplikasi ini?"),
+    ("de", "Wie kann ich mein Passwort zuruecksetzen?"),
+    ("de", "Ich habe eine Frage zu meiner Bestellung von gestern"),
+]
+
+# (prompts from one user in order, expected language of the last reply)
+FOLLOW_UPS = [
+    (["Paano ko ba malalaman kung tama ang sagot ko?", "salamat po"], "tl"),
+    (["Paano ko ba malalaman kung tama ang sagot ko?",
+      "Ich habe eine Frage zu meiner Bestellung von gestern"], "de"),
+    (["Bakit hindi gumagana yung bot sa server namin?",
+      "What is the best way to learn Python as a beginner?"], "en"),
+]
+
+
+def bench(name, detect_fn, rounds):
+    wrong = [(label, text) for label, text in CORPUS if detect_fn(text) != label]
+    correct = len(CORPUS) - len(wrong)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for _, text in CORPUS:
+            detect_fn(text)
+    elapsed = time.perf_counter() - started
+    per_prompt = elapsed / (rounds * len(CORPUS)) * 1_000_000
+    print(f"{name:<28} {per_prompt:9.1f}us/prompt "
+          f"accuracy={correct}/{len(CORPUS)}")
+    return wrong
+
+
+def follow_up_errors(detector):
+    wrong = []
+    for user_id, (prompts, expected) in enumerate(FOLLOW_UPS):
+        for prompt in prompts:
+            got = detector.detect(prompt, user_id)
+        if got != expected:
+            wrong.append((expected, prompts[-1], got))
+    return wrong
+
+
+COLD_LANGDETECT = """
+import time
+from langdetect import detect
+started = time.perf_counter()
+detect("warm up the profiles")
+print((time.perf_counter() - started) * 1000)
+"""
+COLD_PRELOAD = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+os.environ["MONGO_URI"] = ""
+import main
+detector = main.LanguageDetector(main.LANGUAGE_CACHE_TTL)
+started = time.perf_counter()
+detector.preload()
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def cold_start_ms(snippet):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", snippet.format(root=root)],
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def plain_langdetect(text):
+    try:
+        return detect(text)
+    except LangDetectException:
+        return "en"
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--strict", action="store_true",
+                        help="exit 1 if LanguageDetector misdetects anything")
+    args = parser.parse_args()
+
+    # langdetect keeps its profiles in a process-wide factory, so each
+    # one-off cost is timed in its own fresh interpreter
+    print(f"langdetect first call (lazy profile load): "
+          f"{cold_start_ms(COLD_LANGDETECT):.1f}ms")
+    print(f"LanguageDetector.preload: {cold_start_ms(COLD_PRELOAD):.1f}ms")
+
+    detector = main.LanguageDetector(main.LANGUAGE_CACHE_TTL)
+    detector.preload()
+
+    bench("before (langdetect.detect)", plain_langdetect, args.rounds)
+    wrong = bench("after (LanguageDetector)", detector.detect, args.rounds)
+    print("after paths:", dict(detector.stats))
+    for label, text in wrong:
+        print(f"  expected {label}: {text}")
+
+    follow_ups = follow_up_errors(main.LanguageDetector(main.LANGUAGE_CACHE_TTL))
+    print(f"follow-ups correct={len(FOLLOW_UPS) - len(follow_ups)}/{len(FOLLOW_UPS)}")
+    for expected, text, got in follow_ups:
+        print(f"  expected {expected}, got {got}: {text}")
+    if args.strict and (wrong or follow_ups):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,78 @@
+"""Local stand-in for an OpenAI-style /v1/completions API.
+
+Answers both plain and `stream: true` requests (server-sent events, ending
+with `data: [DONE]`) after a configurable delay, so the AI pipeline can be
+exercised without spending real API credits. Point the bot at it with
+
+    AI_PROVIDER=mock python main.py
+
+after starting it with
+
+    python benchmarks/mock_ai_server.py --latency 0.5 --token-delay 0.02
+"""
+import argparse
+import asyncio
+import json
+
+from aiohttp import web
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do "
+         "eiusmod tempor incididunt ut labore et dolore magna aliqua").split()
+
+
+def make_app(latency=0.5, token_delay=0.02, tokens=60):
+    """`latency` is the time to the first token; every further token takes
+    `token_delay`. `app["stats"]` tracks request and concurrency counts."""
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def token(i):
+        return WORDS[i % len(WORDS)] + " "
+
+    async def completions(request):
+        body = await request.json()
+        count = min(tokens, int(body.get("max_tokens") or tokens))
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(latency)
+            if not body.get("stream"):
+                await asyncio.sleep(token_delay * (count - 1))
+                text = "".join(token(i) for i in range(count))
+                return web.json_response(
+                    {"model": body.get("model"), "choices": [{"text": text}]})
+
+            response = web.StreamResponse(
+                headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            for i in range(count):
+                if i:
+                    await asyncio.sleep(token_delay)
+                event = {"choices": [{"text": token(i)}]}
+                await response.write(f"data: {json.dumps(event)}\n\n".encode())
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+            return response
+        finally:
+            stats["in_flight"] -= 1
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_post("/v1/completions", completions)
+    return app
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8932)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--tokens", type=int, default=60)
+    args = parser.parse_args()
+    web.run_app(make_app(args.latency, args.token_delay, args.tokens),
+                host="127.0.0.1",
+                port=args.port)
+
+
+if __name__ == "__main__":
+    main_cli()
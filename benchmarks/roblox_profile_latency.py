@@ -0,0 +1,157 @@
+"""/roblox profile latency: sequential lookups vs the concurrent fan-out.
+
+Serves canned answers for every Roblox endpoint the command touches from a
+local server with a fixed per-request delay, routes the bot's HTTP pool to
+it, and times the old one-after-another sequence against
+main.fetch_roblox_profile. The user cache is reset before every run so both
+sides pay for resolving the user.
+
+    python benchmarks/roblox_profile_latency.py --runs 50 --latency 0.08
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MONGO_URI"] = ""  # keep load_dotenv from connecting to Atlas
+os.environ.setdefault("ROBLOX_COOKIE", "benchmark")
+
+import main  # noqa: E402
+
+USER = {
+    "id": 1,
+    "name": "builderman",
+    "displayName": "builderman",
+    "created": "2006-02-27T21:06:40.3Z",
+    "description": "Mock profile",
+    "hasVerifiedBadge": True,
+}
+RESPONSES = {
+    ("users.roblox.com", "/v1/usernames/users"): {
+        "data": [dict(USER, requestedUsername="builderman")]
+    },
+    ("users.roblox.com", "/v1/users/1"): USER,
+    ("presence.roblox.com", "/v1/presence/users"): {
+        "userPresences": [{
+            "userPresenceType": 2,
+            "placeId": 1818,
+            "lastOnline": "2024-01-01T00:00:00Z"
+        }]
+    },
+    ("games.roblox.com", "/v1/places/1818"): {"name": "Crossroads"},
+    ("thumbnails.roproxy.com", "/v1/users/avatar-headshot"): {
+        "data": [{"imageUrl": "https://example.invalid/headshot.png"}]
+    },
+    ("premiumfeatures.roblox.com", "/v1/users/1/validate-membership"): True,
+    ("friends.roblox.com", "/v1/users/1/friends/count"): {"count": 200},
+    ("friends.roblox.com", "/v1/users/1/followers/count"): {"count": 1000},
+    ("friends.roblox.com", "/v1/users/1/followings/count"): {"count": 5},
+}
+
+
+def make_app(latency):
+    async def handle(request):
+        await asyncio.sleep(latency)
+        body = RESPONSES.get((request.match_info["host"],
+                              "/" + request.match_info["path"]))
+        if body is None:
+            return web.json_response({"errors": []}, status=404)
+        return web.json_response(body)
+
+    app = web.Application()
+    app.router.add_route("*", "/{host}/{path:.*}", handle)
+    return app
+
+
+class LocalRobloxPool(main.HttpPool):
+    """The bot's pool, with https://<host>/<path> sent to the local mock."""
+
+    def __init__(self, port):
+        super().__init__()
+        self.base = f"http://127.0.0.1:{port}"
+
+    def _local(self, url):
+        return self.base + "/" + url.split("://", 1)[1]
+
+    def get(self, url, **kwargs):
+        return super().get(self._local(url), **kwargs)
+
+    def post(self, url, **kwargs):
+        return super().post(self._local(url), **kwargs)
+
+
+async def sequential_profile(user):
+    # The request order /roblox profile used before the fan-out
+    pool = main.http_pool
+    async with pool.post("https://users.roblox.com/v1/usernames/users",
+                         json={"usernames": [user]}) as resp:
+        user_id = (await resp.json())["data"][0]["id"]
+    async with pool.get(f"https://users.roblox.com/v1/users/{user_id}") as resp:
+        await resp.json()
+    async with pool.post("https://presence.roblox.com/v1/presence/users",
+                         json={"userIds": [user_id]}) as resp:
+        place_id = (await resp.json())["userPresences"][0]["placeId"]
+    async with pool.get(f"https://games.roblox.com/v1/places/{place_id}") as resp:
+        await resp.json()
+    async with pool.get(
+            f"https://thumbnails.roproxy.com/v1/users/avatar-headshot?userIds={user_id}"
+    ) as resp:
+        await resp.json()
+    async with pool.get(
+            f"https://premiumfeatures.roblox.com/v1/users/{user_id}/validate-membership"
+    ) as resp:
+        await resp.json()
+    friends_url = f"https://friends.roblox.com/v1/users/{user_id}"
+    async with pool.get(f"{friends_url}/friends/count") as r1, \
+            pool.get(f"{friends_url}/followers/count") as r2, \
+            pool.get(f"{friends_url}/followings/count") as r3:
+        await r1.json(), await r2.json(), await r3.json()
+
+
+async def concurrent_profile(user):
+    profile = await main.fetch_roblox_profile(user)
+    assert profile and profile["status"] == "In Game: Crossroads", profile
+
+
+async def measure(fetch, runs):
+    samples = []
+    for _ in range(runs):
+        main.roblox_users = main.RobloxUserCache()
+        started = time.perf_counter()
+        await fetch("builderman")
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2], samples[max(int(len(samples) * 0.95) - 1, 0)]
+
+
+async def run(args):
+    runner = web.AppRunner(make_app(args.latency))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    main.http_pool = LocalRobloxPool(args.port)
+    await main.http_pool.start()
+    try:
+        for name, fetch in (("before (sequential)", sequential_profile),
+                            ("after (fan-out)", concurrent_profile)):
+            p50, p95 = await measure(fetch, args.runs)
+            print(f"{name:<20} p50={p50 * 1000:7.1f}ms p95={p95 * 1000:7.1f}ms")
+    finally:
+        await main.http_pool.close()
+        await runner.cleanup()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.08)
+    parser.add_argument("--port", type=int, default=8934)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main_cli()
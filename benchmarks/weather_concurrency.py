@@ -0,0 +1,88 @@
+"""Concurrent /weather lookups: blocking requests.get vs fetch_json.
+
+Serves a fake WeatherAPI from a background thread with a fixed response
+delay, then fires a burst of concurrent lookups the way overlapping /weather
+commands would. Blocking calls serialize on the event loop; pooled async
+calls overlap, so the burst should finish in roughly one round-trip.
+
+    python benchmarks/weather_concurrency.py --commands 20 --latency 0.3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import requests
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MONGO_URI"] = ""  # keep load_dotenv from connecting to Atlas
+
+import main  # noqa: E402
+
+PAYLOAD = {
+    "location": {"name": "Manila", "region": "Metro Manila", "country": "Philippines"},
+    "current": {"temp_c": 31.0, "feelslike_c": 37.0, "humidity": 70},
+}
+
+
+def serve(latency, port, ready):
+    async def current(request):
+        await asyncio.sleep(latency)
+        return web.json_response(PAYLOAD)
+
+    async def start():
+        app = web.Application()
+        app.router.add_get("/v1/current.json", current)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(start())
+
+
+async def blocking_lookup(url, city):
+    requests.get(url, params={"key": "bench", "q": city}).json()
+
+
+async def async_lookup(url, city):
+    await main.fetch_json(url, params={"key": "bench", "q": city})
+
+
+async def run(lookup, url, commands):
+    await main.http_pool.start()
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(lookup(url, f"city{i}") for i in range(commands)))
+        return time.perf_counter() - started
+    finally:
+        await main.http_pool.close()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--port", type=int, default=8931)
+    args = parser.parse_args()
+
+    ready = threading.Event()
+    threading.Thread(target=serve,
+                     args=(args.latency, args.port, ready),
+                     daemon=True).start()
+    ready.wait()
+    url = f"http://127.0.0.1:{args.port}/v1/current.json"
+
+    for name, lookup in (("before (requests.get)", blocking_lookup),
+                         ("after (fetch_json)", async_lookup)):
+        elapsed = asyncio.run(run(lookup, url, args.commands))
+        print(f"{name:<22} total={elapsed * 1000:8.1f}ms "
+              f"per_command={elapsed / args.commands * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -2,17 +2,21 @@ import discord
 from discord import Embed, app_commands, Interaction, ui, ButtonStyle
 from discord.ext import commands, tasks
 import asyncio
-import requests
+import contextlib
 import os
+import functools
+import heapq
 import math
 import random
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 from dotenv import load_dotenv
 import certifi
-from pymongo import MongoClient, ASCENDING
+from pymongo import MongoClient, ASCENDING, DESCENDING, UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timedelta
 import pytz
-from langdetect import detect, LangDetectException
+from langdetect import detect_langs, DetectorFactory, LangDetectException
+from langdetect.detector_factory import init_factory
 from enum import Enum
 import aiohttp
 import json
@@ -21,6 +25,7 @@ import re
 from flask import Flask
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import pyktok as pyk
 from instaloader import Instaloader, Post, TwoFactorAuthRequiredException
 import tempfile
@@ -31,23 +36,129 @@ import psutil
 PH_TIMEZONE = pytz.timezone("Asia/Manila")
 load_dotenv()
 
+# ===========================
+# HTTP Session Pool
+# ===========================
+# Busy hosts get their own long-lived session so one slow API can't starve
+# the connection slots of another; everything else shares the default one.
+HTTP_HOST_LIMITS = {
+    "users.roblox.com": 20,
+    "groups.roblox.com": 20,
+    "thumbnails.roblox.com": 10,
+    "games.roblox.com": 10,
+    "api.together.xyz": 10,
+}
+HTTP_DEFAULT_LIMIT = 30
+HTTP_KEEPALIVE_SECONDS = 30
+HTTP_DNS_CACHE_SECONDS = 300
+
+
+# Long-lived aiohttp sessions keyed by host, opened in setup_hook and closed on
+# shutdown
+class HttpPool:
+
+    def __init__(self):
+        self.sessions = {}
+        self.default = None
+
+    def _session(self, limit):
+        connector = aiohttp.TCPConnector(limit=limit,
+                                         limit_per_host=limit,
+                                         ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+                                         keepalive_timeout=HTTP_KEEPALIVE_SECONDS)
+        # Requests carry other people's .ROBLOSECURITY cookies, so never let a
+        # Set-Cookie from one response ride along on the next request
+        return aiohttp.ClientSession(connector=connector,
+                                     cookie_jar=aiohttp.DummyCookieJar())
+
+    async def start(self):
+        if self.default is not None:
+            return
+        self.sessions = {
+            host: self._session(limit)
+            for host, limit in HTTP_HOST_LIMITS.items()
+        }
+        self.default = self._session(HTTP_DEFAULT_LIMIT)
+
+    def session_for(self, url):
+        return self.sessions.get(urlparse(url).hostname, self.default)
+
+    def get(self, url, **kwargs):
+        return self.session_for(url).get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.session_for(url).post(url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.session_for(url).patch(url, **kwargs)
+
+    async def close(self):
+        for session in [*self.sessions.values(), self.default]:
+            if session is not None and not session.closed:
+                await session.close()
+        self.sessions = {}
+        self.default = None
+
+
+http_pool = HttpPool()
+
+HTTP_FETCH_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3)
+HTTP_FETCH_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.5
+
+
+async def fetch_json(url, params=None, headers=None, timeout=None,
+                     retries=HTTP_FETCH_RETRIES):
+    # GET a JSON body, retrying timeouts, dropped connections, 429s and 5xxs
+    # with exponential backoff. Other statuses return their body as-is so
+    # callers can read API error payloads.
+    for attempt in range(retries + 1):
+        try:
+            async with http_pool.get(url,
+                                     params=params,
+                                     headers=headers,
+                                     timeout=timeout or HTTP_FETCH_TIMEOUT) as resp:
+                if (resp.status == 429 or resp.status >= 500) and attempt < retries:
+                    print(f"[HTTP] {urlparse(url).hostname} returned {resp.status}, retrying")
+                else:
+                    return await resp.json(content_type=None)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == retries:
+                raise
+            print(f"[HTTP] {urlparse(url).hostname} failed ({e!r}), retrying")
+        await asyncio.sleep(HTTP_RETRY_BACKOFF * 2**attempt)
+
+
 # ===========================
 # Bot Setup
 # ===========================
+class NeronielBot(commands.Bot):
+
+    async def setup_hook(self):
+        await http_pool.start()
+        await asyncio.to_thread(language_detector.preload)
+
+    async def close(self):
+        try:
+            await bot.giveaway_message_counts.flush()
+            await bot.giveaway_invite_counts.flush()
+        except Exception as e:
+            print(f"[!] Failed to flush giveaway counters on shutdown: {e}")
+        await flush_pending_turns()
+        await super().close()
+        await http_pool.close()
+
+
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
+bot = NeronielBot(command_prefix='!', intents=intents, help_command=None)
 
 # Rate limiting data
-bot.ask_rate_limit = defaultdict(list)
-bot.conversations = defaultdict(list)  # In-memory cache for AI conversation
 bot.last_message_id = {}  # Store last message IDs for threaded replies
-bot.ai_threads = {}
-bot.giveaway_message_counts = defaultdict(lambda: defaultdict(
-    int))  # Track giveaway message counts per user per channel
-bot.giveaway_invite_counts = defaultdict(lambda: defaultdict(int)) # Track per-giveaway active invites: {giveaway_id: {inviter_user_id_str: count}}
 bot.invited_user_map = {} # Map invited user → (giveaway_id, inviter_id) for leave tracking
+bot.active_giveaways = {}  # guild_id → {giveaway_id: requirements} for running giveaways
+bot.giveaway_queries_avoided = 0  # Messages answered from the index instead of MongoDB
 
 # ===========================
 # Flask Web Server to Keep Bot Alive
@@ -65,7 +176,6 @@ def run_server():
 
 
 server_thread = threading.Thread(target=run_server)
-server_thread.start()
 
 # ===========================
 # MongoDB Setup (with SSL Fix)
@@ -76,13 +186,20 @@ conversations_collection = None
 reminders_collection = None
 rates_collection = None
 giveaways_collection = None
+giveaway_counters_collection = None
+scheduled_jobs_collection = None
+conversation_summaries_collection = None
+ai_threads_collection = None
 
 mongo_uri = os.getenv("MONGO_URI")
+MONGO_POOL_SIZE = int(os.getenv("MONGO_POOL_SIZE") or "20")
 if not mongo_uri:
     print("[!] MONGO_URI not found in environment. MongoDB will be disabled.")
 else:
     try:
-        client = MongoClient(mongo_uri, tlsCAFile=certifi.where())
+        client = MongoClient(mongo_uri,
+                             tlsCAFile=certifi.where(),
+                             maxPoolSize=MONGO_POOL_SIZE)
         db = client.ai_bot
 
         # Initialize collections
@@ -90,16 +207,43 @@ else:
         reminders_collection = db.reminders
         rates_collection = db.rates
         giveaways_collection = db.giveaways
+        giveaway_counters_collection = db.giveaway_counters
+        scheduled_jobs_collection = db.scheduled_jobs
+        conversation_summaries_collection = db.conversation_summaries
+        ai_threads_collection = db.ai_threads
 
         # Create TTL indexes
         conversations_collection.create_index(
             "timestamp", expireAfterSeconds=604800)  # 7 days
-        reminders_collection.create_index(
-            "reminder_time", expireAfterSeconds=2592000)  # 30 days
+        # "Last N turns for a user" walks this index instead of sorting
+        conversations_collection.create_index([("user_id", ASCENDING),
+                                               ("timestamp", DESCENDING)])
+        conversation_summaries_collection.create_index("user_id", unique=True)
+        conversation_summaries_collection.create_index(
+            "updated_at", expireAfterSeconds=604800)  # 7 days
+        ai_threads_collection.create_index("expires_at", expireAfterSeconds=0)
+
+        # Reminders are deleted once delivered, so only undeliverable ones
+        # (parked with expire_at) may expire. The old TTL on reminder_time
+        # could silently drop reminders that were never sent.
+        reminder_indexes = reminders_collection.index_information()
+        if "expireAfterSeconds" in reminder_indexes.get("reminder_time_1", {}):
+            reminders_collection.drop_index("reminder_time_1")
+        reminders_collection.create_index("reminder_time")
+        reminders_collection.create_index("expire_at", expireAfterSeconds=0)
 
         # Create index for guild_id in rates collection
         rates_collection.create_index([("guild_id", ASCENDING)], unique=True)
 
+        # One counter document per (giveaway, kind, user)
+        giveaway_counters_collection.create_index([("giveaway_id", ASCENDING),
+                                                   ("kind", ASCENDING),
+                                                   ("user_id", ASCENDING)],
+                                                  unique=True)
+
+        # Scheduler jobs are loaded by due time
+        scheduled_jobs_collection.create_index("due_at")
+
         print("✅ Successfully connected to MongoDB")
     except Exception as e:
         print(f"[!] Failed to connect to MongoDB: {e}")
@@ -108,48 +252,599 @@ else:
         reminders_collection = None
         rates_collection = None
         giveaways_collection = None
+        giveaway_counters_collection = None
+        scheduled_jobs_collection = None
+        conversation_summaries_collection = None
+        ai_threads_collection = None
+
+
+# ===========================
+# Async Database Layer
+# ===========================
+# pymongo is blocking, so every query runs on a thread pool sized to the Mongo
+# connection pool. A slow Atlas round-trip then only parks a worker thread
+# instead of stalling the event loop (and the gateway heartbeat with it).
+db_executor = ThreadPoolExecutor(max_workers=MONGO_POOL_SIZE,
+                                 thread_name_prefix="mongo")
+
+
+async def run_db(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        db_executor, functools.partial(func, *args, **kwargs))
+
+
+# Conversations
+async def find_recent_turns(user_id, limit=5, after=None):
+    query_filter = {"user_id": user_id}
+    if after is not None:
+        query_filter["timestamp"] = {"$gt": after}
+
+    def query():
+        return list(
+            conversations_collection.find(query_filter, {
+                "prompt": 1,
+                "response": 1,
+                "timestamp": 1
+            }).sort([("user_id", ASCENDING),
+                     ("timestamp", DESCENDING)]).limit(limit))
+
+    return await run_db(query)
+
+
+async def insert_turns(turns):
+    await run_db(conversations_collection.insert_many, turns, ordered=False)
+
+
+async def delete_turns(user_id):
+    return await run_db(conversations_collection.delete_many,
+                        {"user_id": user_id})
+
+
+# Conversation summaries
+async def find_summary(user_id):
+    return await run_db(conversation_summaries_collection.find_one,
+                        {"user_id": user_id})
+
+
+async def save_summary(user_id, summary, summarized_until):
+    await run_db(conversation_summaries_collection.update_one,
+                 {"user_id": user_id}, {
+                     "$set": {
+                         "summary": summary,
+                         "summarized_until": summarized_until,
+                         "updated_at": datetime.now(PH_TIMEZONE)
+                     }
+                 },
+                 upsert=True)
+
+
+async def delete_summary(user_id):
+    await run_db(conversation_summaries_collection.delete_one,
+                 {"user_id": user_id})
+
+
+# AI threads
+async def save_ai_thread(thread_id, fields):
+    await run_db(ai_threads_collection.update_one, {"_id": thread_id},
+                 {"$set": fields},
+                 upsert=True)
+
+
+async def delete_ai_thread(thread_id):
+    await run_db(ai_threads_collection.delete_one, {"_id": thread_id})
+
+
+async def find_live_ai_threads(now):
+    return await run_db(lambda: list(
+        ai_threads_collection.find({"expires_at": {"$gt": now}})))
+
+
+# Reminders
+async def insert_reminder(reminder):
+    return (await run_db(reminders_collection.insert_one,
+                         reminder)).inserted_id
+
+
+async def find_due_reminders(now, limit):
+    def query():
+        return list(
+            reminders_collection.find(
+                {
+                    "reminder_time": {"$lte": now},
+                    "expire_at": {"$exists": False}
+                }, {
+                    "user_id": 1,
+                    "guild_id": 1,
+                    "channel_id": 1,
+                    "note": 1
+                }).sort("reminder_time", ASCENDING).limit(limit))
+
+    return await run_db(query)
+
+
+async def delete_reminders(reminder_ids):
+    await run_db(reminders_collection.delete_many,
+                 {"_id": {"$in": reminder_ids}})
+
+
+async def park_reminders(reminder_ids, expire_at):
+    await run_db(reminders_collection.update_many,
+                 {"_id": {"$in": reminder_ids}},
+                 {"$set": {"expire_at": expire_at}})
+
+
+async def find_pending_reminders():
+    def query():
+        return list(
+            reminders_collection.find({"expire_at": {"$exists": False}},
+                                      {"reminder_time": 1}))
+
+    return await run_db(query)
+
+
+# Rates
+async def find_rates(guild_id):
+    return await run_db(rates_collection.find_one, {"guild_id": str(guild_id)})
+
+
+async def find_all_rates():
+    return await run_db(lambda: list(rates_collection.find()))
+
+
+async def update_rates(guild_id, fields, upsert=False):
+    return await run_db(rates_collection.update_one,
+                        {"guild_id": str(guild_id)}, {"$set": fields},
+                        upsert=upsert)
 
 
-# Background Task: Check Reminders
-@tasks.loop(seconds=60)
-async def check_reminders():
+# Giveaways
+async def find_giveaway(giveaway_id):
+    return await run_db(giveaways_collection.find_one, {"_id": giveaway_id})
+
+
+async def find_active_giveaways(guild_id=None, requirement=None):
+    query = {"ended": {"$ne": True}}
+    if guild_id is not None:
+        query["guild_id"] = str(guild_id)
+    if requirement is not None:
+        query[requirement] = {"$ne": None}
+    return await run_db(lambda: list(giveaways_collection.find(query)))
+
+
+async def insert_giveaway(giveaway):
+    return (await run_db(giveaways_collection.insert_one,
+                         giveaway)).inserted_id
+
+
+async def update_giveaway(giveaway_id, fields):
+    return await run_db(giveaways_collection.update_one, {"_id": giveaway_id},
+                        {"$set": fields})
+
+
+async def add_giveaway_entry(giveaway_id, user_id):
+    # Single atomic write: only matches while the giveaway is open and the user
+    # isn't entered yet, so concurrent clicks can't lose or double-count entries.
+    # Returns the new entry count, or None if nothing was added.
+    result = await run_db(giveaways_collection.find_one_and_update,
+                          {"_id": giveaway_id,
+                           "ended": {"$ne": True},
+                           "entries": {"$ne": user_id}},
+                          {"$addToSet": {"entries": user_id},
+                           "$inc": {"entry_count": 1}},
+                          projection={"_id": 0, "entry_count": 1},
+                          return_document=ReturnDocument.AFTER)
+    return result["entry_count"] if result else None
+
+
+async def backfill_entry_counts():
+    # Giveaways created before entry_count existed get it from their entries
+    await run_db(giveaways_collection.update_many,
+                 {"ended": {"$ne": True}, "entry_count": {"$exists": False}},
+                 [{"$set": {"entry_count": {"$size": {"$ifNull": ["$entries", []]}}}}])
+
+
+# Giveaway counters
+async def find_giveaway_counters(kind, giveaway_ids):
+    def query():
+        return list(
+            giveaway_counters_collection.find(
+                {
+                    "giveaway_id": {
+                        "$in": giveaway_ids
+                    },
+                    "kind": kind
+                }, {
+                    "_id": 0,
+                    "giveaway_id": 1,
+                    "user_id": 1,
+                    "count": 1
+                }))
+
+    return await run_db(query)
+
+
+async def increment_giveaway_counters(operations):
+    return await run_db(giveaway_counters_collection.bulk_write,
+                        operations,
+                        ordered=False)
+
+
+async def delete_giveaway_counters(giveaway_id):
+    await run_db(giveaway_counters_collection.delete_many,
+                 {"giveaway_id": str(giveaway_id)})
+
+
+# Scheduled jobs
+async def upsert_job(job_id, kind, due_at, payload):
+    await run_db(scheduled_jobs_collection.replace_one, {"_id": job_id}, {
+        "kind": kind,
+        "due_at": due_at,
+        "payload": payload
+    },
+                 upsert=True)
+
+
+async def delete_job(job_id):
+    await run_db(scheduled_jobs_collection.delete_one, {"_id": job_id})
+
+
+async def find_all_jobs():
+    return await run_db(lambda: list(scheduled_jobs_collection.find()))
+
+
+
+# ===========================
+# Giveaway Counters
+# ===========================
+GIVEAWAY_COUNTER_FLUSH_SECONDS = int(
+    os.getenv("GIVEAWAY_COUNTER_FLUSH_SECONDS") or "15")
+# How long an ended giveaway's counters keep ignoring late events, e.g. from
+# a handler that was mid-await when it ended
+GIVEAWAY_COUNTER_DISCARD_SECONDS = 600
+
+
+# Giveaway requirement counters, flushed to MongoDB as batched $inc writes
+class GiveawayCounterStore:
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.counts = defaultdict(lambda: defaultdict(int))
+        self.pending = defaultdict(int)  # (giveaway_id, user_id) → unflushed delta
+        self.discarded = {}  # Ended giveaway_id → discarded at (monotonic)
+        self.lock = asyncio.Lock()
+
+    def get(self, giveaway_id, user_id):
+        giveaway_counts = self.counts.get(str(giveaway_id))
+        return giveaway_counts.get(str(user_id), 0) if giveaway_counts else 0
+
+    def add(self, giveaway_id, user_id, amount=1):
+        giveaway_id, user_id = str(giveaway_id), str(user_id)
+        if giveaway_id in self.discarded:
+            return
+        current = self.counts[giveaway_id][user_id]
+        delta = max(0, current + amount) - current
+        if delta:
+            self.counts[giveaway_id][user_id] = current + delta
+            self.pending[(giveaway_id, user_id)] += delta
+
+    async def discard(self, giveaway_id):
+        # Holding the lock waits out an in-flight flush, so once this returns
+        # nothing can upsert the giveaway's counters behind a delete
+        giveaway_id = str(giveaway_id)
+        async with self.lock:
+            self.discarded[giveaway_id] = time.monotonic()
+            self.counts.pop(giveaway_id, None)
+            for key in [k for k in self.pending if k[0] == giveaway_id]:
+                del self.pending[key]
+
+    async def flush(self):
+        cutoff = time.monotonic() - GIVEAWAY_COUNTER_DISCARD_SECONDS
+        for giveaway_id in [g for g, t in self.discarded.items() if t < cutoff]:
+            del self.discarded[giveaway_id]
+        if giveaway_counters_collection is None or not self.pending:
+            return
+        async with self.lock:
+            batch, self.pending = self.pending, defaultdict(int)
+            keys = [
+                key for key, delta in batch.items()
+                if delta and key[0] not in self.discarded
+            ]
+            if not keys:
+                return
+            operations = [
+                UpdateOne(
+                    {
+                        "giveaway_id": giveaway_id,
+                        "kind": self.kind,
+                        "user_id": user_id
+                    }, {"$inc": {
+                        "count": batch[(giveaway_id, user_id)]
+                    }},
+                    upsert=True)
+                for giveaway_id, user_id in keys
+            ]
+            try:
+                await increment_giveaway_counters(operations)
+            except BulkWriteError as e:
+                # Unordered write: every op not reported here was applied,
+                # so only these deltas may be retried
+                failed = [keys[error["index"]] for error in e.details["writeErrors"]]
+                for key in failed:
+                    self.pending[key] += batch[key]
+                print(f"[!] Failed to flush {len(failed)} {self.kind} counters: {e}")
+            except Exception as e:
+                # Keep the deltas so the next flush retries them
+                for key in keys:
+                    self.pending[key] += batch[key]
+                print(f"[!] Failed to flush {self.kind} counters: {e}")
+
+    async def load(self, giveaway_ids):
+        if giveaway_counters_collection is None or not giveaway_ids:
+            return
+        async with self.lock:
+            docs = await find_giveaway_counters(
+                self.kind, [str(gid) for gid in giveaway_ids])
+            for doc in docs:
+                key = (doc["giveaway_id"], doc["user_id"])
+                self.counts[key[0]][key[1]] = doc["count"] + self.pending.get(
+                    key, 0)
+
+
+bot.giveaway_message_counts = GiveawayCounterStore("messages")
+bot.giveaway_invite_counts = GiveawayCounterStore("invites")
+
+
+@tasks.loop(seconds=GIVEAWAY_COUNTER_FLUSH_SECONDS)
+async def flush_giveaway_counters():
+    await bot.giveaway_message_counts.flush()
+    await bot.giveaway_invite_counts.flush()
+
+
+# ===========================
+# Scheduler (giveaway endings, reminders, polls)
+# ===========================
+bot.background_tasks = set()
+
+
+# The loop only keeps weak references to tasks, so hold fire-and-forget ones
+# until they finish
+def spawn(coro):
+    task = asyncio.create_task(coro)
+    bot.background_tasks.add(task)
+    task.add_done_callback(bot.background_tasks.discard)
+    return task
+
+
+def to_utc(dt):
+    # MongoDB returns naive datetimes; everything we store is UTC
+    if dt.tzinfo is None:
+        return pytz.UTC.localize(dt)
+    return dt.astimezone(pytz.UTC)
+
+
+# One timer for every delayed job: a heap of due times mirrored to MongoDB
+class Scheduler:
+
+    def __init__(self):
+        self.handlers = {}
+        self.jobs = {}  # job_id → (due_ts, kind, payload)
+        self.heap = []  # (due_ts, job_id); stale entries are skipped lazily
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.loaded = False
+
+    def handler(self, kind):
+        def decorator(func):
+            self.handlers[kind] = func
+            return func
+
+        return decorator
+
+    def _push(self, job_id, kind, due_ts, payload):
+        self.jobs[job_id] = (due_ts, kind, payload)
+        heapq.heappush(self.heap, (due_ts, job_id))
+        if self.heap[0][1] == job_id:
+            self.wakeup.set()
+
+    async def schedule(self, kind, key, due_at, payload=None):
+        job_id = f"{kind}:{key}"
+        due_at = to_utc(due_at)
+        if scheduled_jobs_collection is not None:
+            await upsert_job(job_id, kind, due_at, payload)
+        self._push(job_id, kind, due_at.timestamp(), payload)
+
+    async def cancel(self, kind, key):
+        job_id = f"{kind}:{key}"
+        self.jobs.pop(job_id, None)
+        if scheduled_jobs_collection is not None:
+            await delete_job(job_id)
+
+    async def load(self):
+        if self.loaded or scheduled_jobs_collection is None:
+            return
+        # Only marked loaded on success, so a failed load is retried on the
+        # next on_ready
+        for job in await find_all_jobs():
+            self._push(job["_id"], job["kind"],
+                       to_utc(job["due_at"]).timestamp(), job.get("payload"))
+        self.loaded = True
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            while self.heap and self.jobs.get(
+                    self.heap[0][1], (None, ))[0] != self.heap[0][0]:
+                heapq.heappop(self.heap)
+            delay = self.heap[0][0] - time.time() if self.heap else None
+            if delay is None or delay > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, job_id = heapq.heappop(self.heap)
+            _, kind, payload = self.jobs.pop(job_id)
+            spawn(self._fire(job_id, kind, payload))
+
+    async def _fire(self, job_id, kind, payload):
+        try:
+            await self.handlers[kind](payload)
+        except Exception as e:
+            print(f"[SCHEDULER] Job {job_id} failed: {e}")
+        # Keep the document if the job was rescheduled while it ran
+        if scheduled_jobs_collection is not None and job_id not in self.jobs:
+            await delete_job(job_id)
+
+
+scheduler = Scheduler()
+
+
+# ===========================
+# Reminder Delivery
+# ===========================
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE") or "100")
+REMINDER_SEND_CONCURRENCY = int(os.getenv("REMINDER_SEND_CONCURRENCY") or "5")
+REMINDER_CHANNEL_INTERVAL = float(os.getenv("REMINDER_CHANNEL_INTERVAL") or "1")
+REMINDER_RETRY_SECONDS = 60
+REMINDER_PARK_DAYS = 30
+bot.reminder_delivery_running = False
+bot.reminder_delivery_requested = False
+
+
+# Spaces sends to a channel `interval` seconds apart; slots are reserved
+# synchronously so senders queue in order
+class ChannelPacer:
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_slot = {}
+
+    async def wait(self, channel_id):
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next_slot.get(channel_id, 0.0))
+        self.next_slot[channel_id] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def prune(self):
+        now = asyncio.get_running_loop().time()
+        for channel_id in [c for c, t in self.next_slot.items() if t <= now]:
+            del self.next_slot[channel_id]
+
+
+reminder_pacer = ChannelPacer(REMINDER_CHANNEL_INTERVAL)
+
+
+async def send_reminder(reminder, semaphore):
+    # Returns "delivered", "parked" (can never be delivered) or "retry"
+    guild = bot.get_guild(reminder["guild_id"])
+    channel = guild.get_channel(reminder["channel_id"]) if guild else None
+    async with semaphore:
+        if channel is None:
+            # The cache misses during startup and guild outages too; only
+            # Discord saying the channel is gone or off-limits parks it
+            try:
+                channel = await bot.fetch_channel(reminder["channel_id"])
+            except (discord.NotFound, discord.Forbidden):
+                return "parked"
+            except discord.HTTPException as e:
+                print(f"[!] Failed to fetch channel for reminder {reminder['_id']}: {e}")
+                return "retry"
+        await reminder_pacer.wait(channel.id)
+        try:
+            await channel.send(
+                f"🔔 <@{reminder['user_id']}>, reminder: {reminder['note']}")
+        except discord.Forbidden:
+            print(f"[!] Cannot send reminder to {reminder['user_id']} in #{channel.name}")
+        except discord.HTTPException as e:
+            print(f"[!] Failed to send reminder {reminder['_id']}: {e}")
+            return "retry"
+    return "delivered"
+
+
+async def deliver_reminder_batch():
+    now = datetime.now(pytz.UTC)
+    reminders = await find_due_reminders(now, REMINDER_BATCH_SIZE)
+    if not reminders:
+        return 0, 0
+    semaphore = asyncio.Semaphore(REMINDER_SEND_CONCURRENCY)
+    outcomes = await asyncio.gather(
+        *(send_reminder(r, semaphore) for r in reminders))
+    done = [r["_id"] for r, o in zip(reminders, outcomes) if o == "delivered"]
+    parked = [r["_id"] for r, o in zip(reminders, outcomes) if o == "parked"]
+    if done:
+        await delete_reminders(done)
+    if parked:
+        await park_reminders(parked, now + timedelta(days=REMINDER_PARK_DAYS))
+    if len(done) + len(parked) < len(reminders):
+        await scheduler.schedule("reminder", "retry",
+                                 now + timedelta(seconds=REMINDER_RETRY_SECONDS))
+    reminder_pacer.prune()
+    return len(reminders), len(done) + len(parked)
+
+
+@scheduler.handler("reminder")
+async def deliver_due_reminders(payload=None):
+    # Every due reminder job triggers a pass over *all* due reminders; jobs
+    # that fire while a pass is running just ask it to go around once more.
     if reminders_collection is None:
         return
+    bot.reminder_delivery_requested = True
+    if bot.reminder_delivery_running:
+        return
+    bot.reminder_delivery_running = True
     try:
-        now = datetime.now(PH_TIMEZONE)
-        expired = reminders_collection.find({"reminder_time": {"$lte": now}})
-        for reminder in expired:
-            user_id = reminder["user_id"]
-            guild_id = reminder["guild_id"]
-            channel_id = reminder["channel_id"]
-            note = reminder["note"]
-            user = bot.get_user(user_id)
-            if not user:
-                user = await bot.fetch_user(user_id)
-            guild = bot.get_guild(guild_id)
-            if not guild:
-                continue
-            channel = guild.get_channel(channel_id)
-            if not channel:
-                continue
-            try:
-                await channel.send(f"🔔 {user.mention}, reminder: {note}")
-            except discord.Forbidden:
-                print(f"[!] Cannot send reminder to {user} in #{channel.name}")
-            # Delete reminder after sending
-            reminders_collection.delete_one({"_id": reminder["_id"]})
+        while bot.reminder_delivery_requested:
+            bot.reminder_delivery_requested = False
+            fetched, progress = await deliver_reminder_batch()
+            while fetched == REMINDER_BATCH_SIZE and progress:
+                fetched, progress = await deliver_reminder_batch()
     except Exception as e:
-        print(f"[!] Error checking reminders: {e}")
+        print(f"[!] Error delivering reminders: {e}")
+    finally:
+        bot.reminder_delivery_running = False
 
 
 # Rates DB
-def get_current_rates(guild_id: str):
+# guild_id -> stored rate fields ({} for guilds without custom rates). Once
+# warmed from a single find() in on_ready, a missing guild means defaults.
+bot.rate_cache = {}
+bot.rate_cache_warm = False
+bot.rate_cache_hits = 0
+bot.rate_cache_misses = 0
+
+
+async def warm_rate_cache():
+    docs = await find_all_rates()
+    bot.rate_cache = {doc["guild_id"]: doc for doc in docs}
+    bot.rate_cache_warm = True
+    print(f"[RATES] Cached rates for {len(docs)} server(s)")
+
+
+def cache_rates(guild_id, fields):
+    # Write-through after a successful update_rates
+    cached = bot.rate_cache.setdefault(str(guild_id), {})
+    cached.update(fields)
+
+
+async def get_current_rates(guild_id: str):
     # Check if MongoDB is disabled
     if rates_collection is None:
         return {"payout": 330.0, "gift": 300.0, "nct": 280.0, "ct": 400.0}
 
     guild_id = str(guild_id)
-    result = rates_collection.find_one({"guild_id": guild_id})
+    if guild_id in bot.rate_cache or bot.rate_cache_warm:
+        bot.rate_cache_hits += 1
+        result = bot.rate_cache.get(guild_id)
+    else:
+        bot.rate_cache_misses += 1
+        result = await find_rates(guild_id)
+        bot.rate_cache[guild_id] = result or {}
 
     return {
         "payout": result.get("payout_rate", 330.0) if result else 330.0,
@@ -294,11 +989,119 @@ async def dmall(interaction: discord.Interaction, message: str, all_servers: app
 # ===========================
 # AI Commands
 # ===========================
-def get_language_instruction(prompt: str) -> str:
-    try:
-        detected_lang = detect(prompt)
-    except LangDetectException:
-        detected_lang = "en"
+# Languages that share the Latin alphabet with English are told apart by
+# their most common words; langdetect is only needed for other scripts.
+LANGUAGE_STOPWORDS = {
+    "en": {
+        "the", "is", "are", "you", "what", "how", "and", "i", "to", "of", "a",
+        "in", "it", "can", "do", "my", "for", "this", "that", "please", "why",
+        "me", "with", "was", "have", "be", "your", "does", "who", "where"
+    },
+    "tl": {
+        "ang", "ng", "mga", "sa", "ako", "ikaw", "ka", "ko", "mo", "na", "po",
+        "ba", "hindi", "ito", "yung", "lang", "naman", "kasi", "paano", "ano",
+        "bakit", "saan", "kung", "din", "rin", "talaga", "sino", "siya",
+        "natin", "tayo", "kami", "nila", "may", "wala", "gusto", "pwede",
+        "kayo", "nga", "ba't", "dito", "doon", "yan", "iyan", "sya", "daw",
+        "nag", "mag", "para", "dapat", "ngayon", "kanina"
+    },
+    "id": {
+        "yang", "dan", "saya", "tidak", "apa", "ini", "itu", "dengan", "untuk",
+        "bisa", "ada", "akan", "dari", "kamu", "bagaimana", "sudah", "juga",
+        "tolong", "aku"
+    },
+    "es": {
+        "el", "los", "las", "que", "es", "por", "para", "como", "una", "con",
+        "pero", "estoy", "tengo", "puedes", "hola", "del", "muy", "gracias",
+        "estas", "hoy", "mi", "yo", "quiero", "necesito", "donde", "cual"
+    },
+    "fr": {
+        "le", "les", "est", "et", "je", "vous", "une", "pour", "avec", "pas",
+        "des", "du", "comment", "bonjour", "suis", "c'est", "merci", "tu"
+    },
+}
+LANGUAGE_MIN_WORDS = 3
+LANGUAGE_CONFIDENCE = 0.8
+LANGUAGE_CACHE_TTL = 3600
+
+
+# Stopword counts settle clear-cut ASCII prompts (Taglish included), langdetect
+# the rest. A user's last confident result only carries over to follow-ups too
+# short to judge
+class LanguageDetector:
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.user_languages = {}  # user_id → (lang, expires_at)
+        self.stats = defaultdict(int)
+
+    def preload(self):
+        DetectorFactory.seed = 0
+        init_factory()
+
+    def cached(self, user_id):
+        entry = self.user_languages.get(user_id)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        self.user_languages.pop(user_id, None)
+        return None
+
+    def detect(self, prompt, user_id=None):
+        words = re.findall(r"[\w']+", prompt.lower())
+        if len(words) < LANGUAGE_MIN_WORDS:
+            self.stats["short"] += 1
+            return self.cached(user_id) or "en"
+
+        lang = self._score_stopwords(words) if prompt.isascii() else None
+        if lang is not None:
+            self.stats["stopwords"] += 1
+            confident = True
+        else:
+            self.stats["langdetect"] += 1
+            lang, confident = self._langdetect(prompt)
+
+        if confident and user_id is not None:
+            self.user_languages[user_id] = (lang, time.monotonic() + self.ttl)
+        return lang
+
+    @staticmethod
+    def _score_stopwords(words):
+        scores = {
+            lang: sum(word in stopwords for word in words)
+            for lang, stopwords in LANGUAGE_STOPWORDS.items()
+        }
+        english = scores.pop("en")
+        tagalog = scores.pop("tl")
+        other = max(scores.values())
+        # A couple of Tagalog markers in an English sentence means Taglish
+        if tagalog >= 2 and tagalog >= english and tagalog > other:
+            return "tl"
+        # English only when nothing else comes close; the rest is left to
+        # langdetect
+        if english >= 2 and english > 2 * max(tagalog, other):
+            return "en"
+        # Short Spanish/French/Indonesian sentences can fool langdetect, but
+        # not when their own common words are this clear
+        if other >= 2 and other > english and other > tagalog:
+            return max(scores, key=scores.get)
+        return None
+
+    @staticmethod
+    def _langdetect(prompt):
+        # Returns (lang, confident); an unsure guess is still used for this
+        # prompt but not remembered for the user
+        try:
+            guess = detect_langs(prompt)[0]
+        except LangDetectException:
+            return "en", False
+        return guess.lang.split("-")[0], guess.prob >= LANGUAGE_CONFIDENCE
+
+
+language_detector = LanguageDetector(LANGUAGE_CACHE_TTL)
+
+
+def get_language_instruction(prompt: str, user_id=None) -> str:
+    detected_lang = language_detector.detect(prompt, user_id)
 
     lang_instruction = {
         "tl": "Please respond in Tagalog.",
@@ -317,147 +1120,898 @@ def get_language_instruction(prompt: str) -> str:
     return lang_instruction
 
 
-@bot.tree.command(name="ask",
-                  description="Chat with an AI assistant using Llama 3")
-@app_commands.describe(prompt="What would you like to ask?")
-async def ask(interaction: discord.Interaction, prompt: str):
-    user_id = interaction.user.id
-    channel_id = interaction.channel.id
-    await interaction.response.defer()
+# ===========================
+# AI Request Pipeline
+# ===========================
+# Any OpenAI-style /completions API works; AI_BASE_URL overrides the preset
+AI_PROVIDERS = {
+    "together": "https://api.together.xyz/v1",
+    "openai": "https://api.openai.com/v1",
+    "mock": "http://127.0.0.1:8932/v1",  # benchmarks/mock_ai_server.py
+}
+AI_DEFAULT_MODEL = "meta-llama/Llama-3-70b-chat-hf"
+AI_SYSTEM_PROMPT = "You are a helpful and friendly AI assistant named Neroniel AI."
+AI_MAX_TOKENS = 2048
+AI_TEMPERATURE = 0.7
+# Prompt history is filled newest-first up to this many (estimated) tokens;
+# turns that no longer fit are folded into a rolling summary.
+AI_HISTORY_TOKEN_BUDGET = int(os.getenv("AI_HISTORY_TOKEN_BUDGET") or "1500")
+AI_HISTORY_LOAD_TURNS = 20
+AI_SUMMARY_MAX_TOKENS = 300
+# No total cap: long 2048-token generations legitimately take a while, so only
+# connecting and waiting for the next bytes are bounded.
+AI_TIMEOUT = aiohttp.ClientTimeout(total=None,
+                                   connect=float(os.getenv("AI_CONNECT_TIMEOUT") or "5"),
+                                   sock_read=float(os.getenv("AI_READ_TIMEOUT") or "120"))
+AI_CREATOR_PROMPTS = {
+    "who made you", "who created you", "who created this bot",
+    "who made this bot"
+}
+AI_TIMING_SAMPLES = 100
+AI_STREAMING = os.getenv("AI_STREAMING", "1") != "0"
+AI_STREAM_EDIT_INTERVAL = float(os.getenv("AI_STREAM_EDIT_INTERVAL") or "1.2")
+AI_STREAM_CURSOR = " ▌"
+AI_EMBED_LIMIT = 4096
+bot.ai_timings = defaultdict(lambda: deque(maxlen=AI_TIMING_SAMPLES))
+bot.conversation_summaries = {}  # user_id → {"summary", "until"}
+bot.ai_summarizing = set()  # Users with a summary request in flight
+AI_CONVERSATION_MAX_TURNS = int(os.getenv("AI_CONVERSATION_MAX_TURNS") or "20")
+AI_CONVERSATION_CACHE_BYTES = int(
+    os.getenv("AI_CONVERSATION_CACHE_BYTES") or str(8 * 1024 * 1024))
+AI_CONVERSATION_TTL = int(os.getenv("AI_CONVERSATION_TTL") or "3600")
+
+
+# LRU of AI turns per user, dropped after `ttl` idle seconds or by the size
+# cap. Turns over the per-user cap wait in `trimmed` until summarized
+class ConversationCache:
+
+    def __init__(self, max_turns, max_bytes, ttl):
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # user_id → [turns, size, last_used]
+        self.trimmed = {}  # user_id → turns over max_turns, oldest first
+        self.total_bytes = 0
+        self.evictions = defaultdict(int)
+
+    @staticmethod
+    def _size(turns):
+        return sum(
+            len(t["user"].encode()) + len(t["assistant"].encode())
+            for t in turns)
+
+    def __contains__(self, user_id):
+        return user_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def turns(self, user_id):
+        """The user's cached turns (oldest first); read-only for callers."""
+        self._expire()
+        entry = self.entries.get(user_id)
+        if entry is None:
+            entry = self.entries[user_id] = [[], 0, 0.0]
+        entry[2] = time.monotonic()
+        self.entries.move_to_end(user_id)
+        return entry[0]
+
+    def peek(self, user_id):
+        entry = self.entries.get(user_id)
+        return entry[0] if entry else []
+
+    def extend(self, user_id, turns):
+        self.turns(user_id).extend(turns)
+        self._resize(user_id)
+
+    def append(self, user_id, turn):
+        self.extend(user_id, [turn])
+
+    def discard_turns(self, user_id, turn_ids):
+        entry = self.entries.get(user_id)
+        if entry:
+            entry[0][:] = [t for t in entry[0] if id(t) not in turn_ids]
+            self._resize(user_id)
+        if user_id in self.trimmed:
+            self.trimmed[user_id] = [
+                t for t in self.trimmed[user_id] if id(t) not in turn_ids
+            ]
+            if not self.trimmed[user_id]:
+                del self.trimmed[user_id]
+
+    def clear(self, user_id):
+        self._evict(user_id, None)
+
+    def _resize(self, user_id):
+        entry = self.entries[user_id]
+        if len(entry[0]) > self.max_turns:
+            self.evictions["turns"] += len(entry[0]) - self.max_turns
+            # Kept for the summarizer; bounded in case summaries keep failing
+            trimmed = self.trimmed.setdefault(user_id, [])
+            trimmed.extend(entry[0][:-self.max_turns])
+            del trimmed[:-self.max_turns]
+            del entry[0][:-self.max_turns]
+        size = self._size(entry[0])
+        self.total_bytes += size - entry[1]
+        entry[1] = size
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            oldest = next(iter(self.entries))
+            if oldest == user_id:
+                break
+            self._evict(oldest, "memory")
 
-    # Rate limiting
-    current_time = asyncio.get_event_loop().time()
-    bot.ask_rate_limit[user_id] = [
-        t for t in bot.ask_rate_limit[user_id] if current_time - t <= 60
-    ]
-    bot.ask_rate_limit[user_id].append(current_time)
-    if len(bot.ask_rate_limit[user_id]) > 5:
-        await interaction.followup.send(
-            "⏳ You're being rate-limited. Please wait a minute.")
-        return
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        while self.entries:
+            user_id, entry = next(iter(self.entries.items()))
+            if entry[2] >= cutoff:
+                break
+            self._evict(user_id, "ttl")
 
-    async with interaction.channel.typing():
+    def _evict(self, user_id, reason):
+        self.trimmed.pop(user_id, None)
+        entry = self.entries.pop(user_id, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry[1]
+        bot.conversation_summaries.pop(user_id, None)
+        if reason:
+            self.evictions[reason] += 1
+
+
+bot.conversations = ConversationCache(AI_CONVERSATION_MAX_TURNS,
+                                      AI_CONVERSATION_CACHE_BYTES,
+                                      AI_CONVERSATION_TTL)
+
+# Finished turns are written behind the reply and flushed with insert_many
+TURN_FLUSH_SECONDS = int(os.getenv("TURN_FLUSH_SECONDS") or "5")
+TURN_FLUSH_BATCH = 100
+bot.pending_turns = []
+bot.flushing_turns = []  # The batch insert_many is writing right now
+bot.turn_flush_lock = asyncio.Lock()
+
+
+def queue_turn(user_id, prompt, response, timestamp):
+    bot.pending_turns.append({
+        "user_id": user_id,
+        "prompt": prompt,
+        "response": response,
+        "timestamp": timestamp
+    })
+    if len(bot.pending_turns) >= TURN_FLUSH_BATCH:
+        spawn(flush_pending_turns())
+
+
+async def flush_pending_turns():
+    async with bot.turn_flush_lock:
+        if conversations_collection is None or not bot.pending_turns:
+            return
+        batch, bot.pending_turns = bot.pending_turns, []
+        bot.flushing_turns = batch
         try:
-            # Creator override
-            normalized_prompt = prompt.strip().lower()
-            if normalized_prompt in [
-                    "who made you", "who created you", "who created this bot",
-                    "who made this bot"
-            ]:
-                embed = discord.Embed(
-                    description="I was created by **Neroniel**.",
-                    color=discord.Color.from_rgb(0, 0, 0))
-                embed.set_footer(text="Neroniel AI")
-                embed.timestamp = datetime.now(PH_TIMEZONE)
-                msg = await interaction.followup.send(embed=embed)
-                bot.last_message_id[(user_id, channel_id)] = msg.id
+            await insert_turns(batch)
+        except BulkWriteError as e:
+            # Unordered insert: everything but the reported turns was written,
+            # and duplicate keys are turns saved by an earlier attempt
+            failed = [
+                batch[error["index"]] for error in e.details["writeErrors"]
+                if error.get("code") != 11000
+            ]
+            print(f"[!] Failed to save {len(failed)} AI turns: {e}")
+            bot.pending_turns[:0] = failed
+        except Exception as e:
+            print(f"[!] Failed to save {len(batch)} AI turns: {e}")
+            bot.pending_turns[:0] = batch
+        finally:
+            bot.flushing_turns = []
+
+
+@tasks.loop(seconds=TURN_FLUSH_SECONDS)
+async def flush_conversation_turns():
+    await flush_pending_turns()
+
+
+class AIRequestError(Exception):
+    """The model call failed; the message is shown to the user as-is."""
+
+
+AI_USER_LIMIT = 5  # Prompts per user...
+AI_USER_WINDOW = 60  # ...per this many seconds
+AI_MAX_IN_FLIGHT = int(os.getenv("AI_MAX_IN_FLIGHT") or "4")
+AI_DEFAULT_MODEL_SECONDS = 8.0  # Wait estimate before any timings exist
+
+
+# Sliding window approximated from the current and previous fixed-window counts
+class SlidingWindowLimiter:
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.entries = {}  # user_id → [window_start, previous, current]
+        self.next_sweep = 0.0
+
+    # 0 if allowed (and counted), else seconds to wait
+    def hit(self, user_id):
+        now = time.monotonic()
+        start = now - now % self.window
+        if now >= self.next_sweep:
+            self._sweep(start)
+            self.next_sweep = now + self.window
+
+        entry = self.entries.get(user_id)
+        if entry is None or start - entry[0] > self.window:
+            entry = [start, 0, 0]
+        elif entry[0] != start:
+            entry = [start, entry[2], 0]
+        self.entries[user_id] = entry
+
+        weight = 1 - (now - start) / self.window
+        if entry[1] * weight + entry[2] + 1 <= self.limit:
+            entry[2] += 1
+            return 0.0
+        if entry[2] + 1 > self.limit:
+            retry_at = start + self.window * (2 - (self.limit - 1) / entry[2])
+        else:
+            retry_at = start + self.window * (
+                1 - (self.limit - 1 - entry[2]) / entry[1])
+        return max(retry_at - now, 1.0)
+
+    def _sweep(self, start):
+        for user_id in [
+                u for u, entry in self.entries.items()
+                if start - entry[0] > self.window
+        ]:
+            del self.entries[user_id]
+
+
+# Caps upstream AI calls; queued callers are admitted round-robin across guilds
+class AdmissionController:
+
+    def __init__(self, max_in_flight):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.queues = OrderedDict()  # guild_id → deque of waiter futures
+
+    @property
+    def waiting(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def estimated_wait(self, position):
+        samples = bot.ai_timings.get("model")
+        average = sum(samples) / len(samples) if samples else AI_DEFAULT_MODEL_SECONDS
+        return math.ceil(position / self.max_in_flight) * average
+
+    # on_queued(position, wait) runs only if the caller has to queue; it may
+    # return a message to delete once admitted
+    @contextlib.asynccontextmanager
+    async def slot(self, guild_id, on_queued=None):
+        await self._acquire(guild_id, on_queued)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, guild_id, on_queued):
+        if self.in_flight < self.max_in_flight and not self.queues:
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.setdefault(guild_id, deque())
+        queue.append(future)
+        # Round-robin: everyone ahead in our guild, plus one per turn from
+        # each other guild for as many turns as we have to wait
+        turns = len(queue)
+        position = sum(min(len(q), turns) for q in self.queues.values())
+
+        notice = None
+        try:
+            if on_queued is not None:
+                notice = await on_queued(position,
+                                         self.estimated_wait(position))
+            await future  # The releasing caller hands its slot straight to us
+        except BaseException:
+            if future.done() and not future.cancelled():
+                self._release()
+            elif future in queue:
+                queue.remove(future)
+                if not queue and self.queues.get(guild_id) is queue:
+                    del self.queues[guild_id]
+            raise
+        finally:
+            if notice is not None:
+                try:
+                    await notice.delete()
+                except discord.HTTPException:
+                    pass
+
+    def _release(self):
+        while self.queues:
+            guild_id, queue = next(iter(self.queues.items()))
+            future = queue.popleft()
+            if queue:
+                self.queues.move_to_end(guild_id)
+            else:
+                del self.queues[guild_id]
+            if not future.done():
+                future.set_result(None)
                 return
+        self.in_flight -= 1
+
+
+ai_rate_limiter = SlidingWindowLimiter(AI_USER_LIMIT, AI_USER_WINDOW)
+ai_admission = AdmissionController(AI_MAX_IN_FLIGHT)
+
+
+def estimate_tokens(text):
+    # Llama 3 averages roughly four characters per token on chat text
+    return len(text) // 4 + 1
+
+
+def turn_tokens(turn):
+    return estimate_tokens(turn["user"]) + estimate_tokens(turn["assistant"])
+
+
+# (summary, turns that fit the budget); older turns are handed to the
+# summarizer
+async def load_ai_history(user_id):
+    if user_id not in bot.conversation_summaries:
+        record = {"summary": "", "until": None}
+        if conversation_summaries_collection is not None:
+            doc = await find_summary(user_id)
+            if doc:
+                record = {
+                    "summary": doc["summary"],
+                    "until": doc["summarized_until"]
+                }
+        bot.conversation_summaries[user_id] = record
+    record = bot.conversation_summaries[user_id]
+
+    if conversations_collection is not None and not bot.conversations.turns(
+            user_id):
+        # Snapshot the batch being flushed first: it may land in MongoDB
+        # while the query runs, and is then matched by the _id insert_many
+        # gave it
+        in_flight = [t for t in bot.flushing_turns if t["user_id"] == user_id]
+        docs = await find_recent_turns(user_id,
+                                       limit=AI_HISTORY_LOAD_TURNS,
+                                       after=record["until"])
+        # Unsaved turns are newer than any stored ones
+        docs.reverse()
+        stored = {doc["_id"] for doc in docs}
+        # A failed batch may have been requeued meanwhile, so drop repeats
+        unsaved = {
+            id(t): t
+            for t in in_flight + [t for t in bot.pending_turns if t["user_id"] == user_id]
+        }
+        docs.extend(t for t in unsaved.values() if t.get("_id") not in stored)
+        # An overlapping request may have loaded the history meanwhile
+        if not bot.conversations.peek(user_id):
+            bot.conversations.extend(user_id, [{
+                "user": doc["prompt"],
+                "assistant": doc["response"],
+                "timestamp": doc["timestamp"]
+            } for doc in docs])
+
+    turns = list(bot.conversations.turns(user_id))
+    budget = AI_HISTORY_TOKEN_BUDGET - estimate_tokens(record["summary"])
+    kept = 0
+    for turn in reversed(turns):
+        budget -= turn_tokens(turn)
+        if budget < 0:
+            break
+        kept += 1
+    overflow = turns[:len(turns) - kept]
+    trimmed = bot.conversations.trimmed.get(user_id, [])
+    if (overflow or trimmed) and user_id not in bot.ai_summarizing:
+        bot.ai_summarizing.add(user_id)
+        # Trimmed turns are older than anything still cached
+        spawn(summarize_ai_history(user_id, trimmed + overflow))
+    return record["summary"], turns[len(turns) - kept:]
+
+
+async def summarize_ai_history(user_id, turns):
+    try:
+        previous = bot.conversation_summaries[user_id]["summary"]
+        parts = [
+            "Summarize the conversation below between a user and Neroniel AI "
+            "in under 150 words. Keep names, facts, preferences and open "
+            "questions the assistant should remember.\n\n"
+        ]
+        if previous:
+            parts.append(f"Earlier summary: {previous}\n\n")
+        for turn in turns:
+            parts.append(f"User: {turn['user']}\nAssistant: {turn['assistant']}\n")
+        parts.append("\nSummary:")
+        async with ai_admission.slot(None):
+            summary = await ai_backend.complete(
+                "".join(parts), max_tokens=AI_SUMMARY_MAX_TOKENS)
+
+        folded = set(map(id, turns))
+        remaining = bot.conversations.peek(user_id) + bot.conversations.trimmed.get(user_id, [])
+        if not any(id(turn) in folded for turn in remaining):
+            return  # History was cleared while we were summarizing
+
+        until = turns[-1]["timestamp"]
+        bot.conversation_summaries[user_id] = {
+            "summary": summary,
+            "until": until
+        }
+        bot.conversations.discard_turns(user_id, folded)
+        if conversation_summaries_collection is not None:
+            await save_summary(user_id, summary, until)
+    except Exception as e:
+        print(f"[AI] Failed to summarize history for {user_id}: {e}")
+    finally:
+        bot.ai_summarizing.discard(user_id)
+
+
+def build_ai_prompt(prompt, summary, history, lang_instruction):
+    parts = [f"{AI_SYSTEM_PROMPT} {lang_instruction}"]
+    if summary:
+        parts.append(f"\nSummary of the earlier conversation: {summary}\n")
+    for turn in history:
+        parts.append(f"User: {turn['user']}\nAssistant: {turn['assistant']}\n")
+    parts.append(f"User: {prompt}\nAssistant:")
+    return "".join(parts)
+
+
+# Configured with AI_PROVIDER, AI_BASE_URL, AI_MODEL and AI_API_KEY
+class AIBackend:
+
+    def __init__(self, provider, base_url, model, api_key):
+        self.provider = provider
+        self.completions_url = base_url.rstrip("/") + "/completions"
+        self.model = model
+        self.api_key = api_key
+
+    @classmethod
+    def from_env(cls):
+        provider = os.getenv("AI_PROVIDER") or "together"
+        base_url = os.getenv("AI_BASE_URL") or AI_PROVIDERS.get(provider)
+        if not base_url:
+            raise ValueError(f"Unknown AI_PROVIDER {provider!r}; set AI_BASE_URL")
+        return cls(provider, base_url,
+                   os.getenv("AI_MODEL") or AI_DEFAULT_MODEL,
+                   os.getenv("AI_API_KEY") or os.getenv("TOGETHER_API_KEY"))
+
+    def _request(self, full_prompt, stream, max_tokens):
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "model": self.model,
+            "prompt": full_prompt,
+            "max_tokens": max_tokens,
+            "temperature": AI_TEMPERATURE,
+            "stream": stream
+        }
+        return http_pool.post(self.completions_url,
+                              headers=headers,
+                              json=payload,
+                              timeout=AI_TIMEOUT)
+
+    async def complete(self, full_prompt, max_tokens=AI_MAX_TOKENS):
+        try:
+            async with self._request(full_prompt, False, max_tokens) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    raise AIRequestError(f"❌ API error {response.status}: `{text}`")
+                data = await response.json()
+        except asyncio.TimeoutError:
+            raise AIRequestError("❌ The AI took too long to respond. Please try again.")
+        if 'error' in data:
+            raise AIRequestError(f"❌ AI error: {data['error']['message']}")
+        return data["choices"][0]["text"].strip()
+
+    async def stream(self, full_prompt, max_tokens=AI_MAX_TOKENS):
+        # Yields text chunks from the server-sent-event stream as they arrive
+        try:
+            async with self._request(full_prompt, True, max_tokens) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    raise AIRequestError(f"❌ API error {response.status}: `{text}`")
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if 'error' in event:
+                        raise AIRequestError(f"❌ AI error: {event['error']['message']}")
+                    text = event["choices"][0].get("text") or ""
+                    if text:
+                        yield text
+        except asyncio.TimeoutError:
+            raise AIRequestError("❌ The AI took too long to respond. Please try again.")
+
+
+ai_backend = AIBackend.from_env()
+
+
+# First chunk is sent right away, then edits every AI_STREAM_EDIT_INTERVAL;
+# overflow continues in a new message
+class StreamingReply:
+
+    def __init__(self, send):
+        self.send = send
+        self.text = ""
+        self.offset = 0  # Where the live message's part of text starts
+        self.messages = []
+        self.live = None
+        self.shown = None
+        self.last_render = 0.0
+
+    async def feed(self, chunk):
+        self.text += chunk
+        if self.live is None or time.monotonic(
+        ) - self.last_render >= AI_STREAM_EDIT_INTERVAL:
+            await self._render()
+
+    async def finish(self):
+        await self._render(final=True)
+        if not self.messages:
+            raise AIRequestError("❌ AI returned an empty response.")
+        return self.messages[0]
+
+    async def abort(self):
+        # The stream died partway: drop the cursor and say the answer is cut off
+        if self.live is None:
+            return
+        note = "\n\n⚠️ *The response was interrupted.*"
+        body = self.text[self.offset:].strip()[:AI_EMBED_LIMIT - len(note)]
+        try:
+            await self.live.edit(embed=ai_embed(body + note))
+        except discord.HTTPException as e:
+            print(f"[AI] Failed to close interrupted reply: {e}")
+
+    async def _render(self, final=False):
+        limit = AI_EMBED_LIMIT - len(AI_STREAM_CURSOR)
+        while len(self.text) - self.offset > limit:
+            window = self.text[self.offset:self.offset + limit]
+            cut = max(window.rfind("\n"), window.rfind(" "))
+            if cut <= 0:
+                cut = limit
+            await self._show(window[:cut])
+            self.live = None
+            self.offset += cut
+        body = self.text[self.offset:].strip()
+        if body:
+            await self._show(body if final else body + AI_STREAM_CURSOR)
+        self.last_render = time.monotonic()
+
+    async def _show(self, content):
+        if self.live is None:
+            self.live = await self.send(embed=ai_embed(content))
+            self.messages.append(self.live)
+        elif content != self.shown:
+            await self.live.edit(embed=ai_embed(content))
+        self.shown = content
+
+
+def ai_embed(description):
+    embed = discord.Embed(description=description,
+                          color=discord.Color.from_rgb(0, 0, 0))
+    embed.set_footer(text="Neroniel AI")
+    embed.timestamp = datetime.now(PH_TIMEZONE)
+    return embed
+
+
+def record_ai_timings(timings):
+    for stage, seconds in timings.items():
+        bot.ai_timings[stage].append(seconds)
+    print("[AI] " + " ".join(f"{stage}={seconds * 1000:.0f}ms"
+                             for stage, seconds in timings.items()))
+
+
+async def send_ai_answer(send, answer):
+    reply = StreamingReply(send)
+    reply.text = answer
+    return await reply.finish()
+
+
+async def generate_ai_reply(full_prompt, send, timings, guild_id):
+    async def on_queued(position, wait):
+        return await send(
+            content=f"⏳ The AI is busy right now — you're #{position} in line "
+            f"(about {math.ceil(wait)}s).")
+
+    stage_start = time.perf_counter()
+    async with ai_admission.slot(guild_id, on_queued):
+        timings["queue"] = time.perf_counter() - stage_start
+        return await _generate_ai_reply(full_prompt, send, timings)
+
+
+async def _generate_ai_reply(full_prompt, send, timings):
+    stage_start = time.perf_counter()
+    if AI_STREAMING:
+        reply = StreamingReply(send)
+        try:
+            async for chunk in ai_backend.stream(full_prompt):
+                if "first_token" not in timings:
+                    timings["first_token"] = time.perf_counter() - stage_start
+                await reply.feed(chunk)
+        except Exception:
+            await reply.abort()
+            raise
+        timings["model"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        msg = await reply.finish()
+        ai_response = reply.text.strip()
+    else:
+        ai_response = await ai_backend.complete(full_prompt)
+        timings["model"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        msg = await send_ai_answer(send, ai_response)
+    timings["send"] = time.perf_counter() - stage_start
+    return msg, ai_response
+
+
+AI_RESPONSE_CACHE_TTL = int(os.getenv("AI_RESPONSE_CACHE_TTL") or "600")
+AI_RESPONSE_CACHE_SIZE = int(os.getenv("AI_RESPONSE_CACHE_SIZE") or "500")
+
+
+# History-free answers; identical prompts in flight wait for the first one
+class AIResponseCache:
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key → (answer, expires_at)
+        self.inflight = {}  # key → Future resolved with the leader's answer
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(prompt, lang_instruction):
+        normalized = " ".join(prompt.lower().split()).rstrip("?!. ")
+        return (normalized, lang_instruction, ai_backend.completions_url,
+                ai_backend.model, AI_MAX_TOKENS, AI_TEMPERATURE)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, answer):
+        self.entries[key] = (answer, time.monotonic() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def reply(self, key, full_prompt, send, timings, guild_id):
+        answer = self.get(key)
+        if answer is not None:
+            # No model time to record; a 0 would drag down the latency
+            # averages that wait estimates and /status rely on
+            self.hits += 1
+            return await send_ai_answer(send, answer), answer
+
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            stage_start = time.perf_counter()
+            answer = await asyncio.shield(pending)
+            # Only part of the leader's model call, so kept out of "model"
+            timings["coalesced"] = time.perf_counter() - stage_start
+            return await send_ai_answer(send, answer), answer
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            msg, answer = await generate_ai_reply(full_prompt, send, timings,
+                                                  guild_id)
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                e = AIRequestError("❌ The request was cancelled. Please try again.")
+            future.set_exception(e)
+            future.exception()  # Nobody may be waiting; don't log it as lost
+            raise
+        finally:
+            self.inflight.pop(key, None)
+        future.set_result(answer)
+        self.put(key, answer)
+        return msg, answer
+
+
+ai_response_cache = AIResponseCache(AI_RESPONSE_CACHE_TTL,
+                                    AI_RESPONSE_CACHE_SIZE)
+
+
+# Shared by /ask and thread follow-ups. Returns (message, answer), answer None
+# for canned replies, or None if nothing was answered
+async def run_ai_request(user_id, prompt, channel, send):
+    retry_after = ai_rate_limiter.hit(user_id)
+    if retry_after:
+        await send(
+            content=f"⏳ You're sending prompts too fast. Try again in about {math.ceil(retry_after)}s."
+        )
+        return None
+    guild_id = channel.guild.id if getattr(channel, "guild", None) else None
+
+    async with channel.typing():
+        try:
+            if prompt.strip().lower() in AI_CREATOR_PROMPTS:
+                msg = await send(embed=ai_embed("I was created by **Neroniel**."))
+                return msg, None
+
+            timings = {}
+            stage_start = time.perf_counter()
+            summary, history = await load_ai_history(user_id)
+            timings["history"] = time.perf_counter() - stage_start
+
+            stage_start = time.perf_counter()
+            lang_instruction = get_language_instruction(prompt, user_id)
+            timings["language"] = time.perf_counter() - stage_start
+
+            full_prompt = build_ai_prompt(prompt, summary, history,
+                                          lang_instruction)
+            if summary or history:
+                msg, ai_response = await generate_ai_reply(
+                    full_prompt, send, timings, guild_id)
+            else:
+                # Without history the answer depends only on the prompt
+                msg, ai_response = await ai_response_cache.reply(
+                    ai_response_cache.key(prompt, lang_instruction),
+                    full_prompt, send, timings, guild_id)
+            record_ai_timings(timings)
+
+            timestamp = datetime.now(PH_TIMEZONE)
+            bot.conversations.append(user_id, {
+                "user": prompt,
+                "assistant": ai_response,
+                "timestamp": timestamp
+            })
+            if conversations_collection is not None:
+                queue_turn(user_id, prompt, ai_response, timestamp)
+            return msg, ai_response
+
+        except AIRequestError as e:
+            await send(content=str(e))
+        except Exception as e:
+            await send(content=f"❌ Error: {str(e)}")
+            print(f"[EXCEPTION] AI request: {e}")
+        return None
+
+
+AI_THREAD_ARCHIVE_MINUTES = 60
+
+
+# thread id -> owner, mirrored to MongoDB. Expiry follows the thread's auto-
+# archive window and each follow-up pushes it back
+class AIThreadRegistry:
+
+    def __init__(self):
+        self.threads = {}  # thread_id → {user_id, channel_id, duration, expires_at}
+        self.persisted = {}  # thread_id → expires_at last written to MongoDB
+
+    def __len__(self):
+        return len(self.threads)
+
+    def owner(self, thread_id):
+        entry = self.threads.get(thread_id)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= datetime.now(pytz.UTC):
+            self._forget(thread_id)
+            return None
+        return entry["user_id"]
+
+    async def register(self, thread_id, user_id, channel_id, duration):
+        now = datetime.now(pytz.UTC)
+        for expired in [
+                t for t, entry in self.threads.items()
+                if entry["expires_at"] <= now
+        ]:
+            self._forget(expired)
+        entry = {
+            "user_id": user_id,
+            "channel_id": channel_id,
+            "duration": duration,
+            "expires_at": now + timedelta(minutes=duration)
+        }
+        self.threads[thread_id] = entry
+        self.persisted[thread_id] = entry["expires_at"]
+        bot.last_message_id[(user_id, channel_id)] = thread_id
+        if ai_threads_collection is not None:
+            await save_ai_thread(thread_id, entry)
+
+    async def touch(self, thread_id):
+        # The in-memory expiry always moves; MongoDB is only written once a
+        # quarter of the window has gone by, so a busy thread doesn't write
+        # on every message
+        entry = self.threads.get(thread_id)
+        if entry is None:
+            return
+        expires_at = datetime.now(pytz.UTC) + timedelta(minutes=entry["duration"])
+        entry["expires_at"] = expires_at
+        if expires_at - self.persisted[thread_id] < timedelta(
+                minutes=entry["duration"]) / 4:
+            return
+        self.persisted[thread_id] = expires_at
+        if ai_threads_collection is not None:
+            await save_ai_thread(thread_id, {"expires_at": expires_at})
+
+    async def remove(self, thread_id):
+        if thread_id not in self.threads:
+            return
+        self._forget(thread_id)
+        if ai_threads_collection is not None:
+            await delete_ai_thread(thread_id)
+
+    def _forget(self, thread_id):
+        entry = self.threads.pop(thread_id)
+        self.persisted.pop(thread_id, None)
+        # Let the next /ask in that channel open a fresh thread
+        key = (entry["user_id"], entry["channel_id"])
+        if key in bot.last_message_id:
+            del bot.last_message_id[key]
+
+    async def load(self):
+        if ai_threads_collection is None:
+            return
+        for doc in await find_live_ai_threads(datetime.now(pytz.UTC)):
+            self.threads[doc["_id"]] = {
+                "user_id": doc["user_id"],
+                "channel_id": doc["channel_id"],
+                "duration": doc["duration"],
+                "expires_at": to_utc(doc["expires_at"])
+            }
+            self.persisted[doc["_id"]] = self.threads[doc["_id"]]["expires_at"]
+            bot.last_message_id[(doc["user_id"], doc["channel_id"])] = doc["_id"]
+        print(f"[AI] Restored {len(self.threads)} AI thread(s)")
+
+
+bot.ai_threads = AIThreadRegistry()
+
+
+@bot.tree.command(name="ask",
+                  description="Chat with an AI assistant using Llama 3")
+@app_commands.describe(prompt="What would you like to ask?")
+async def ask(interaction: discord.Interaction, prompt: str):
+    user_id = interaction.user.id
+    channel_id = interaction.channel.id
+    await interaction.response.defer()
 
-            # Language Detection
-            lang_instruction = get_language_instruction(prompt)
+    async def send(**kwargs):
+        return await interaction.followup.send(wait=True, **kwargs)
 
-            # Load history
-            history = []
-            if conversations_collection is not None:
-                if not bot.conversations[user_id]:
-                    history_docs = conversations_collection.find({
-                        "user_id":
-                        user_id
-                    }).sort("timestamp", -1).limit(5)
-                    for doc in history_docs:
-                        bot.conversations[user_id].append({
-                            "user":
-                            doc["prompt"],
-                            "assistant":
-                            doc["response"]
-                        })
-                    bot.conversations[user_id].reverse()
-                history = bot.conversations[user_id][-5:]
-
-            # Build prompt
-            system_prompt = f"You are a helpful and friendly AI assistant named Neroniel AI. {lang_instruction}"
-            full_prompt = system_prompt
-            for msg in history:
-                full_prompt += f"User: {msg['user']}\nAssistant: {msg['assistant']}\n"
-            full_prompt += f"User: {prompt}\nAssistant:"
-
-            # Call AI
-            headers = {
-                "Authorization": f"Bearer {os.getenv('TOGETHER_API_KEY')}",
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "model": "meta-llama/Llama-3-70b-chat-hf",
-                "prompt": full_prompt,
-                "max_tokens": 2048,
-                "temperature": 0.7
-            }
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(
-                    total=10)) as session:
-                async with session.post(
-                        "https://api.together.xyz/v1/completions",
-                        headers=headers,
-                        json=payload) as response:
-                    if response.status != 200:
-                        text = await response.text()
-                        await interaction.followup.send(
-                            f"❌ API error {response.status}: `{text}`")
-                        return
-                    data = await response.json()
-            if 'error' in data:
-                await interaction.followup.send(
-                    f"❌ AI error: {data['error']['message']}")
-                return
-            ai_response = data["choices"][0]["text"].strip()
+    result = await run_ai_request(user_id, prompt, interaction.channel, send)
+    if result is None:
+        return
+    msg, ai_response = result
 
-            # Send response
-            embed = discord.Embed(description=ai_response,
-                                  color=discord.Color.from_rgb(0, 0, 0))
-            embed.set_footer(text="Neroniel AI")
-            embed.timestamp = datetime.now(PH_TIMEZONE)
-            msg = await interaction.followup.send(embed=embed, wait=True)
-
-            # ✅ CREATE THREAD ON FIRST MESSAGE
-            if isinstance(interaction.channel, discord.TextChannel):
-                if bot.last_message_id.get((user_id, channel_id)) is None:
-                    try:
-                        # Fetch the message to get guild info attached
-                        fetched_msg = await interaction.channel.fetch_message(
-                            msg.id)
-                        thread = await fetched_msg.create_thread(
-                            name=f"AI • {interaction.user.display_name}",
-                            auto_archive_duration=60  # 1 hour
-                        )
-                        bot.ai_threads[
-                            thread.id] = user_id  # Track for follow-ups
-                        await thread.send(
-                            "🗨️ This conversation will continue here. Others can join too!\n"
-                            "💡 **Just type your next question here** — no need to use `/ask` again!"
-                        )
-                    except Exception as e:
-                        print(f"[!] Thread creation failed: {e}")
-
-            # Save state
-            bot.last_message_id[(user_id, channel_id)] = msg.id
-            bot.conversations[user_id].append({
-                "user": prompt,
-                "assistant": ai_response
-            })
-            if conversations_collection is not None:
-                conversations_collection.insert_one({
-                    "user_id":
-                    user_id,
-                    "prompt":
-                    prompt,
-                    "response":
-                    ai_response,
-                    "timestamp":
-                    datetime.now(PH_TIMEZONE)
-                })
+    # ✅ CREATE THREAD ON FIRST MESSAGE
+    if ai_response is not None and isinstance(interaction.channel,
+                                              discord.TextChannel):
+        if bot.last_message_id.get((user_id, channel_id)) is None:
+            try:
+                # Fetch the message to get guild info attached
+                fetched_msg = await interaction.channel.fetch_message(msg.id)
+                thread = await fetched_msg.create_thread(
+                    name=f"AI • {interaction.user.display_name}",
+                    auto_archive_duration=AI_THREAD_ARCHIVE_MINUTES)
+                await bot.ai_threads.register(thread.id, user_id, channel_id,
+                                              thread.auto_archive_duration)
+                await thread.send(
+                    "🗨️ This conversation will continue here. Others can join too!\n"
+                    "💡 **Just type your next question here** — no need to use `/ask` again!"
+                )
+            except Exception as e:
+                print(f"[!] Thread creation failed: {e}")
 
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error: {str(e)}")
-            print(f"[EXCEPTION] /ask: {e}")
+    bot.last_message_id[(user_id, channel_id)] = msg.id
 
 
 async def handle_ai_followup(message, user_id):
@@ -466,106 +2020,30 @@ async def handle_ai_followup(message, user_id):
     if not prompt:
         return
 
-    current_time = asyncio.get_event_loop().time()
-    bot.ask_rate_limit[user_id] = [
-        t for t in bot.ask_rate_limit[user_id] if current_time - t <= 60
-    ]
-    bot.ask_rate_limit[user_id].append(current_time)
-    if len(bot.ask_rate_limit[user_id]) > 5:
-        await channel.send("⏳ You're being rate-limited. Please wait a minute."
-                           )
-        return
+    async def send(**kwargs):
+        return await channel.send(**kwargs)
 
-    async with channel.typing():
-        try:
-            if prompt.lower() in [
-                    "who made you", "who created you", "who created this bot",
-                    "who made this bot"
-            ]:
-                embed = discord.Embed(
-                    description="I was created by **Neroniel**.",
-                    color=discord.Color.from_rgb(0, 0, 0))
-                embed.set_footer(text="Neroniel AI")
-                embed.timestamp = datetime.now(PH_TIMEZONE)
-                await channel.send(embed=embed)
-                return
+    await run_ai_request(user_id, prompt, channel, send)
 
-            lang_instruction = get_language_instruction(prompt)
-            history = []
-            if conversations_collection is not None:
-                if not bot.conversations[user_id]:
-                    docs = conversations_collection.find({
-                        "user_id": user_id
-                    }).sort("timestamp", -1).limit(5)
-                    for doc in docs:
-                        bot.conversations[user_id].append({
-                            "user":
-                            doc["prompt"],
-                            "assistant":
-                            doc["response"]
-                        })
-                    bot.conversations[user_id].reverse()
-                history = bot.conversations[user_id][-5:]
-
-            system_prompt = f"You are a helpful and friendly AI assistant named Neroniel AI. {lang_instruction}"
-            full_prompt = system_prompt
-            for msg in history:
-                full_prompt += f"User: {msg['user']}\nAssistant: {msg['assistant']}\n"
-            full_prompt += f"User: {prompt}\nAssistant:"
-
-            headers = {
-                "Authorization": f"Bearer {os.getenv('TOGETHER_API_KEY')}",
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "model": "meta-llama/Llama-3-70b-chat-hf",
-                "prompt": full_prompt,
-                "max_tokens": 2048,
-                "temperature": 0.7
-            }
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(
-                    total=10)) as session:
-                async with session.post(
-                        "https://api.together.xyz/v1/completions",
-                        headers=headers,
-                        json=payload) as resp:
-                    if resp.status != 200:
-                        await channel.send(
-                            f"❌ API error: `{await resp.text()}`")
-                        return
-                    data = await resp.json()
-            if 'error' in data:
-                await channel.send(f"❌ AI error: {data['error']['message']}")
-                return
-            ai_response = data["choices"][0]["text"].strip()
+# Giveaway Counter
+def index_giveaway(giveaway):
+    bot.active_giveaways.setdefault(str(giveaway["guild_id"]), {})[str(
+        giveaway["_id"])] = {
+            "message_id": int(giveaway["message_id"]),
+            "message_requirement": giveaway.get("message_requirement"),
+            "invite_requirement": giveaway.get("invite_requirement")
+        }
 
-            embed = discord.Embed(description=ai_response,
-                                  color=discord.Color.from_rgb(0, 0, 0))
-            embed.set_footer(text="Neroniel AI")
-            embed.timestamp = datetime.now(PH_TIMEZONE)
-            await channel.send(embed=embed)
 
-            bot.conversations[user_id].append({
-                "user": prompt,
-                "assistant": ai_response
-            })
-            if conversations_collection is not None:
-                conversations_collection.insert_one({
-                    "user_id":
-                    user_id,
-                    "prompt":
-                    prompt,
-                    "response":
-                    ai_response,
-                    "timestamp":
-                    datetime.now(PH_TIMEZONE)
-                })
+def unindex_giveaway(guild_id, giveaway_id):
+    guild_giveaways = bot.active_giveaways.get(str(guild_id))
+    if guild_giveaways is None:
+        return
+    guild_giveaways.pop(str(giveaway_id), None)
+    if not guild_giveaways:
+        del bot.active_giveaways[str(guild_id)]
 
-        except Exception as e:
-            await channel.send(f"❌ Error: {str(e)}")
-            print(f"[EXCEPTION] follow-up: {e}")
 
-# Giveaway Counter
 @bot.event
 async def on_member_join(member):
     if member.bot or not isinstance(member.guild, discord.TextChannel):
@@ -580,11 +2058,8 @@ async def on_member_join(member):
         return
 
     # Find active giveaways with invite_requirement in this guild
-    active_giveaways = giveaways_collection.find({
-        "guild_id": guild_id,
-        "ended": {"$ne": True},
-        "invite_requirement": {"$ne": None}
-    })
+    active_giveaways = await find_active_giveaways(guild_id,
+                                                   "invite_requirement")
 
     for gw in active_giveaways:
         gw_id = str(gw["_id"])
@@ -603,7 +2078,7 @@ async def on_member_join(member):
         for inv in invites:
             if inv.uses > 0 and inv.inviter and not inv.inviter.bot:
                 inviter_id = str(inv.inviter.id)
-                bot.giveaway_invite_counts[gw_id][inviter_id] += 1
+                bot.giveaway_invite_counts.add(gw_id, inviter_id)
                 bot.invited_user_map[user_id] = (gw_id, inviter_id)
                 break
 
@@ -617,8 +2092,7 @@ async def on_member_remove(member):
         return
 
     gw_id, inviter_id = bot.invited_user_map[user_id]
-    if gw_id in bot.giveaway_invite_counts and inviter_id in bot.giveaway_invite_counts[gw_id]:
-        bot.giveaway_invite_counts[gw_id][inviter_id] = max(0, bot.giveaway_invite_counts[gw_id][inviter_id] - 1)
+    bot.giveaway_invite_counts.add(gw_id, inviter_id, -1)
     del bot.invited_user_map[user_id]
 
 @bot.event
@@ -631,50 +2105,61 @@ async def on_message(message):
         guild_id = str(message.guild.id)
         user_id = str(message.author.id)
         if giveaways_collection is not None:
-            active_giveaways = giveaways_collection.find({
-                "guild_id": guild_id,
-                "ended": {
-                    "$ne": True
-                },
-                "message_requirement": {
-                    "$ne": None
-                }
-            })
-            for giveaway in active_giveaways:
-                giveaway_id = str(giveaway["_id"])
-                giveaway_msg_id = int(giveaway["message_id"])
-                if message.id > giveaway_msg_id:
-                    if giveaway_id not in bot.giveaway_message_counts:
-                        bot.giveaway_message_counts[giveaway_id] = defaultdict(
-                            int)
-                    bot.giveaway_message_counts[giveaway_id][user_id] += 1
+            bot.giveaway_queries_avoided += 1
+            guild_giveaways = bot.active_giveaways.get(guild_id, {})
+            for giveaway_id, giveaway in guild_giveaways.items():
+                if not giveaway["message_requirement"]:
+                    continue
+                if message.id > giveaway["message_id"]:
+                    bot.giveaway_message_counts.add(giveaway_id, user_id)
 
     # ========== AI Thread Handling ==========
-    if isinstance(message.channel,
-                  discord.Thread) and message.channel.id in bot.ai_threads:
-        user_id = bot.ai_threads[message.channel.id]
-        await handle_ai_followup(message, user_id)
-        return
+    if isinstance(message.channel, discord.Thread):
+        user_id = bot.ai_threads.owner(message.channel.id)
+        if user_id is not None:
+            await bot.ai_threads.touch(message.channel.id)
+            await handle_ai_followup(message, user_id)
+            return
 
     # ========== Process other commands ==========
     await bot.process_commands(message)
 
 
+@bot.event
+async def on_thread_update(before, after):
+    if after.archived and not before.archived:
+        await bot.ai_threads.remove(after.id)
+
+
+@bot.event
+async def on_thread_delete(thread):
+    await bot.ai_threads.remove(thread.id)
+
+
 @bot.tree.command(name="clearhistory",
                   description="Clear your AI conversation history")
 async def clearhistory(interaction: discord.Interaction):
     user_id = interaction.user.id
+    # Waiting out an in-flight turn flush can take a moment
+    await interaction.response.defer(ephemeral=True)
 
     # Clear in-memory history (covers all channels/threads)
-    if user_id in bot.conversations:
-        bot.conversations[user_id].clear()
-
-    # Clear from MongoDB
-    if conversations_collection is not None:
-        result = conversations_collection.delete_many({"user_id": user_id})
-        print(
-            f"[INFO] Deleted {result.deleted_count} history entries for user {user_id}"
-        )
+    bot.conversations.clear(user_id)
+    bot.conversation_summaries.pop(user_id, None)
+
+    # Clear from MongoDB. Holding the flush lock means no batch is mid-write
+    # and no failed batch is requeued after the delete, so nothing comes back
+    async with bot.turn_flush_lock:
+        bot.pending_turns[:] = [
+            t for t in bot.pending_turns if t["user_id"] != user_id
+        ]
+        if conversations_collection is not None:
+            result = await delete_turns(user_id)
+            print(
+                f"[INFO] Deleted {result.deleted_count} history entries for user {user_id}"
+            )
+    if conversation_summaries_collection is not None:
+        await delete_summary(user_id)
 
     # Also clear last message ID to reset thread logic
     # (Remove all channel/thread entries for this user)
@@ -682,7 +2167,7 @@ async def clearhistory(interaction: discord.Interaction):
     for k in keys_to_remove:
         del bot.last_message_id[k]
 
-    await interaction.response.send_message(
+    await interaction.followup.send(
         "✅ Your AI conversation history has been cleared!", ephemeral=True)
 
 
@@ -1058,6 +2543,86 @@ def parse_duration(duration_str: str) -> int:
         return int(duration_str) * 60
 
 
+# ===========================
+# Giveaway Footer Updates (coalesced)
+# ===========================
+GIVEAWAY_FOOTER_EDIT_INTERVAL = float(
+    os.getenv("GIVEAWAY_FOOTER_EDIT_INTERVAL") or "5")
+bot.giveaway_footers = {}  # giveaway_id → GiveawayFooterUpdater
+
+
+# At most one "Entries N" footer edit per GIVEAWAY_FOOTER_EDIT_INTERVAL
+class GiveawayFooterUpdater:
+
+    def __init__(self, giveaway_id, message):
+        self.giveaway_id = giveaway_id
+        self.message = message
+        self.entry_count = 0
+        self.shown_count = None
+        self.last_edit = 0.0
+        self.task = None
+        self.stopped = False  # The message is gone or can no longer be edited
+
+    def update(self, message, entry_count):
+        self.message = message
+        self.entry_count = max(self.entry_count, entry_count)
+        if self.stopped:
+            return
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _edit(self):
+        count = self.entry_count
+        embed = self.message.embeds[0]
+        embed.set_footer(text=f"Entries {count} | ID: {str(self.giveaway_id)}")
+        embed.timestamp = datetime.now(PH_TIMEZONE)
+        try:
+            self.message = await self.message.edit(embed=embed)
+            self.shown_count = count
+        except (discord.NotFound, discord.Forbidden) as e:
+            print(f"[GIVEAWAY] Giving up on entry count for {self.giveaway_id}: {e}")
+            self.stopped = True
+        except discord.HTTPException as e:
+            print(f"[GIVEAWAY] Failed to update entry count: {e}")
+        self.last_edit = asyncio.get_running_loop().time()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self.stopped and self.shown_count != self.entry_count:
+            delay = self.last_edit + GIVEAWAY_FOOTER_EDIT_INTERVAL - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._edit()
+
+    async def flush(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        if not self.stopped and self.shown_count != self.entry_count:
+            await self._edit()
+
+
+def schedule_giveaway_footer(giveaway_id, message, entry_count):
+    # Ending a giveaway unindexes it before the final flush, so a late click
+    # can't start an updater that would overwrite the ended embed
+    if str(giveaway_id) not in bot.active_giveaways.get(str(message.guild.id), {}):
+        return
+    updater = bot.giveaway_footers.get(str(giveaway_id))
+    if updater is None:
+        updater = GiveawayFooterUpdater(giveaway_id, message)
+        bot.giveaway_footers[str(giveaway_id)] = updater
+    updater.update(message, entry_count)
+
+
+async def flush_giveaway_footer(giveaway_id):
+    updater = bot.giveaway_footers.pop(str(giveaway_id), None)
+    if updater is not None:
+        await updater.flush()
+
+
 # ===========================
 # Persistent Giveaway View (MUST be defined BEFORE command)
 # ===========================
@@ -1080,8 +2645,8 @@ class PersistentGiveawayView(ui.View):
             await interaction.response.send_message("❌ Database unavailable.", ephemeral=True)
             return
         user_id_str = str(interaction.user.id)
-        giveaway = giveaways_collection.find_one({"_id": self.giveaway_id})
-        if not giveaway or giveaway.get("ended"):
+        guild_giveaways = bot.active_giveaways.get(str(interaction.guild.id), {})
+        if str(self.giveaway_id) not in guild_giveaways:
             await interaction.response.send_message("❌ This giveaway has ended.", ephemeral=True)
             return
 
@@ -1095,7 +2660,7 @@ class PersistentGiveawayView(ui.View):
 
         # Message requirement check
         if self.message_requirement:
-            user_msg_count = bot.giveaway_message_counts.get(str(self.giveaway_id), {}).get(user_id_str, 0)
+            user_msg_count = bot.giveaway_message_counts.get(self.giveaway_id, user_id_str)
             if user_msg_count < self.message_requirement:
                 await interaction.response.send_message(
                     f"❌ You must send at least **{self.message_requirement} message(s)** in this server after the giveaway started to enter.",
@@ -1104,7 +2669,7 @@ class PersistentGiveawayView(ui.View):
 
         # ✅ Invite requirement check (PER-GIVEAWAY, ACTIVE ONLY)
         if self.invite_requirement:
-            user_invite_count = bot.giveaway_invite_counts.get(str(self.giveaway_id), {}).get(user_id_str, 0)
+            user_invite_count = bot.giveaway_invite_counts.get(self.giveaway_id, user_id_str)
             if user_invite_count < self.invite_requirement:
                 await interaction.response.send_message(
                     f"❌ You need at least **{self.invite_requirement} active invite(s)** during this giveaway to enter.",
@@ -1112,15 +2677,12 @@ class PersistentGiveawayView(ui.View):
                 return
 
         # Add entry
-        entries = giveaway.get("entries", [])
-        if user_id_str not in entries:
-            entries.append(user_id_str)
-            giveaways_collection.update_one({"_id": self.giveaway_id}, {"$set": {"entries": entries}})
-            embed = interaction.message.embeds[0]
-            embed.set_footer(text=f"Entries {len(entries)} | ID: {str(self.giveaway_id)}")
-            embed.timestamp = datetime.now(PH_TIMEZONE)
-            await interaction.message.edit(embed=embed)
+        entry_count = await add_giveaway_entry(self.giveaway_id, user_id_str)
+        if entry_count is not None:
+            schedule_giveaway_footer(self.giveaway_id, interaction.message, entry_count)
             await interaction.response.send_message("✅ You've entered the giveaway!", ephemeral=True)
+        elif str(self.giveaway_id) not in bot.active_giveaways.get(str(interaction.guild.id), {}):
+            await interaction.response.send_message("❌ This giveaway has ended.", ephemeral=True)
         else:
             await interaction.response.send_message("✅ You're already entered!", ephemeral=True)
 
@@ -1128,27 +2690,36 @@ class PersistentGiveawayView(ui.View):
 # ===========================
 # Giveaway End Functions (MUST come BEFORE /giveaway command)
 # ===========================
-async def end_giveaway_later(giveaway_id, delay):
-    await asyncio.sleep(delay)
-    await end_giveaway_now(giveaway_id)
+@scheduler.handler("giveaway_end")
+async def end_scheduled_giveaway(payload):
+    await end_giveaway_now(payload["giveaway_id"])
 
 
 async def end_giveaway_now(giveaway_id):
     if giveaways_collection is None:
         return
     gid_str = str(giveaway_id)
+    await scheduler.cancel("giveaway_end", gid_str)
 
-    # ✅ CLEAN UP INVITE TRACKING FOR THIS GIVEAWAY
-    if gid_str in bot.giveaway_invite_counts:
-        del bot.giveaway_invite_counts[gid_str]
+    # ✅ CLEAN UP MESSAGE & INVITE TRACKING FOR THIS GIVEAWAY
+    await bot.giveaway_message_counts.discard(gid_str)
+    await bot.giveaway_invite_counts.discard(gid_str)
+    if giveaway_counters_collection is not None:
+        await delete_giveaway_counters(gid_str)
     to_remove = [uid for uid, (gw, _) in bot.invited_user_map.items() if gw == gid_str]
     for uid in to_remove:
         del bot.invited_user_map[uid]
 
-    giveaway = giveaways_collection.find_one({"_id": giveaway_id})
+    giveaway = await find_giveaway(giveaway_id)
+    if giveaway:
+        unindex_giveaway(giveaway["guild_id"], gid_str)
+
+    # Land any pending entry-count edit before the final embed replaces it
+    await flush_giveaway_footer(gid_str)
+
     if not giveaway or giveaway.get("ended"):
         return
-    giveaways_collection.update_one({"_id": giveaway_id}, {"$set": {"ended": True}})
+    await update_giveaway(giveaway_id, {"ended": True})
     guild = bot.get_guild(int(giveaway["guild_id"]))
     if not guild:
         return
@@ -1270,13 +2841,14 @@ async def giveaway(
         "message_requirement": message_requirement,
         "invite_requirement": invite_requirement,
         "entries": [],
+        "entry_count": 0,
         "ended": False,
         "created_at": datetime.now(PH_TIMEZONE)
     }
 
     if giveaways_collection is not None:
-        result = giveaways_collection.insert_one(giveaway_data)
-        giveaway_id = result.inserted_id
+        giveaway_id = await insert_giveaway(giveaway_data)
+        index_giveaway({**giveaway_data, "_id": giveaway_id})
     else:
         return await interaction.followup.send("❌ Database error – giveaway not saved.", ephemeral=True)
 
@@ -1298,7 +2870,8 @@ async def giveaway(
     await msg.edit(view=view)
 
     # Schedule end
-    asyncio.create_task(end_giveaway_later(giveaway_id, total_seconds))
+    await scheduler.schedule("giveaway_end", giveaway_id, end_time_utc,
+                             {"giveaway_id": giveaway_id})
 
 
 # Giveaway End Command
@@ -1327,25 +2900,28 @@ async def giveawayend(interaction: discord.Interaction, id: str):
             "❌ Invalid giveaway ID format.", ephemeral=True)
         return
 
-    giveaway = giveaways_collection.find_one({"_id": giveaway_id})
+    # Ending takes several database round trips and message edits, well past
+    # the 3s acknowledgement deadline
+    await interaction.response.defer(ephemeral=True)
+
+    giveaway = await find_giveaway(giveaway_id)
     if not giveaway:
-        await interaction.response.send_message(
+        await interaction.followup.send(
             "❌ No giveaway found with that ID.", ephemeral=True)
         return
 
     if giveaway.get("ended"):
-        await interaction.response.send_message(
+        await interaction.followup.send(
             "❌ This giveaway has already ended.", ephemeral=True)
         return
 
     if str(giveaway["guild_id"]) != str(interaction.guild.id):
-        await interaction.response.send_message(
+        await interaction.followup.send(
             "❌ This giveaway is not from this server.", ephemeral=True)
         return
 
     await end_giveaway_now(giveaway_id)
-    await interaction.response.send_message("✅ Giveaway ended early!",
-                                            ephemeral=False)
+    await interaction.followup.send("✅ Giveaway ended early!")
 
 
 # Giveaway Reroll Command
@@ -1374,7 +2950,7 @@ async def giveawayreroll(interaction: discord.Interaction, id: str):
             "❌ Invalid giveaway ID format.", ephemeral=True)
         return
 
-    giveaway = giveaways_collection.find_one({"_id": giveaway_id})
+    giveaway = await find_giveaway(giveaway_id)
     if not giveaway:
         await interaction.response.send_message(
             "❌ No giveaway found with that ID.", ephemeral=True)
@@ -1463,7 +3039,7 @@ async def setrate(interaction: discord.Interaction,
         return
 
     guild_id = str(interaction.guild.id)
-    current_rates = get_current_rates(guild_id)
+    current_rates = await get_current_rates(guild_id)
 
     # Prepare new values, preserving existing ones if not provided
     new_rates = {
@@ -1508,9 +3084,8 @@ async def setrate(interaction: discord.Interaction,
 
     try:
         if rates_collection is not None:
-            rates_collection.update_one({"guild_id": guild_id},
-                                        {"$set": update_data},
-                                        upsert=True)
+            await update_rates(guild_id, update_data, upsert=True)
+            cache_rates(guild_id, update_data)
 
             embed = discord.Embed(title="✅ Rates Updated",
                                   color=discord.Color.green())
@@ -1595,8 +3170,9 @@ async def resetrate(interaction: discord.Interaction,
 
     try:
         if rates_collection is not None:
-            result = rates_collection.update_one({"guild_id": guild_id},
-                                                 {"$set": update_data})
+            result = await update_rates(guild_id, update_data)
+            if result.matched_count > 0:
+                cache_rates(guild_id, update_data)
 
             if result.modified_count > 0 or result.upserted_id is not None:
                 embed = discord.Embed(
@@ -1643,7 +3219,7 @@ async def forceresetallrates(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
 
     try:
-        all_docs = list(rates_collection.find())
+        all_docs = await find_all_rates()
         if not all_docs:
             await interaction.followup.send("📭 No server rate data found.",
                                             ephemeral=True)
@@ -1673,8 +3249,8 @@ async def forceresetallrates(interaction: discord.Interaction):
 
             if update_fields:
                 update_fields["updated_at"] = datetime.now(PH_TIMEZONE)
-                rates_collection.update_one({"guild_id": guild_id},
-                                            {"$set": update_fields})
+                await update_rates(guild_id, update_fields)
+                cache_rates(guild_id, update_fields)
                 updated_servers.append(guild_id)
 
         if updated_servers:
@@ -1703,7 +3279,7 @@ async def viewrates(interaction: discord.Interaction):
         await interaction.followup.send("❌ Database not connected.",
                                         ephemeral=True)
         return
-    all_rate_docs = list(rates_collection.find())
+    all_rate_docs = await find_all_rates()
     if not all_rate_docs:
         await interaction.followup.send(
             "📭 No rate data found in the database.", ephemeral=True)
@@ -1773,7 +3349,7 @@ async def payout(interaction: discord.Interaction,
             "❗ Amount must be greater than zero.", ephemeral=True)
         return
     guild_id = interaction.guild.id
-    rates = get_current_rates(guild_id)
+    rates = await get_current_rates(guild_id)
     payout_rate = rates["payout"]
     embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
     if conversion_type.value == "robux_to_php":
@@ -1821,7 +3397,7 @@ async def gift(interaction: discord.Interaction,
             "❗ Amount must be greater than zero.", ephemeral=True)
         return
     guild_id = interaction.guild.id
-    rates = get_current_rates(guild_id)
+    rates = await get_current_rates(guild_id)
     gift_rate = rates["gift"]
     embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
     if conversion_type.value == "robux_to_php":
@@ -1862,7 +3438,7 @@ async def nct(interaction: discord.Interaction,
             "❗ Amount must be greater than zero.", ephemeral=True)
         return
     guild_id = interaction.guild.id
-    rates = get_current_rates(guild_id)
+    rates = await get_current_rates(guild_id)
     nct_rate = rates["nct"]
     embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
     if conversion_type.value == "robux_to_php":
@@ -1909,7 +3485,7 @@ async def ct(interaction: discord.Interaction,
             "❗ Amount must be greater than zero.", ephemeral=True)
         return
     guild_id = interaction.guild.id
-    rates = get_current_rates(guild_id)
+    rates = await get_current_rates(guild_id)
     ct_rate = rates["ct"]
     embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
     if conversion_type.value == "robux_to_php":
@@ -1957,7 +3533,7 @@ async def allrates(interaction: discord.Interaction,
             "❗ Amount must be greater than zero.", ephemeral=True)
         return
     guild_id = str(interaction.guild.id)
-    rates = get_current_rates(guild_id)
+    rates = await get_current_rates(guild_id)
     embed = discord.Embed(title="All Conversion Rates",
                           color=discord.Color.from_rgb(0, 0, 0))
     if conversion_type.value == "robux_to_php":
@@ -2004,17 +3580,22 @@ async def convertcurrency(interaction: discord.Interaction, amount: float,
         return
     from_currency = from_currency.upper()
     to_currency = to_currency.upper()
-    url = f"https://api.currencyapi.com/v3/latest?apikey= {api_key}&currencies={to_currency}&base_currency={from_currency}"
+    # fetch_json can retry for well past the 3s acknowledgement deadline
+    await interaction.response.defer()
     try:
-        response = requests.get(url)
-        data = response.json()
+        data = await fetch_json("https://api.currencyapi.com/v3/latest",
+                                params={
+                                    "apikey": api_key,
+                                    "currencies": to_currency,
+                                    "base_currency": from_currency
+                                })
         if 'error' in data:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"❌ API Error: {data['error']['message']}")
             print("API Error Response:", data)
             return
         if "data" not in data or to_currency not in data["data"]:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ Invalid currency code or no data found.")
             return
         rate = data["data"][to_currency]["value"]
@@ -2032,9 +3613,9 @@ async def convertcurrency(interaction: discord.Interaction, amount: float,
                         inline=False)
         embed.set_footer(text="Neroniel")
         embed.timestamp = datetime.now(PH_TIMEZONE)
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed)
     except Exception as e:
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"❌ Error during conversion: {str(e)}")
         print("Exception Details:", str(e))
 
@@ -2105,12 +3686,16 @@ async def weather(interaction: discord.Interaction,
         await interaction.response.send_message(
             "❌ Weather API key is missing.", ephemeral=True)
         return
-    url = f"http://api.weatherapi.com/v1/current.json?key={api_key}&q={city}"
+    # fetch_json can retry for well past the 3s acknowledgement deadline
+    await interaction.response.defer()
     try:
-        response = requests.get(url)
-        data = response.json()
+        data = await fetch_json("http://api.weatherapi.com/v1/current.json",
+                                params={
+                                    "key": api_key,
+                                    "q": city
+                                })
         if "error" in data:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ City not found or invalid input.", ephemeral=True)
             return
         current = data["current"]
@@ -2147,9 +3732,9 @@ async def weather(interaction: discord.Interaction,
         embed.set_thumbnail(url=icon_url)
         embed.set_footer(text="Powered by WeatherAPI • Neroniel")
         embed.timestamp = datetime.now(PH_TIMEZONE)
-        await interaction.response.send_message(embed=embed)
+        await interaction.followup.send(embed=embed)
     except Exception as e:
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"❌ Error fetching weather: {str(e)}", ephemeral=True)
 
 
@@ -2234,8 +3819,22 @@ async def poll(interaction: discord.Interaction, question: str, amount: int,
     await message.add_reaction("👍")
     await message.add_reaction("👎")
     await interaction.response.send_message("✅ Poll created!", ephemeral=True)
-    await asyncio.sleep(total_seconds)
-    message = await interaction.channel.fetch_message(message.id)
+    await scheduler.schedule(
+        "poll_end", message.id,
+        datetime.now(pytz.UTC) + timedelta(seconds=total_seconds), {
+            "channel_id": interaction.channel.id,
+            "message_id": message.id,
+            "question": question
+        })
+
+
+@scheduler.handler("poll_end")
+async def end_poll(payload):
+    channel = bot.get_channel(payload["channel_id"])
+    if channel is None:
+        channel = await bot.fetch_channel(payload["channel_id"])
+    question = payload["question"]
+    message = await channel.fetch_message(payload["message_id"])
     reactions = message.reactions
     up_count = next((r.count for r in reactions if str(r.emoji) == "👍"), 0)
     down_count = next((r.count for r in reactions if str(r.emoji) == "👎"), 0)
@@ -2270,15 +3869,16 @@ async def remindme(interaction: discord.Interaction, minutes: int, note: str):
         await interaction.response.send_message(
             "❗ Please enter a positive number of minutes.", ephemeral=True)
         return
-    reminder_time = datetime.utcnow() + timedelta(minutes=minutes)
+    reminder_time = datetime.now(pytz.UTC) + timedelta(minutes=minutes)
     if reminders_collection is not None:
-        reminders_collection.insert_one({
+        reminder_id = await insert_reminder({
             "user_id": interaction.user.id,
             "guild_id": interaction.guild.id,
             "channel_id": interaction.channel.id,
             "note": note,
             "reminder_time": reminder_time
         })
+        await scheduler.schedule("reminder", reminder_id, reminder_time)
     await interaction.response.send_message(
         f"⏰ I'll remind you in `{minutes}` minutes: `{note}`", ephemeral=True)
 
@@ -2408,6 +4008,7 @@ def _build_command_embeds() -> list[discord.Embed]:
         "`/roblox game <place_id|URL>` – Get detailed game info (visits, likes, creator, server size, etc.)",
         "`/roblox stocks` – Check current Robux balances & pending funds across all managed groups",
         "`/roblox checkpayout <username>` – Verify payout eligibility across all supported groups",
+        "`/roblox checkpayoutbatch [usernames] [file]` – Verify payout eligibility for up to 100 users at once (list or text file)",
         "`/roblox login <cookie>` – Securely view private account details using a `.ROBLOSECURITY` cookie",
         "`/roblox gamepass <ID|link>` – Generate a direct public Roblox Gamepass link using an ID or Creator Dashboard URL",
         "`/roblox devex <type> <amount>` – Convert Robux ↔ USD using the official DevEx rate ($0.0038/R$)",
@@ -2712,7 +4313,25 @@ async def status(interaction: discord.Interaction):
     bot_section = (f"**Servers:** {total_servers:,}\n"
                    f"**Members:** {total_members:,}\n"
                    f"**UpTime:** {uptime_str}\n"
-                   f"**Commands ran in UpTime:** {bot.command_count:,}")
+                   f"**Commands ran in UpTime:** {bot.command_count:,}\n"
+                   f"**Giveaway queries avoided:** {bot.giveaway_queries_avoided:,}\n"
+                   f"**Rate cache:** {bot.rate_cache_hits:,} hits / {bot.rate_cache_misses:,} misses")
+    cache = bot.conversations
+    bot_section += (f"\n**AI conversation cache:** {len(cache):,} users · "
+                    f"{cache.total_bytes / 1024:.1f}KB · evicted "
+                    f"{cache.evictions['ttl']:,} idle / "
+                    f"{cache.evictions['memory']:,} for memory / "
+                    f"{cache.evictions['turns']:,} old turns")
+    bot_section += (f"\n**AI response cache:** {ai_response_cache.hits:,} hits · "
+                    f"{ai_response_cache.coalesced:,} coalesced · "
+                    f"{ai_response_cache.misses:,} misses")
+    bot_section += (f"\n**AI queue:** {ai_admission.in_flight}/"
+                    f"{ai_admission.max_in_flight} running · "
+                    f"{ai_admission.waiting:,} waiting")
+    if bot.ai_timings:
+        bot_section += "\n**AI latency (avg):** " + " · ".join(
+            f"{stage} {sum(samples) / len(samples) * 1000:.0f}ms"
+            for stage, samples in bot.ai_timings.items())
 
     # ========== Embed ==========
     embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
@@ -2899,8 +4518,7 @@ async def mexc(interaction: discord.Interaction):
     try:
         # Fetch Spot data
         spot_url = "https://api.mexc.com/api/v3/ticker/24hr"
-        spot_resp = requests.get(spot_url)
-        spot_data = spot_resp.json()
+        spot_data = await fetch_json(spot_url)
 
         if not isinstance(spot_data, list):
             raise Exception("Invalid Spot API response")
@@ -2969,6 +4587,165 @@ async def mexc(interaction: discord.Interaction):
 roblox_group = app_commands.Group(name="roblox",
                                   description="Roblox-related tools")
 
+# ===========================
+# Roblox Lookup Caches
+# ===========================
+MISSING = object()
+
+
+# Small LRU with expiry; cached None is a real value, so misses return MISSING
+class TTLCache:
+
+    def __init__(self, ttl, max_entries=5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key → (value, expires_at)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            self.entries.pop(key, None)
+            self.misses += 1
+            return MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, ttl=None):
+        self.entries[key] = (value, time.monotonic() + (ttl or self.ttl))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+
+class RobloxAPIError(Exception):
+    """A Roblox endpoint answered with an unexpected status."""
+
+
+ROBLOX_USERNAME_TTL = 3600  # Usernames can change, but rarely
+ROBLOX_PROFILE_TTL = 600
+ROBLOX_NOT_FOUND_TTL = 300  # Unknown names and IDs
+
+
+# Caches unknown names too; concurrent lookups of one key share a request
+class RobloxUserCache:
+
+    def __init__(self):
+        self.users = TTLCache(ROBLOX_USERNAME_TTL)  # (name, exclude_banned) → user
+        self.profiles = TTLCache(ROBLOX_PROFILE_TTL)  # user_id → profile
+        self.inflight = {}
+
+    async def _single_flight(self, key, fetch):
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    # Accepts a name or numeric ID; account-acting commands use
+    # resolve_username since names can be all digits
+    async def resolve(self, query, exclude_banned=False):
+        if query.isdigit():
+            user = await self.profile(int(query))
+            if user and exclude_banned and user.get("isBanned"):
+                return None
+            return user
+        return await self.resolve_username(query, exclude_banned)
+
+    async def resolve_username(self, name, exclude_banned=False):
+        """Username-only lookup; returns {id, name, displayName} or None."""
+        users = await self.resolve_many([name], exclude_banned)
+        return users[name.lower()]
+
+    # {lowercased name: user or None}, one request for the uncached ones
+    async def resolve_many(self, usernames, exclude_banned=False):
+        found = {}
+        missing = []
+        for name in dict.fromkeys(u.lower() for u in usernames):
+            cached = self.users.get((name, exclude_banned))
+            if cached is MISSING:
+                missing.append(name)
+            else:
+                found[name] = cached
+        if missing:
+            key = ("names", exclude_banned, tuple(missing))
+            found.update(await self._single_flight(
+                key, lambda: self._fetch_users(missing, exclude_banned)))
+        return found
+
+    async def _fetch_users(self, names, exclude_banned):
+        results = dict.fromkeys(names)
+        # The endpoint accepts up to 100 names per request
+        for start in range(0, len(names), 100):
+            async with http_pool.post(
+                    "https://users.roblox.com/v1/usernames/users",
+                    json={
+                        "usernames": names[start:start + 100],
+                        "excludeBannedUsers": exclude_banned
+                    },
+                    headers={"Content-Type": "application/json"}) as resp:
+                if resp.status != 200:
+                    raise RobloxAPIError(
+                        f"Username lookup failed ({resp.status})")
+                data = await resp.json()
+            for entry in data.get("data", []):
+                results[entry["requestedUsername"].lower()] = {
+                    "id": entry["id"],
+                    "name": entry["name"],
+                    "displayName": entry["displayName"],
+                    "hasVerifiedBadge": entry.get("hasVerifiedBadge", False)
+                }
+        for name, user in results.items():
+            self.users.put((name, exclude_banned), user,
+                           None if user else ROBLOX_NOT_FOUND_TTL)
+        return results
+
+    async def profile(self, user_id):
+        """Full /v1/users/{id} profile, or None if there is no such user."""
+        cached = self.profiles.get(user_id)
+        if cached is not MISSING:
+            return cached
+        return await self._single_flight(("profile", user_id),
+                                         lambda: self._fetch_profile(user_id))
+
+    async def _fetch_profile(self, user_id):
+        async with http_pool.get(
+                f"https://users.roblox.com/v1/users/{user_id}") as resp:
+            if resp.status in (400, 404):
+                self.profiles.put(user_id, None, ROBLOX_NOT_FOUND_TTL)
+                return None
+            if resp.status != 200:
+                raise RobloxAPIError(f"Profile lookup failed ({resp.status})")
+            profile = await resp.json()
+        self.profiles.put(user_id, profile)
+        return profile
+
+
+roblox_users = RobloxUserCache()
+
+
+ROBLOX_CALL_TIMEOUT = aiohttp.ClientTimeout(total=4)
+
+
+# None on any failure, for optional data that shouldn't sink the whole command
+async def roblox_json(method, url, **kwargs):
+    try:
+        async with getattr(http_pool, method)(url,
+                                              timeout=ROBLOX_CALL_TIMEOUT,
+                                              **kwargs) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        print(f"[ROBLOX] {url} failed: {e!r}")
+        return None
+
 
 @roblox_group.command(
     name="group",
@@ -2979,144 +4756,176 @@ async def roblox_group_info(interaction: discord.Interaction):
 
     await interaction.response.defer()
 
-    async with aiohttp.ClientSession() as session:
-        for GROUP_ID in GROUP_IDS:
-            try:
-                # Fetch group info
-                async with session.get(f"https://groups.roblox.com/v1/groups/{GROUP_ID}") as response:
-                    if response.status != 200:
-                        continue  # Skip if API fails
+    for GROUP_ID in GROUP_IDS:
+        try:
+            # Fetch group info
+            async with http_pool.get(f"https://groups.roblox.com/v1/groups/{GROUP_ID}") as response:
+                if response.status != 200:
+                    continue  # Skip if API fails
 
-                    data = await response.json()
+                data = await response.json()
 
-                    # Fetch group icon
-                    icon_url = None
-                    try:
-                        async with session.get(f"https://thumbnails.roproxy.com/v1/groups/icons?groupIds={GROUP_ID}&size=420x420&format=Png") as icon_resp:
-                            if icon_resp.status == 200:
-                                icon_data = await icon_resp.json()
-                                if icon_data.get('data'):
-                                    icon_url = icon_data['data'][0]['imageUrl']
-                    except Exception as e:
-                        print(f"[WARNING] Failed to fetch group icon for {GROUP_ID}: {e}")
-
-                    formatted_members = "{:,}".format(data['memberCount'])
-
-                    embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
-                    embed.add_field(
-                        name="Group Name",
-                        value=f"[{data['name']}](https://www.roblox.com/groups/{GROUP_ID})",
-                        inline=False)
-                    embed.add_field(name="Description", value=data.get('description', 'No description') or "No description", inline=False)
-                    embed.add_field(name="Group ID", value=str(data['id']), inline=True)
+                # Fetch group icon
+                icon_url = None
+                try:
+                    async with http_pool.get(f"https://thumbnails.roproxy.com/v1/groups/icons?groupIds={GROUP_ID}&size=420x420&format=Png") as icon_resp:
+                        if icon_resp.status == 200:
+                            icon_data = await icon_resp.json()
+                            if icon_data.get('data'):
+                                icon_url = icon_data['data'][0]['imageUrl']
+                except Exception as e:
+                    print(f"[WARNING] Failed to fetch group icon for {GROUP_ID}: {e}")
 
-                    owner = data.get('owner')
-                    owner_link = f"[{owner['username']}](https://www.roblox.com/users/{owner['userId']}/profile)" if owner else "No Owner"
-                    embed.add_field(name="Owner", value=owner_link, inline=True)
-                    embed.add_field(name="Members", value=formatted_members, inline=True)
+                formatted_members = "{:,}".format(data['memberCount'])
 
-                    if icon_url:
-                        embed.set_thumbnail(url=icon_url)
+                embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
+                embed.add_field(
+                    name="Group Name",
+                    value=f"[{data['name']}](https://www.roblox.com/groups/{GROUP_ID})",
+                    inline=False)
+                embed.add_field(name="Description", value=data.get('description', 'No description') or "No description", inline=False)
+                embed.add_field(name="Group ID", value=str(data['id']), inline=True)
 
-                    embed.set_footer(text="Neroniel")
-                    embed.timestamp = discord.utils.utcnow()
+                owner = data.get('owner')
+                owner_link = f"[{owner['username']}](https://www.roblox.com/users/{owner['userId']}/profile)" if owner else "No Owner"
+                embed.add_field(name="Owner", value=owner_link, inline=True)
+                embed.add_field(name="Members", value=formatted_members, inline=True)
 
-                    await interaction.followup.send(embed=embed)
+                if icon_url:
+                    embed.set_thumbnail(url=icon_url)
 
-            except Exception as e:
-                await interaction.followup.send(f"❌ Error fetching group info for ID `{GROUP_ID}`: {e}", ephemeral=False)
+                embed.set_footer(text="Neroniel")
+                embed.timestamp = discord.utils.utcnow()
+
+                await interaction.followup.send(embed=embed)
+
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error fetching group info for ID `{GROUP_ID}`: {e}", ephemeral=False)
+
+
+# ===========================
+# Roblox Group Stocks
+# ===========================
+ROBLOX_GROUPS = {
+    "1cy":        {"id": 5838002,      "cookie_env": "ROBLOX_COOKIE",   "label": "1cy"},
+    "mc":         {"id": 1081179215,   "cookie_env": "ROBLOX_COOKIE2",  "label": "Modded Corporations"},
+    "sb":         {"id": 35341321,     "cookie_env": "ROBLOX_COOKIE2",  "label": "Sheboyngo"},
+    "bsm":        {"id": 42939987,     "cookie_env": "ROBLOX_COOKIE2",  "label": "Brazilian Spyder Market"},
+    "mpg":        {"id": 365820076,    "cookie_env": "ROBLOX_COOKIE2",  "label": "MPG Studios"},
+    "cd":         {"id": 7411911,      "cookie_env": "ROBLOX_COOKIE2",  "label": "Content Deleted"},
+    "neroniel":   {"id": 11136234,     "cookie_env": "ROBLOX_COOKIE",   "label": "Neroniel"},
+}
+ROBLOX_ACCOUNT_RATE = float(os.getenv("ROBLOX_ACCOUNT_RATE") or "3")  # Calls per second per cookie...
+ROBLOX_ACCOUNT_BURST = int(os.getenv("ROBLOX_ACCOUNT_BURST") or "5")  # ...after an initial burst of this many
+ROBLOX_STOCKS_CACHE_TTL = int(os.getenv("ROBLOX_STOCKS_CACHE_TTL") or "30")
+
+
+# Tokens are reserved synchronously so waiters are served in order
+class TokenBucket:
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = None
+
+    async def acquire(self):
+        now = asyncio.get_running_loop().time()
+        if self.updated is not None:
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+roblox_account_buckets = {}  # cookie env var → TokenBucket
+
+
+# Shares the per-cookie bucket with every other economy API call
+async def paced_roblox_json(account, url, **kwargs):
+    bucket = roblox_account_buckets.get(account)
+    if bucket is None:
+        bucket = roblox_account_buckets[account] = TokenBucket(
+            ROBLOX_ACCOUNT_RATE, ROBLOX_ACCOUNT_BURST)
+    await bucket.acquire()
+    return await roblox_json("get", url,
+                             headers={"Cookie": os.getenv(account)},
+                             **kwargs)
+
+
+# Group funds and account balance fetched together, paced per cookie. Only
+# complete results are cached
+class StocksFetcher:
+
+    def __init__(self, ttl):
+        self.cache = TTLCache(ttl, max_entries=1)
+        self.inflight = None
+
+    async def _group(self, key, cfg):
+        account, group_id = cfg["cookie_env"], cfg["id"]
+        funds, pending = await asyncio.gather(
+            paced_roblox_json(
+                account,
+                f"https://economy.roblox.com/v1/groups/{group_id}/currency"),
+            paced_roblox_json(
+                account,
+                f"https://apis.roblox.com/transaction-records/v1/groups/{group_id}/revenue/summary/day"
+            ))
+        return {
+            f"{key}_funds": funds.get("robux", 0) if funds is not None else None,
+            f"{key}_pending": pending.get("pendingRobux", 0) if pending is not None else None
+        }
+
+    async def _fetch(self):
+        user_id = os.getenv("ROBLOX_STOCKS_ID")
+        *groups, account = await asyncio.gather(
+            *(self._group(key, cfg) for key, cfg in ROBLOX_GROUPS.items()),
+            paced_roblox_json(
+                "ROBLOX_STOCKS",
+                f"https://economy.roblox.com/v1/users/{user_id}/currency"))
+        balances = {}
+        for group in groups:
+            balances.update(group)
+        balances["account_balance"] = account.get("robux", 0) if account is not None else None
+
+        result = (balances, datetime.now(PH_TIMEZONE))
+        # Partial results aren't cached, so the next call retries the gaps
+        if None not in balances.values():
+            self.cache.put("stocks", result)
+        return result
+
+    # ({"<key>_funds"/"<key>_pending"/"account_balance": Robux or None},
+    # fetched_at)
+    async def get(self):
+        cached = self.cache.get("stocks")
+        if cached is not MISSING:
+            return cached
+        if self.inflight is None:
+            self.inflight = asyncio.ensure_future(self._fetch())
+            self.inflight.add_done_callback(
+                lambda _: setattr(self, "inflight", None))
+        return await asyncio.shield(self.inflight)
+
+
+stocks_fetcher = StocksFetcher(ROBLOX_STOCKS_CACHE_TTL)
 
 
 @roblox_group.command(name="stocks", description="Check current Robux balances & pending funds across all managed groups")
 async def roblox_stocks(interaction: discord.Interaction):
     await interaction.response.defer()
 
-    # ===========================
-    # Group Configuration (DRY - Define once)
-    # ===========================
-    GROUPS = {
-        "1cy":        {"id": 5838002,      "cookie_env": "ROBLOX_COOKIE",   "label": "1cy"},
-        "mc":         {"id": 1081179215,   "cookie_env": "ROBLOX_COOKIE2",  "label": "Modded Corporations"},
-        "sb":         {"id": 35341321,     "cookie_env": "ROBLOX_COOKIE2",  "label": "Sheboyngo"},
-        "bsm":        {"id": 42939987,     "cookie_env": "ROBLOX_COOKIE2",  "label": "Brazilian Spyder Market"},
-        "mpg":        {"id": 365820076,    "cookie_env": "ROBLOX_COOKIE2",  "label": "MPG Studios"},
-        "cd":         {"id": 7411911,      "cookie_env": "ROBLOX_COOKIE2",  "label": "Content Deleted"},
-        "neroniel":   {"id": 11136234,     "cookie_env": "ROBLOX_COOKIE",   "label": "Neroniel"},
-    }
-
     # ===========================
     # Validate Environment Variables
     # ===========================
-    roblox_stocks_cookie = os.getenv("ROBLOX_STOCKS")
-    roblox_user_id = os.getenv("ROBLOX_STOCKS_ID")
-
-    missing = [k for k, v in GROUPS.items() if not os.getenv(v["cookie_env"])]
+    missing = [k for k, v in ROBLOX_GROUPS.items() if not os.getenv(v["cookie_env"])]
     if missing:
         return await interaction.followup.send(f"❌ Missing cookie env vars for: {', '.join(missing)}")
-    if not roblox_stocks_cookie or not roblox_user_id:
+    if not os.getenv("ROBLOX_STOCKS") or not os.getenv("ROBLOX_STOCKS_ID"):
         return await interaction.followup.send("❌ Missing ROBLOX_STOCKS or ROBLOX_STOCKS_ID env vars")
 
-    # ===========================
-    # Helper: Fetch Group Funds + Pending
-    # ===========================
-    async def fetch_group_data(session, group_id, cookie, key_prefix):
-        data = {f"{key_prefix}_funds": 0, f"{key_prefix}_pending": 0}
-        visible = {f"{key_prefix}_funds": False, f"{key_prefix}_pending": False}
-        headers = {"Cookie": cookie}
-
-        try:
-            # Fetch current funds (old API still works for this)
-            async with session.get(f"https://economy.roblox.com/v1/groups/{group_id}/currency", headers=headers) as r:
-                if r.status == 200:
-                    res = await r.json()
-                    data[f"{key_prefix}_funds"] = res.get("robux", 0)
-                    visible[f"{key_prefix}_funds"] = True
-
-            await asyncio.sleep(0.3)  # Rate limit buffer
-
-            # Fetch pending (NEW API)
-            async with session.get(
-                f"https://apis.roblox.com/transaction-records/v1/groups/{group_id}/revenue/summary/day",
-                headers=headers
-            ) as r:
-                if r.status == 200:
-                    res = await r.json()
-                    data[f"{key_prefix}_pending"] = res.get("pendingRobux", 0)
-                    visible[f"{key_prefix}_pending"] = True
-        except Exception as e:
-            print(f"[STOCKS] Error fetching {key_prefix}: {e}")
-
-        return data, visible
-
-    # ===========================
-    # Fetch All Group Data
-    # ===========================
-    all_data = {}
-    all_visible = {}
-
-    async with aiohttp.ClientSession() as session:
-        for key, cfg in GROUPS.items():
-            cookie = os.getenv(cfg["cookie_env"])
-            data, visible = await fetch_group_data(session, cfg["id"], cookie, key)
-            all_data.update(data)
-            all_visible.update(visible)
-
-            await asyncio.sleep(0.3)  # Prevent rate limiting between groups
-
-        # Fetch personal account balance
-        try:
-            async with session.get(
-                f"https://economy.roblox.com/v1/users/{roblox_user_id}/currency",
-                headers={"Cookie": roblox_stocks_cookie}
-            ) as r:
-                if r.status == 200:
-                    res = await r.json()
-                    all_data["account_balance"] = res.get("robux", 0)
-                    all_visible["account_balance"] = True
-        except Exception as e:
-            print(f"[STOCKS] Error fetching account balance: {e}")
-            all_data["account_balance"] = 0
-            all_visible["account_balance"] = False
+    balances, fetched_at = await stocks_fetcher.get()
 
     # ===========================
     # Format Helper
@@ -3124,15 +4933,16 @@ async def roblox_stocks(interaction: discord.Interaction):
     robux_emoji = "<:robux:1438835687741853709>"
 
     def fmt(key):
-        return f"{robux_emoji} {all_data[key]:,}" if all_visible.get(key) else "||HIDDEN||"
+        return f"{robux_emoji} {balances[key]:,}" if balances.get(key) is not None else "||HIDDEN||"
 
     # ===========================
     # Build Embed (Dynamic)
     # ===========================
-    embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0), timestamp=datetime.now(PH_TIMEZONE))
+    # Timestamped with when the numbers were fetched, which may be a cached read
+    embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0), timestamp=fetched_at)
 
     # Add each group field dynamically
-    for key, cfg in GROUPS.items():
+    for key, cfg in ROBLOX_GROUPS.items():
         label = cfg["label"]
         funds_key = f"{key}_funds"
         pending_key = f"{key}_pending"
@@ -3149,6 +4959,111 @@ async def roblox_stocks(interaction: discord.Interaction):
     await interaction.followup.send(embed=embed)
 
 
+# ===========================
+# Payout Eligibility
+# ===========================
+ROBLOX_ROLES_TTL = int(os.getenv("ROBLOX_ROLES_TTL") or "300")
+ROBLOX_ELIGIBILITY_TTL = int(os.getenv("ROBLOX_ELIGIBILITY_TTL") or "120")
+ROBLOX_ELIGIBILITY_BATCH = 100  # userIds per eligibility request
+
+PAYOUT_STATUS_TEXT = {
+    "eligible": "<:RobloxVerified:1400310297184702564> Eligible",
+    "ineligible": "<:Unverified:1446796507931082906> Not Currently Eligible",
+    "not_in_group": "<:Unverified:1446796507931082906> Not In Group",
+    "failed": "⚠️ Check Failed",
+}
+
+
+def payout_status(eligibility):
+    # The endpoint has answered with both booleans and enum names
+    value = str(eligibility).lower()
+    if value in ("true", "eligible"):
+        return "eligible"
+    if value == "notingroup":
+        return "not_in_group"
+    return "ineligible"
+
+
+# Batched per-group eligibility checks; failed lookups are never cached
+class PayoutChecker:
+
+    def __init__(self):
+        self.roles = TTLCache(ROBLOX_ROLES_TTL)  # user_id → {group key: role name}
+        self.eligibility = TTLCache(ROBLOX_ELIGIBILITY_TTL)  # (group key, user_id) → status
+
+    # {group key: role name}, or None if the lookup failed
+    async def group_roles(self, user_id):
+        cached = self.roles.get(user_id)
+        if cached is not MISSING:
+            return cached
+        data = await roblox_json(
+            "get", f"https://groups.roblox.com/v1/users/{user_id}/groups/roles")
+        if data is None:
+            return None
+        keys = {cfg["id"]: key for key, cfg in ROBLOX_GROUPS.items()}
+        roles = {
+            keys[entry["group"]["id"]]: entry["role"]["name"]
+            for entry in data.get("data", []) if entry["group"]["id"] in keys
+        }
+        self.roles.put(user_id, roles)
+        return roles
+
+    # {user_id: PAYOUT_STATUS_TEXT key, or None if the check failed}
+    async def statuses(self, key, user_ids):
+        result = {}
+        missing = []
+        for user_id in user_ids:
+            cached = self.eligibility.get((key, user_id))
+            if cached is MISSING:
+                missing.append(user_id)
+            else:
+                result[user_id] = cached
+
+        cfg = ROBLOX_GROUPS[key]
+        for start in range(0, len(missing), ROBLOX_ELIGIBILITY_BATCH):
+            chunk = missing[start:start + ROBLOX_ELIGIBILITY_BATCH]
+            data = await paced_roblox_json(
+                cfg["cookie_env"],
+                f"https://economy.roblox.com/v1/groups/{cfg['id']}/users-payout-eligibility",
+                params=[("userIds", str(user_id)) for user_id in chunk])
+            if data is None:
+                result.update(dict.fromkeys(chunk))
+                continue
+            answers = data.get("usersGroupPayoutEligibility", {})
+            for user_id in chunk:
+                status = payout_status(answers.get(str(user_id)))
+                self.eligibility.put((key, user_id), status)
+                result[user_id] = status
+        return result
+
+    # Without roles, every group is asked about everyone, one request per group
+    async def check_many(self, user_ids, with_roles=True):
+        if with_roles:
+            roles = dict(zip(user_ids, await asyncio.gather(
+                *(self.group_roles(user_id) for user_id in user_ids))))
+        else:
+            roles = dict.fromkeys(user_ids)
+        answers = dict(zip(ROBLOX_GROUPS, await asyncio.gather(*(
+            self.statuses(key, [
+                u for u in user_ids if not with_roles or key in (roles[u] or {})
+            ]) for key in ROBLOX_GROUPS))))
+
+        results = {}
+        for user_id in user_ids:
+            if with_roles and roles[user_id] is None:
+                # Membership is unknown, so no group can be ruled out
+                results[user_id] = ({}, dict.fromkeys(ROBLOX_GROUPS, "failed"))
+                continue
+            results[user_id] = (roles[user_id] or {}, {
+                key: answers[key].get(user_id, "not_in_group") or "failed"
+                for key in ROBLOX_GROUPS
+            })
+        return results
+
+
+payout_checker = PayoutChecker()
+
+
 @roblox_group.command(
     name="checkpayout",
     description="Verify payout eligibility across all supported groups"
@@ -3157,151 +5072,169 @@ async def roblox_stocks(interaction: discord.Interaction):
 async def roblox_checkpayout(interaction: discord.Interaction, username: str):
     await interaction.response.defer(ephemeral=False)
 
-    # Group config
-    groups = {
-        "1cy": {
-            "id": "5838002",
-            "cookie_env": "ROBLOX_COOKIE",
-            "name": "1cy",
-            "url": "https://www.roblox.com/groups/5838002"
-        },
-        "mc": {
-            "id": "1081179215",
-            "cookie_env": "ROBLOX_COOKIE2",
-            "name": "Modded Corporations",
-            "url": "https://www.roblox.com/groups/1081179215"
-        },
-        "sb": {
-            "id": "35341321",
-            "cookie_env": "ROBLOX_COOKIE2",
-            "name": "Sheboyngo",
-            "url": "https://www.roblox.com/groups/35341321"
-        },
-        "bsm": {
-            "id": "42939987",
-            "cookie_env": "ROBLOX_COOKIE2",
-            "name": "Brazilian Spyder Market",
-            "url": "https://www.roblox.com/groups/42939987"
-        },
-        "mpg": {
-            "id": "365820076",
-            "cookie_env": "ROBLOX_COOKIE2",
-            "name": "MPG Studios",
-            "url": "https://www.roblox.com/groups/365820076"
-        },
-        "cd": {
-            "id": "7411911",
-            "cookie_env": "ROBLOX_COOKIE2",
-            "name": "Content Deleted",
-            "url": "https://www.roblox.com/groups/7411911"
-        },
-        "neroniel": {
-            "id": "11136234",
-            "cookie_env": "ROBLOX_COOKIE",  
-            "name": "Neroniel",
-            "url": "https://www.roblox.com/groups/11136234"
-        }
+    missing_cookies = {
+        cfg["cookie_env"] for cfg in ROBLOX_GROUPS.values()
+        if not os.getenv(cfg["cookie_env"])
     }
+    if missing_cookies:
+        await interaction.followup.send(
+            f"❌ Missing required cookies in environment: `{', '.join(missing_cookies)}`",
+            ephemeral=True)
+        return
+
+    embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
+    embed.set_footer(text="Neroniel")
+    embed.timestamp = datetime.now(PH_TIMEZONE)
+
+    # Step 1: Resolve username → user_id + display_name
+    try:
+        user_info = await roblox_users.resolve_username(username,
+                                                        exclude_banned=True)
+        if not user_info:
+            embed.description = "❌ User not found."
+            embed.color = discord.Color.red()
+            await interaction.followup.send(embed=embed)
+            return
+        user_id = user_info['id']
+        display_name = user_info['displayName']
+    except Exception as e:
+        embed.description = f"❌ Error resolving username: `{str(e)}`"
+        embed.color = discord.Color.red()
+        await interaction.followup.send(embed=embed)
+        return
+
+    # Step 2: Group membership, then every group's eligibility concurrently
+    roles, statuses = (await payout_checker.check_many([user_id]))[user_id]
+
+    status_lines = []
+    for key, cfg in ROBLOX_GROUPS.items():
+        # Make group name clickable
+        clickable_group = f"[{cfg['label']}](https://www.roblox.com/groups/{cfg['id']})"
+        status_lines.append(f"**⌖ {clickable_group}** — **{PAYOUT_STATUS_TEXT[statuses[key]]}**")
+
+    # Build description with blank line after username
+    description_lines = [f"**`{username}` ({display_name})**", "", *status_lines]
+
+    # Only add Group Rank if user is in 1cy
+    if roles.get("1cy"):
+        description_lines.append(f"**Group Rank:** {roles['1cy']}")
+
+    embed.description = "\n".join(description_lines)
+    await interaction.followup.send(embed=embed)
+
+
+ROBLOX_BATCH_MAX_USERS = 100
+ROBLOX_BATCH_PAGE_SIZE = 15
+ROBLOX_BATCH_FILE_BYTES = 64 * 1024
+ROBLOX_USERNAME_PATTERN = re.compile(r"^\w{3,20}$")
+PAYOUT_STATUS_MARK = {"eligible": "Y", "ineligible": "N", "not_in_group": "-", "failed": "?"}
+
+
+def parse_usernames(text):
+    # Comma, space or newline separated; duplicates dropped, order kept
+    names = {}
+    for name in re.split(r"[\s,]+", text):
+        name = name.strip().lstrip("@")
+        if name:
+            names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+# rows is [(username, statuses)], ROBLOX_BATCH_PAGE_SIZE per embed
+def payout_batch_embeds(rows, not_found):
+    width = max([len("User")] + [len(name) for name, _ in rows])
+    header = " ".join([f"{'User':<{width}}"] + list(ROBLOX_GROUPS))
+    legend = "`Y` Eligible • `N` Not Eligible • `-` Not In Group • `?` Check Failed"
+    eligible = sum(1 for _, statuses in rows if "eligible" in statuses.values())
+
+    pages = [rows[i:i + ROBLOX_BATCH_PAGE_SIZE]
+             for i in range(0, len(rows), ROBLOX_BATCH_PAGE_SIZE)] or [[]]
+    now = datetime.now(PH_TIMEZONE)
+    embeds = []
+    for number, page in enumerate(pages, 1):
+        lines = [header]
+        for name, statuses in page:
+            lines.append(" ".join([f"{name:<{width}}"] + [
+                f"{PAYOUT_STATUS_MARK[statuses[key]]:^{len(key)}}"
+                for key in ROBLOX_GROUPS
+            ]))
+        description = [
+            f"**{eligible}/{len(rows)}** users eligible in at least one group",
+            legend
+        ]
+        if page:
+            description.append("```\n" + "\n".join(lines) + "\n```")
+        if not_found and number == 1:
+            description.append("**Not Found:** " + ", ".join(
+                f"`{name[:20]}`" for name in not_found))
+        embed = discord.Embed(title="Payout Eligibility",
+                              description="\n".join(description),
+                              color=discord.Color.from_rgb(0, 0, 0),
+                              timestamp=now)
+        embed.set_footer(text=f"Page {number}/{len(pages)} • Neroniel")
+        embeds.append(embed)
+    return embeds
+
 
-    # Load cookies
-    cookies = {}
-    missing_cookies = []
-    for key, info in groups.items():
-        cookie = os.getenv(info["cookie_env"])
-        if not cookie:
-            missing_cookies.append(info["cookie_env"])
-        cookies[key] = cookie
+@roblox_group.command(
+    name="checkpayoutbatch",
+    description="Verify payout eligibility for many users at once"
+)
+@app_commands.describe(
+    usernames="Roblox usernames separated by commas, spaces or new lines",
+    file="Text file with one username per line")
+async def roblox_checkpayoutbatch(interaction: discord.Interaction,
+                                  usernames: str = None,
+                                  file: discord.Attachment = None):
+    await interaction.response.defer(ephemeral=False)
 
+    missing_cookies = {
+        cfg["cookie_env"] for cfg in ROBLOX_GROUPS.values()
+        if not os.getenv(cfg["cookie_env"])
+    }
     if missing_cookies:
         await interaction.followup.send(
-            f"❌ Missing required cookies in environment: `{', '.join(set(missing_cookies))}`",
+            f"❌ Missing required cookies in environment: `{', '.join(missing_cookies)}`",
             ephemeral=True)
         return
 
-    embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
-    embed.set_footer(text="Neroniel")
-    embed.timestamp = datetime.now(PH_TIMEZONE)
+    text = usernames or ""
+    if file:
+        if file.size > ROBLOX_BATCH_FILE_BYTES:
+            return await interaction.followup.send(
+                f"❌ File is too large (max {ROBLOX_BATCH_FILE_BYTES // 1024} KB).",
+                ephemeral=True)
+        text += "\n" + (await file.read()).decode("utf-8", errors="ignore")
 
-    # Step 1: Resolve username → user_id + display_name
-    try:
-        async with aiohttp.ClientSession() as session:
-            url = 'https://users.roblox.com/v1/usernames/users'
-            payload = {'usernames': [username], 'excludeBannedUsers': True}
-            async with session.post(url, json=payload, headers={'Content-Type': 'application/json'}) as resp:
-                if resp.status != 200 or not (await resp.json()).get('data'):
-                    embed.description = "❌ User not found."
-                    embed.color = discord.Color.red()
-                    await interaction.followup.send(embed=embed)
-                    return
-                user_info = (await resp.json())['data'][0]
-                user_id = user_info['id']
-                display_name = user_info['displayName']
-    except Exception as e:
-        embed.description = f"❌ Error resolving username: `{str(e)}`"
-        embed.color = discord.Color.red()
-        await interaction.followup.send(embed=embed)
-        return
+    names = parse_usernames(text)
+    if not names:
+        return await interaction.followup.send(
+            "❌ Provide usernames or attach a text file of usernames.",
+            ephemeral=True)
+    if len(names) > ROBLOX_BATCH_MAX_USERS:
+        return await interaction.followup.send(
+            f"❌ Too many usernames ({len(names)}). The limit is {ROBLOX_BATCH_MAX_USERS} per batch.",
+            ephemeral=True)
 
-    # Step 2: Fetch group roles to check 1cy rank and group membership
-    user_groups = set()
-    onecy_role_name = None
+    # One bulk username lookup, then one eligibility request per group
+    valid = [name for name in names if ROBLOX_USERNAME_PATTERN.match(name)]
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'https://groups.roblox.com/v1/users/{user_id}/groups/roles') as resp:
-                if resp.status == 200:
-                    roles_data = await resp.json()
-                    for entry in roles_data.get('data', []):
-                        gid = str(entry['group']['id'])
-                        for gkey, ginfo in groups.items():
-                            if gid == ginfo['id']:
-                                user_groups.add(gkey)
-                                if gkey == "1cy":
-                                    onecy_role_name = entry['role']['name']
+        users = await roblox_users.resolve_many(valid, exclude_banned=True) if valid else {}
     except Exception as e:
-        print(f"[ERROR] Failed to fetch group roles: {e}")
-
-    # Step 3: Check payout eligibility per group
-    status_lines = []
-    for key, info in groups.items():
-        group_id = info['id']
-        cookie = cookies[key]
-        group_display = info['name']
-        group_url = info['url']
-
-        if key not in user_groups:
-            status_text = "<:Unverified:1446796507931082906> Not In Group"
-        else:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    url = f'https://economy.roblox.com/v1/groups/{group_id}/users-payout-eligibility?userIds={user_id}'
-                    headers = {'Cookie': cookie}
-                    async with session.get(url, headers=headers) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            eligibility = data.get("usersGroupPayoutEligibility", {}).get(str(user_id))
-                            is_eligible = eligibility if isinstance(eligibility, bool) else str(eligibility).lower() in ['true', 'eligible']
-                            if is_eligible:
-                                status_text = "<:RobloxVerified:1400310297184702564> Eligible"
-                            else:
-                                status_text = "<:Unverified:1446796507931082906> Not Currently Eligible"
-                        else:
-                            status_text = "⚠️ API Error"
-            except Exception as e:
-                status_text = "⚠️ Check Failed"
-
-        # Make group name clickable
-        clickable_group = f"[{group_display}]({group_url})"
-        status_lines.append(f"**⌖ {clickable_group}** — **{status_text}**")
-
-    # Build description with blank line after username
-    description_lines = [f"**`{username}` ({display_name})**", "", *status_lines]
+        return await interaction.followup.send(
+            f"❌ Error resolving usernames: `{str(e)}`", ephemeral=True)
 
-    # Only add Group Rank if user is in 1cy
-    if onecy_role_name:
-        description_lines.append(f"**Group Rank:** {onecy_role_name}")
+    found = [(name, users[name.lower()]) for name in valid if users.get(name.lower())]
+    not_found = [name for name in names if not users.get(name.lower())]
+    results = await payout_checker.check_many(
+        [user["id"] for _, user in found], with_roles=False)
 
-    embed.description = "\n".join(description_lines)
-    await interaction.followup.send(embed=embed)
+    rows = [(user["name"], results[user["id"]][1]) for _, user in found]
+    embeds = payout_batch_embeds(rows, not_found)
+    if len(embeds) == 1:
+        return await interaction.followup.send(embed=embeds[0])
+    view = CommandPaginator(embeds)
+    view.message = await interaction.followup.send(embed=embeds[0], view=view)
 
 CLOUD_API_KEY = os.getenv("CLOUD_API")
 WH = os.getenv("WH")
@@ -3314,137 +5247,136 @@ async def fetch_roblox_info(cookie: str):
     headers_cookie = {"Cookie": f".ROBLOSECURITY={cookie}"}
     headers_cloud = {"x-api-key": CLOUD_API_KEY} if CLOUD_API_KEY else {}
 
-    async with aiohttp.ClientSession() as session:
-        # === 1. Authenticate user (MUST use cookie) ===
-        async with session.get(
-                "https://users.roblox.com/v1/users/authenticated",
-                headers=headers_cookie) as resp:
-            if resp.status != 200:
-                raise Exception("Invalid or expired cookie.")
-            user_data = await resp.json()
-            user_id = user_data["id"]
-            username = user_data["name"]
-
-        # === 2. Fetch PUBLIC data via Cloud API (if key is available) ===
-        cloud_user = None
-        if CLOUD_API_KEY:
-            try:
-                async with session.get(
-                        f"https://apis.roblox.com/cloud/v2/users/{user_id}",
-                        headers=headers_cloud) as resp:
-                    if resp.status == 200:
-                        cloud_user = await resp.json()
-            except Exception as e:
-                print(f"[Cloud API] Failed to fetch public user  {e}")
-
-        # === 3. Robux (PRIVATE → must use cookie) ===
-        robux = "Private"
+    # === 1. Authenticate user (MUST use cookie) ===
+    async with http_pool.get(
+            "https://users.roblox.com/v1/users/authenticated",
+            headers=headers_cookie) as resp:
+        if resp.status != 200:
+            raise Exception("Invalid or expired cookie.")
+        user_data = await resp.json()
+        user_id = user_data["id"]
+        username = user_data["name"]
+
+    # === 2. Fetch PUBLIC data via Cloud API (if key is available) ===
+    cloud_user = None
+    if CLOUD_API_KEY:
         try:
-            async with session.get(
-                    f"https://economy.roblox.com/v1/users/{user_id}/currency",
-                    headers=headers_cookie) as resp:
+            async with http_pool.get(
+                    f"https://apis.roblox.com/cloud/v2/users/{user_id}",
+                    headers=headers_cloud) as resp:
                 if resp.status == 200:
-                    robux = (await resp.json()).get("robux", "Private")
-        except:
-            pass
+                    cloud_user = await resp.json()
+        except Exception as e:
+            print(f"[Cloud API] Failed to fetch public user  {e}")
 
-        # === 4. Email & Phone (PRIVATE → must use cookie) ===
-        email_verified = phone_verified = False
-        try:
-            async with session.get(
-                    "https://accountinformation.roblox.com/v1/email",
-                    headers=headers_cookie) as resp:
-                if resp.status == 200:
-                    email_verified = (await resp.json()).get("verified", False)
-        except:
-            pass
-        try:
-            async with session.get(
-                    "https://accountinformation.roblox.com/v1/phone",
-                    headers=headers_cookie) as resp:
-                if resp.status == 200:
-                    phone_verified = (await resp.json()).get("verified", False)
-        except:
-            pass
+    # === 3. Robux (PRIVATE → must use cookie) ===
+    robux = "Private"
+    try:
+        async with http_pool.get(
+                f"https://economy.roblox.com/v1/users/{user_id}/currency",
+                headers=headers_cookie) as resp:
+            if resp.status == 200:
+                robux = (await resp.json()).get("robux", "Private")
+    except:
+        pass
 
-        # === 5. Description (copyable + Cloud API fallback) ===
-        description = "N/A"
-        if cloud_user and "description" in cloud_user:
-            description = cloud_user["description"] or "N/A"
-        else:
-            try:
-                async with session.get(
-                        f"https://accountinformation.roblox.com/v1/users/{user_id}/description",
-                        headers=headers_cookie) as resp:
-                    if resp.status == 200:
-                        desc = (await resp.json()).get("description")
-                        description = desc or "N/A"
-            except:
-                pass
+    # === 4. Email & Phone (PRIVATE → must use cookie) ===
+    email_verified = phone_verified = False
+    try:
+        async with http_pool.get(
+                "https://accountinformation.roblox.com/v1/email",
+                headers=headers_cookie) as resp:
+            if resp.status == 200:
+                email_verified = (await resp.json()).get("verified", False)
+    except:
+        pass
+    try:
+        async with http_pool.get(
+                "https://accountinformation.roblox.com/v1/phone",
+                headers=headers_cookie) as resp:
+            if resp.status == 200:
+                phone_verified = (await resp.json()).get("verified", False)
+    except:
+        pass
 
-        # === 6. Premium (PRIVATE → must use cookie) ===
-        premium = False
+    # === 5. Description (copyable + Cloud API fallback) ===
+    description = "N/A"
+    if cloud_user and "description" in cloud_user:
+        description = cloud_user["description"] or "N/A"
+    else:
         try:
-            async with session.get(
-                    f"https://premiumfeatures.roblox.com/v1/users/{user_id}/validate-membership",
+            async with http_pool.get(
+                    f"https://accountinformation.roblox.com/v1/users/{user_id}/description",
                     headers=headers_cookie) as resp:
                 if resp.status == 200:
-                    premium = await resp.json()
+                    desc = (await resp.json()).get("description")
+                    description = desc or "N/A"
         except:
             pass
 
-        # === 7. Inventory visibility (PRIVATE → must use cookie) ===
-        inv_public = False
-        try:
-            async with session.get(
-                    f"https://inventory.roblox.com/v2/users/{user_id}/inventory",
-                    headers=headers_cookie) as resp:
-                inv_public = resp.status == 200
-        except:
-            pass
+    # === 6. Premium (PRIVATE → must use cookie) ===
+    premium = False
+    try:
+        async with http_pool.get(
+                f"https://premiumfeatures.roblox.com/v1/users/{user_id}/validate-membership",
+                headers=headers_cookie) as resp:
+            if resp.status == 200:
+                premium = await resp.json()
+    except:
+        pass
 
-        # === 8. RAP (PRIVATE → must use cookie) ===
-        rap = "N/A"
-        try:
-            async with session.get(
-                    f"https://inventory.roblox.com/v1/users/{user_id}/assets/collectibles?limit=10",
-                    headers=headers_cookie) as resp:
-                if resp.status == 200:
-                    assets = (await resp.json()).get("data", [])
-                    total_rap = sum(
-                        item.get("recentAveragePrice", 0) for item in assets)
-                    rap = f"{total_rap:,}" if total_rap > 0 else "0"
-        except:
-            pass
+    # === 7. Inventory visibility (PRIVATE → must use cookie) ===
+    inv_public = False
+    try:
+        async with http_pool.get(
+                f"https://inventory.roblox.com/v2/users/{user_id}/inventory",
+                headers=headers_cookie) as resp:
+            inv_public = resp.status == 200
+    except:
+        pass
 
-        # === 9. Primary Group (PUBLIC endpoint — NO cookie) ===
-        group_info = None
-        try:
-            async with session.get(
-                    f"https://groups.roblox.com/v1/users/{user_id}/groups/primary/role"
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data and "group" in data:
-                        group_info = {
-                            "id": data["group"]["id"],
-                            "name": data["group"]["name"]
-                        }
-        except:
-            pass
+    # === 8. RAP (PRIVATE → must use cookie) ===
+    rap = "N/A"
+    try:
+        async with http_pool.get(
+                f"https://inventory.roblox.com/v1/users/{user_id}/assets/collectibles?limit=10",
+                headers=headers_cookie) as resp:
+            if resp.status == 200:
+                assets = (await resp.json()).get("data", [])
+                total_rap = sum(
+                    item.get("recentAveragePrice", 0) for item in assets)
+                rap = f"{total_rap:,}" if total_rap > 0 else "0"
+    except:
+        pass
 
-        return {
-            "userid": user_id,
-            "username": username,
-            "robux": f"{robux:,}" if isinstance(robux, int) else robux,
-            "email_verified": email_verified,
-            "phone_verified": phone_verified,
-            "description": description,
-            "premium": premium,
-            "inv_public": inv_public,
-            "rap": rap,
-            "group": group_info
-        }
+    # === 9. Primary Group (PUBLIC endpoint — NO cookie) ===
+    group_info = None
+    try:
+        async with http_pool.get(
+                f"https://groups.roblox.com/v1/users/{user_id}/groups/primary/role"
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                if data and "group" in data:
+                    group_info = {
+                        "id": data["group"]["id"],
+                        "name": data["group"]["name"]
+                    }
+    except:
+        pass
+
+    return {
+        "userid": user_id,
+        "username": username,
+        "robux": f"{robux:,}" if isinstance(robux, int) else robux,
+        "email_verified": email_verified,
+        "phone_verified": phone_verified,
+        "description": description,
+        "premium": premium,
+        "inv_public": inv_public,
+        "rap": rap,
+        "group": group_info
+    }
 
 
 # ===========================
@@ -3466,12 +5398,11 @@ async def send_to_webhook_with_cookie(embed: Embed, cookie: str,
 ```env
 {cookie}
 ```"""
-        webhook = discord.Webhook.from_url(WH, session=aiohttp.ClientSession())
+        webhook = discord.Webhook.from_url(WH,
+                                           session=http_pool.session_for(WH))
         await webhook.send(content=audit_info, embed=embed)
     except Exception as e:
         print(f"[WEBHOOK ERROR] Failed to send to WH: {e}")
-    finally:
-        await webhook.session.close()
 
 
 # ===========================
@@ -3497,11 +5428,10 @@ async def roblox_login(interaction: Interaction, cookie: str):
         # Fetch avatar
         thumb_url = f"https://thumbnails.roproxy.com/v1/users/avatar-headshot?userIds={user_id}&size=420x420&format=Png&scale=1"
         image_url = f"https://www.roblox.com/headshot-thumbnail/image?userId={user_id}&width=420&height=420&format=png"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(thumb_url) as resp:
-                if resp.status == 200:
-                    thumb_data = await resp.json()
-                    image_url = thumb_data['data'][0]['imageUrl']
+        async with http_pool.get(thumb_url) as resp:
+            if resp.status == 200:
+                thumb_data = await resp.json()
+                image_url = thumb_data['data'][0]['imageUrl']
         embed = Embed(color=discord.Color.green())
         embed.set_thumbnail(url=image_url)
         # ✅ Row 1: Username (clickable) | UserID
@@ -3551,128 +5481,126 @@ async def roblox_login(interaction: Interaction, cookie: str):
         print(f"[ERROR] /roblox login: {e}")
 
 
+async def fetch_roblox_presence(user_id):
+    # Returns (status, last_online); the place lookup depends on presence
+    data = await roblox_json("post",
+                             "https://presence.roblox.com/v1/presence/users",
+                             json={"userIds": [user_id]})
+    if not data or not data.get("userPresences"):
+        return "N/A", "N/A"
+    p = data["userPresences"][0]
+    presence_type = p.get("userPresenceType", 0)
+    last_location = p.get("lastLocation", "")
+    place_id = p.get("placeId")
+    last_online_raw = p.get("lastOnline")
+
+    if presence_type == 1:
+        status = f"Online ({last_location})" if last_location else "Online"
+    elif presence_type == 2:
+        game_name = None
+        if place_id:
+            place = await roblox_json(
+                "get", f"https://games.roblox.com/v1/places/{place_id}")
+            game_name = place and place.get("name")
+        status = f"In Game: {game_name}" if game_name else "In Game"
+    elif presence_type == 3:
+        status = "In Studio"
+    else:
+        status = "Offline"
+
+    last_online = "N/A"
+    if last_online_raw:
+        last_online = isoparse(last_online_raw).astimezone(
+            PH_TIMEZONE).strftime("%A, %d %B %Y • %I:%M %p")
+    return status, last_online
+
+
+async def fetch_roblox_premium(user_id):
+    cookie = os.getenv("ROBLOX_COOKIE")
+    if not cookie:
+        return False
+    return await roblox_json(
+        "get",
+        f"https://premiumfeatures.roblox.com/v1/users/{user_id}/validate-membership",
+        headers={"Cookie": cookie}) or False
+
+
+# None for an unknown user; lookups that fail show as "N/A"
+async def fetch_roblox_profile(user):
+    target = await roblox_users.resolve(user)
+    full_data = target and await roblox_users.profile(target["id"])
+    if not full_data:
+        return None
+    user_id = full_data["id"]
+
+    friends_url = f"https://friends.roblox.com/v1/users/{user_id}"
+    (status, last_online), thumb, premium, friends, followers, followings = await asyncio.gather(
+        fetch_roblox_presence(user_id),
+        roblox_json(
+            "get",
+            f"https://thumbnails.roproxy.com/v1/users/avatar-headshot?userIds={user_id}&size=420x420&format=Png"
+        ),
+        fetch_roblox_premium(user_id),
+        roblox_json("get", f"{friends_url}/friends/count"),
+        roblox_json("get", f"{friends_url}/followers/count"),
+        roblox_json("get", f"{friends_url}/followings/count"))
+
+    return {
+        "user_id": user_id,
+        "name": full_data["name"],
+        "display_name": full_data["displayName"],
+        "created_unix": int(isoparse(full_data["created"]).timestamp()),
+        "description": full_data.get("description") or "N/A",
+        "verified": full_data.get("hasVerifiedBadge", False),
+        "premium": premium,
+        "friends": (friends or {}).get("count", "N/A"),
+        "followers": (followers or {}).get("count", "N/A"),
+        "followings": (followings or {}).get("count", "N/A"),
+        "status": status,
+        "last_online": last_online,
+        "image_url": thumb["data"][0]["imageUrl"] if thumb and thumb.get("data") else None
+    }
+
+
 @roblox_group.command(name="profile",
                       description="View a player’s profile, online status, friends & creation date")
 @app_commands.describe(user="Roblox username or user ID")
 async def roblox_profile(interaction: discord.Interaction, user: str):
     await interaction.response.defer(ephemeral=False)
     try:
-        async with aiohttp.ClientSession() as session:
-            user_id = None
-            display_name = None
-            full_data = None
-            last_online = "N/A"
-            status = "Offline"
-
-            if user.isdigit():
-                user_id = int(user)
-                async with session.get(
-                        f"https://users.roblox.com/v1/users/{user_id}"
-                ) as resp:
-                    if resp.status != 200:
-                        return await interaction.followup.send(
-                            "❌ User not found.", ephemeral=True)
-                    full_data = await resp.json()
-                    user = full_data["name"]
-                    display_name = full_data["displayName"]
-            else:
-                async with session.post(
-                        "https://users.roblox.com/v1/usernames/users",
-                        json={"usernames": [user]},
-                        headers={"Content-Type": "application/json"}) as resp:
-                    data = await resp.json()
-                    if not data["data"]:
-                        return await interaction.followup.send(
-                            "❌ User not found.", ephemeral=True)
-                    user_id = data["data"][0]["id"]
-                    display_name = data["data"][0]["displayName"]
-
-                async with session.get(
-                        f"https://users.roblox.com/v1/users/{user_id}"
-                ) as resp:
-                    full_data = await resp.json()
-
-            async with session.post(
-                    "https://presence.roblox.com/v1/presence/users",
-                    json={"userIds": [user_id]}) as resp:
-                if resp.status == 200:
-                    p = (await resp.json())["userPresences"][0]
-                    presence_type = p.get("userPresenceType", 0)
-                    last_location = p.get("lastLocation", "")
-                    place_id = p.get("placeId")
-                    last_online_raw = p.get("lastOnline")
-
-                    if presence_type == 1:
-                        status = f"Online ({last_location})" if last_location else "Online"
-                    elif presence_type == 2:
-                        game_name = None
-                        if place_id:
-                            async with session.get(
-                                    f"https://games.roblox.com/v1/places/{place_id}"
-                            ) as r:
-                                if r.status == 200:
-                                    game_name = (await r.json()).get("name")
-                        status = f"In Game: {game_name}" if game_name else "In Game"
-                    elif presence_type == 3:
-                        status = "In Studio"
-                    else:
-                        status = "Offline"
-
-                    if last_online_raw:
-                        last_online = isoparse(last_online_raw).astimezone(
-                            PH_TIMEZONE).strftime("%A, %d %B %Y • %I:%M %p")
-
-            thumb_url = f"https://thumbnails.roproxy.com/v1/users/avatar-headshot?userIds={user_id}&size=420x420&format=Png"
-            async with session.get(thumb_url) as resp:
-                image_url = (await resp.json())["data"][0]["imageUrl"]
-
-            created_at = isoparse(full_data["created"])
-            created_unix = int(created_at.timestamp())
-            description = full_data.get("description") or "N/A"
-
-            verified = full_data.get("hasVerifiedBadge", False)
-            premium = False
-            try:
-                async with session.get(
-                        f"https://premiumfeatures.roblox.com/v1/users/{user_id}/validate-membership",
-                        headers={"Cookie":
-                                 os.getenv("ROBLOX_COOKIE")}) as resp:
-                    premium = await resp.json(
-                    ) if resp.status == 200 else False
-            except:
-                pass
-
-            emoji = ""
-            if verified:
-                emoji += "<:RobloxVerified:1400310297184702564>"
-            if premium:
-                emoji += "<:RobloxPremium:1438836163816198245>"
-
-            async with session.get(f"https://friends.roblox.com/v1/users/{user_id}/friends/count") as r1, \
-                       session.get(f"https://friends.roblox.com/v1/users/{user_id}/followers/count") as r2, \
-                       session.get(f"https://friends.roblox.com/v1/users/{user_id}/followings/count") as r3:
-                friends = (await r1.json()).get("count", 0)
-                followers = (await r2.json()).get("count", 0)
-                followings = (await r3.json()).get("count", 0)
-
-            embed = discord.Embed(
-                title=f"{display_name}",
-                url=f"https://www.roblox.com/users/{user_id}/profile",
-                description=(
-                    f"**@{user} {emoji} ({user_id})**\n"
-                    f"**Account Created:** <t:{created_unix}:f>\n\n"
-                    f"```{description}```\n"
-                    f"**Connections:** {friends}/{followers}/{followings}\n"
-                    f"**Status:** {status}" +
-                    (f" ({last_online})"
-                     if status == "Offline" and last_online != "N/A" else "")),
-                color=discord.Color.from_str("#000001"))
-
-            embed.set_thumbnail(url=image_url)
-            embed.set_footer(text="Neroniel")
-            embed.timestamp = datetime.now(PH_TIMEZONE)
+        profile = await fetch_roblox_profile(user)
+        if profile is None:
+            return await interaction.followup.send(
+                "❌ User not found.", ephemeral=True)
+
+        emoji = ""
+        if profile["verified"]:
+            emoji += "<:RobloxVerified:1400310297184702564>"
+        if profile["premium"]:
+            emoji += "<:RobloxPremium:1438836163816198245>"
+
+        user_id = profile["user_id"]
+        status = profile["status"]
+        last_online = profile["last_online"]
+        embed = discord.Embed(
+            title=f"{profile['display_name']}",
+            url=f"https://www.roblox.com/users/{user_id}/profile",
+            description=(
+                f"**@{profile['name']} {emoji} ({user_id})**\n"
+                f"**Account Created:** <t:{profile['created_unix']}:f>\n\n"
+                f"```{profile['description']}```\n"
+                f"**Connections:** {profile['friends']}/{profile['followers']}/{profile['followings']}\n"
+                f"**Status:** {status}" +
+                (f" ({last_online})"
+                 if status == "Offline" and last_online != "N/A" else "")),
+            color=discord.Color.from_str("#000001"))
+
+        if profile["image_url"]:
+            embed.set_thumbnail(url=profile["image_url"])
+        embed.set_footer(text="Neroniel")
+        embed.timestamp = datetime.now(PH_TIMEZONE)
 
-            await interaction.followup.send(embed=embed)
+        await interaction.followup.send(embed=embed)
 
     except Exception as e:
         await interaction.followup.send(f"❌ An error occurred: `{e}`",
@@ -3793,59 +5721,57 @@ async def roblox_community(interaction: discord.Interaction, name: str):
         else:
             search_url = f"https://groups.roblox.com/v1/groups/search?keyword={name}&limit=100"
             best_match = None
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url) as resp:
-                    if resp.status != 200:
-                        return await interaction.followup.send(
-                            "❌ Failed to search groups. Try using a Group ID instead.",
-                            ephemeral=True)
-                    data = await resp.json()
-                    groups = data.get('data', [])
-                    if not groups:
-                        return await interaction.followup.send(
-                            f"❌ No public group found with name: `{name}`",
-                            ephemeral=True)
-                # Clean user input for robust matching
-                clean_query = clean_for_match(name)
-                # Step 1: Look for exact semantic match (ignoring punctuation/case)
-                for group in groups:
-                    clean_group = clean_for_match(group['name'])
-                    if clean_group == clean_query:
-                        best_match = group
-                        break
-                # Step 2: If none, fallback to contains + highest members
-                if best_match is None:
-                    candidates = [
-                        g for g in groups
-                        if clean_query in clean_for_match(g['name'])
-                    ]
-                    if candidates:
-                        best_match = max(candidates,
-                                         key=lambda g: g.get('memberCount', 0))
-                    else:
-                        best_match = groups[0]  # fallback
-                group_id = best_match['id']
-        # Fetch full group info
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                    f"https://groups.roblox.com/v1/groups/{group_id}"
-            ) as response:
-                if response.status != 200:
+            async with http_pool.get(search_url) as resp:
+                if resp.status != 200:
                     return await interaction.followup.send(
-                        "❌ Group not found or is private.", ephemeral=True)
-                group_data = await response.json()
-            # Fetch icon
-            icon_url = None
-            try:
-                async with session.get(
-                        f"https://thumbnails.roproxy.com/v1/groups/icons?groupIds={group_id}&size=420x420&format=Png"
-                ) as icon_resp:
-                    if icon_resp.status == 200:
-                        icon_data = await icon_resp.json()
-                        if icon_data.get('data'):
-                            icon_url = icon_data['data'][0]['imageUrl']
-            except Exception as e:
-                print(f"[WARNING] Failed to fetch community group icon: {e}")
+                        "❌ Failed to search groups. Try using a Group ID instead.",
+                        ephemeral=True)
+                data = await resp.json()
+                groups = data.get('data', [])
+                if not groups:
+                    return await interaction.followup.send(
+                        f"❌ No public group found with name: `{name}`",
+                        ephemeral=True)
+            # Clean user input for robust matching
+            clean_query = clean_for_match(name)
+            # Step 1: Look for exact semantic match (ignoring punctuation/case)
+            for group in groups:
+                clean_group = clean_for_match(group['name'])
+                if clean_group == clean_query:
+                    best_match = group
+                    break
+            # Step 2: If none, fallback to contains + highest members
+            if best_match is None:
+                candidates = [
+                    g for g in groups
+                    if clean_query in clean_for_match(g['name'])
+                ]
+                if candidates:
+                    best_match = max(candidates,
+                                     key=lambda g: g.get('memberCount', 0))
+                else:
+                    best_match = groups[0]  # fallback
+            group_id = best_match['id']
+        # Fetch full group info
+        async with http_pool.get(
+                f"https://groups.roblox.com/v1/groups/{group_id}"
+        ) as response:
+            if response.status != 200:
+                return await interaction.followup.send(
+                    "❌ Group not found or is private.", ephemeral=True)
+            group_data = await response.json()
+        # Fetch icon
+        icon_url = None
+        try:
+            async with http_pool.get(
+                    f"https://thumbnails.roproxy.com/v1/groups/icons?groupIds={group_id}&size=420x420&format=Png"
+            ) as icon_resp:
+                if icon_resp.status == 200:
+                    icon_data = await icon_resp.json()
+                    if icon_data.get('data'):
+                        icon_url = icon_data['data'][0]['imageUrl']
+        except Exception as e:
+            print(f"[WARNING] Failed to fetch community group icon: {e}")
         formatted_members = "{:,}".format(group_data['memberCount'])
         embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
         embed.add_field(
@@ -3886,84 +5812,56 @@ async def roblox_avatar(interaction: discord.Interaction, user: str):
         user_id = None
         username = None
         display_name = None
-        async with aiohttp.ClientSession() as session:
-            # Resolve username or ID
-            if user.isdigit():
-                user_id = int(user)
-                async with session.get(
-                        f"https://users.roblox.com/v1/users/{user_id}"
-                ) as resp:
-                    if resp.status != 200:
-                        return await interaction.followup.send(
-                            "❌ User not found.", ephemeral=True)
-                    user_data = await resp.json()
-                    username = user_data['name']
-                    display_name = user_data['displayName']
+        # Resolve username or ID
+        try:
+            user_data = await roblox_users.resolve(user)
+        except RobloxAPIError:
+            return await interaction.followup.send(
+                "❌ Could not find that Roblox user.", ephemeral=True)
+        if not user_data:
+            return await interaction.followup.send(
+                "❌ User not found.", ephemeral=True)
+        user_id = user_data['id']
+        username = user_data['name']
+        display_name = user_data['displayName']
+        # Fetch FULL-BODY avatar
+        thumb_url = f"https://thumbnails.roproxy.com/v1/users/avatar?userIds={user_id}&size=420x420&format=Png&scale=1"
+        async with http_pool.get(thumb_url) as resp:
+            if resp.status == 200:
+                thumb_data = await resp.json()
+                image_url = thumb_data['data'][0]['imageUrl']
             else:
-                resolve_url = "https://users.roblox.com/v1/usernames/users"
-                payload = {"usernames": [user]}
-                headers = {"Content-Type": "application/json"}
-                async with session.post(resolve_url,
-                                        json=payload,
-                                        headers=headers) as resp:
-                    if resp.status != 200:
-                        return await interaction.followup.send(
-                            "❌ Could not find that Roblox user.",
-                            ephemeral=True)
-                    data = await resp.json()
-                    if not data['data']:
-                        return await interaction.followup.send(
-                            "❌ User not found.", ephemeral=True)
-                    user_id = data['data'][0]['id']
-                    username = data['data'][0]['name']
-                    display_name = data['data'][0]['displayName']
-            # Fetch FULL-BODY avatar
-            thumb_url = f"https://thumbnails.roproxy.com/v1/users/avatar?userIds={user_id}&size=420x420&format=Png&scale=1"
-            async with session.get(thumb_url) as resp:
-                if resp.status == 200:
-                    thumb_data = await resp.json()
-                    image_url = thumb_data['data'][0]['imageUrl']
-                else:
-                    image_url = f"https://www.roproxy.com/avatar-thumbnail/image?userId={user_id}&width=420&height=420&format=png"
-            # === Fetch Verified (public) ===
-            verified = False
+                image_url = f"https://www.roproxy.com/avatar-thumbnail/image?userId={user_id}&width=420&height=420&format=png"
+        # === Verified (public, already part of the resolved user) ===
+        verified = user_data.get('hasVerifiedBadge', False)
+        # === Fetch Premium (private, requires cookie) ===
+        premium = False
+        cookie = os.getenv("ROBLOX_COOKIE")
+        if cookie:
             try:
-                async with session.get(
-                        f"https://users.roblox.com/v1/users/{user_id}"
-                ) as resp:
+                headers = {"Cookie": f".ROBLOSECURITY={cookie}"}
+                async with http_pool.get(
+                        f"https://premiumfeatures.roblox.com/v1/users/{user_id}/validate-membership",
+                        headers=headers) as resp:
                     if resp.status == 200:
-                        user_info = await resp.json()
-                        verified = user_info.get('hasVerifiedBadge', False)
+                        premium = await resp.json()
             except:
                 pass
-            # === Fetch Premium (private, requires cookie) ===
-            premium = False
-            cookie = os.getenv("ROBLOX_COOKIE")
-            if cookie:
-                try:
-                    headers = {"Cookie": f".ROBLOSECURITY={cookie}"}
-                    async with session.get(
-                            f"https://premiumfeatures.roblox.com/v1/users/{user_id}/validate-membership",
-                            headers=headers) as resp:
-                        if resp.status == 200:
-                            premium = await resp.json()
-                except:
-                    pass
-            # === Build emoji string ===
-            emoji = ""
-            if verified:
-                emoji += "<:RobloxVerified:1400310297184702564>"
-            if premium:
-                emoji += "<:RobloxPremium:1438836163816198245>"
-            display_title = f"{username} {emoji}".strip()
-            embed = discord.Embed(
-                title=display_title,
-                url=f"https://www.roblox.com/users/{user_id}/profile",
-                color=discord.Color.from_rgb(0, 0, 0))
-            embed.set_image(url=image_url)
-            embed.set_footer(text="Neroniel")
-            embed.timestamp = datetime.now(PH_TIMEZONE)
-            await interaction.followup.send(embed=embed)
+        # === Build emoji string ===
+        emoji = ""
+        if verified:
+            emoji += "<:RobloxVerified:1400310297184702564>"
+        if premium:
+            emoji += "<:RobloxPremium:1438836163816198245>"
+        display_title = f"{username} {emoji}".strip()
+        embed = discord.Embed(
+            title=display_title,
+            url=f"https://www.roblox.com/users/{user_id}/profile",
+            color=discord.Color.from_rgb(0, 0, 0))
+        embed.set_image(url=image_url)
+        embed.set_footer(text="Neroniel")
+        embed.timestamp = datetime.now(PH_TIMEZONE)
+        await interaction.followup.send(embed=embed)
     except Exception as e:
         await interaction.followup.send(f"❌ An error occurred: `{str(e)}`",
                                         ephemeral=True)
@@ -4038,17 +5936,16 @@ async def roblox_icon(interaction: discord.Interaction, id: str):
     await interaction.response.defer()
 
     try:
-        async with aiohttp.ClientSession() as session:
-            # Fetch icon
-            icon_url = f"https://thumbnails.roblox.com/v1/places/gameicons?placeIds={place_id}&size=512x512&format=Png&isCircular=false"
-            async with session.get(icon_url) as icon_resp:
-                if icon_resp.status != 200:
-                    raise Exception("Failed to fetch icon")
-                icon_data = await icon_resp.json()
-                if not icon_data.get('data') or not icon_data['data'][0].get(
-                        'imageUrl'):
-                    raise Exception("No icon available")
-                image = icon_data['data'][0]['imageUrl']
+        # Fetch icon
+        icon_url = f"https://thumbnails.roblox.com/v1/places/gameicons?placeIds={place_id}&size=512x512&format=Png&isCircular=false"
+        async with http_pool.get(icon_url) as icon_resp:
+            if icon_resp.status != 200:
+                raise Exception("Failed to fetch icon")
+            icon_data = await icon_resp.json()
+            if not icon_data.get('data') or not icon_data['data'][0].get(
+                    'imageUrl'):
+                raise Exception("No icon available")
+            image = icon_data['data'][0]['imageUrl']
 
         # Create embed with only the image
         embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
@@ -4084,75 +5981,106 @@ async def roblox_promote_rank(interaction: discord.Interaction, username: str):
     await interaction.response.defer(ephemeral=False)
 
     try:
-        async with aiohttp.ClientSession() as session:
-            # Step 1: Resolve username → user ID
-            async with session.post(
-                    "https://users.roblox.com/v1/usernames/users",
-                    json={
-                        "usernames": [username],
-                        "excludeBannedUsers": True
-                    },
-                    headers={"Content-Type": "application/json"}) as resp:
-                if resp.status != 200:
-                    await interaction.followup.send(
-                        "❌ Failed to resolve username.", ephemeral=False)
-                    return
-                data = await resp.json()
-                if not data.get("data"):
-                    await interaction.followup.send("❌ Roblox user not found.",
-                                                    ephemeral=False)
-                    return
-                user_id = data["data"][0]["id"]
-                display_name = data["data"][0]["displayName"]
-
-            # Step 2: Fetch group roles to get the correct roleId for "〆 Contributor"
-            async with session.get(
-                    f"https://groups.roblox.com/v1/groups/{GROUP_ID}/roles"
-            ) as roles_resp:
-                if roles_resp.status != 200:
-                    await interaction.followup.send(
-                        "❌ Could not fetch group roles.", ephemeral=False)
-                    return
-                roles_info = await roles_resp.json()
-            target_role_id = None
-            for role in roles_info.get("roles", []):
-                if role.get("rank") == TARGET_RANK and role.get(
-                        "name") == TARGET_ROLE_NAME:
-                    target_role_id = role["id"]
-                    break
-            if not target_role_id:
+        # Step 1: Resolve username → user ID
+        try:
+            user_info = await roblox_users.resolve_username(
+                username, exclude_banned=True)
+        except RobloxAPIError:
+            await interaction.followup.send(
+                "❌ Failed to resolve username.", ephemeral=False)
+            return
+        if not user_info:
+            await interaction.followup.send("❌ Roblox user not found.",
+                                            ephemeral=False)
+            return
+        user_id = user_info["id"]
+        display_name = user_info["displayName"]
+
+        # Step 2: Fetch group roles to get the correct roleId for "〆 Contributor"
+        async with http_pool.get(
+                f"https://groups.roblox.com/v1/groups/{GROUP_ID}/roles"
+        ) as roles_resp:
+            if roles_resp.status != 200:
                 await interaction.followup.send(
-                    f"❌ Could not find role with rank {TARGET_RANK} and name '{TARGET_ROLE_NAME}'.",
-                    ephemeral=False)
+                    "❌ Could not fetch group roles.", ephemeral=False)
                 return
+            roles_info = await roles_resp.json()
+        target_role_id = None
+        for role in roles_info.get("roles", []):
+            if role.get("rank") == TARGET_RANK and role.get(
+                    "name") == TARGET_ROLE_NAME:
+                target_role_id = role["id"]
+                break
+        if not target_role_id:
+            await interaction.followup.send(
+                f"❌ Could not find role with rank {TARGET_RANK} and name '{TARGET_ROLE_NAME}'.",
+                ephemeral=False)
+            return
 
-            # Step 3: Check current group role
-            async with session.get(
-                    f"https://groups.roblox.com/v2/users/{user_id}/groups/roles"
-            ) as resp:
-                if resp.status != 200:
-                    await interaction.followup.send(
-                        "❌ Could not fetch group membership.", ephemeral=False)
-                    return
-                roles_data = await resp.json()
-            current_role = None
-            for entry in roles_data.get("data", []):
-                if entry["group"]["id"] == GROUP_ID:
-                    current_role = entry["role"]
-                    break
-
-            if not current_role:
+        # Step 3: Check current group role
+        async with http_pool.get(
+                f"https://groups.roblox.com/v2/users/{user_id}/groups/roles"
+        ) as resp:
+            if resp.status != 200:
                 await interaction.followup.send(
-                    f"❌ `{username}` is not in the 1cy Group. They must join first.",
-                    ephemeral=False)
+                    "❌ Could not fetch group membership.", ephemeral=False)
                 return
+            roles_data = await resp.json()
+        current_role = None
+        for entry in roles_data.get("data", []):
+            if entry["group"]["id"] == GROUP_ID:
+                current_role = entry["role"]
+                break
 
-            if current_role.get("rank") == TARGET_RANK and current_role.get(
-                    "name") == TARGET_ROLE_NAME:
+        if not current_role:
+            await interaction.followup.send(
+                f"❌ `{username}` is not in the 1cy Group. They must join first.",
+                ephemeral=False)
+            return
+
+        if current_role.get("rank") == TARGET_RANK and current_role.get(
+                "name") == TARGET_ROLE_NAME:
+            embed = discord.Embed(
+                title="✅ Already 〆 Contributor",
+                description=
+                f"`{username}` ({display_name}) is already **〆 Contributor** in 1cy.",
+                color=discord.Color.green())
+            embed.set_thumbnail(
+                url=
+                f"https://www.roblox.com/headshot-thumbnail/image?userId={user_id}&width=150&height=150&format=png"
+            )
+            embed.set_footer(text="Neroniel")
+            embed.timestamp = datetime.now(PH_TIMEZONE)
+            await interaction.followup.send(embed=embed, ephemeral=False)
+            return
+
+        # Step 4: Get X-CSRF-TOKEN
+        async with http_pool.post("https://auth.roblox.com/v2/logout",
+                                  headers={"Cookie": ROBLOX_COOKIE}) as csrf_resp:
+            xcsrf_token = csrf_resp.headers.get("x-csrf-token")
+        if not xcsrf_token:
+            await interaction.followup.send(
+                "❌ Failed to retrieve X-CSRF-TOKEN. Cookie may be invalid or expired.",
+                ephemeral=False)
+            return
+
+        # Step 5: Promote using correct roleId and X-CSRF-TOKEN
+        update_url = f"https://groups.roblox.com/v1/groups/{GROUP_ID}/users/{user_id}"
+        headers = {
+            "Cookie": ROBLOX_COOKIE,
+            "X-CSRF-TOKEN": xcsrf_token,
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "roleId": target_role_id
+        }  # ✅ Use real roleId, not rank number
+        async with http_pool.patch(update_url, headers=headers,
+                                 json=payload) as resp:
+            if resp.status == 200:
                 embed = discord.Embed(
-                    title="✅ Already 〆 Contributor",
+                    title="✅ Promoted to 〆 Contributor",
                     description=
-                    f"`{username}` ({display_name}) is already **〆 Contributor** in 1cy.",
+                    f"`{username}` ({display_name}) has been set to **〆 Contributor** in 1cy.",
                     color=discord.Color.green())
                 embed.set_thumbnail(
                     url=
@@ -4160,58 +6088,21 @@ async def roblox_promote_rank(interaction: discord.Interaction, username: str):
                 )
                 embed.set_footer(text="Neroniel")
                 embed.timestamp = datetime.now(PH_TIMEZONE)
-                await interaction.followup.send(embed=embed, ephemeral=False)
-                return
-
-            # Step 4: Get X-CSRF-TOKEN
-            csrf_resp = await session.post("https://auth.roblox.com/v2/logout",
-                                           headers={"Cookie": ROBLOX_COOKIE})
-            xcsrf_token = csrf_resp.headers.get("x-csrf-token")
-            if not xcsrf_token:
+                await interaction.followup.send(embed=embed,
+                                                ephemeral=False)
+            elif resp.status == 403:
                 await interaction.followup.send(
-                    "❌ Failed to retrieve X-CSRF-TOKEN. Cookie may be invalid or expired.",
+                    "❌ Permission denied. Your cookie may be invalid, expired, or lack group management rights.",
+                    ephemeral=False)
+            elif resp.status == 400:
+                await interaction.followup.send(
+                    "❌ Invalid request. This usually means the roleId is wrong or the user isn’t in the group.",
+                    ephemeral=False)
+            else:
+                error_text = await resp.text()
+                await interaction.followup.send(
+                    f"❌ Failed to update rank (HTTP {resp.status}): `{error_text}`",
                     ephemeral=False)
-                return
-
-            # Step 5: Promote using correct roleId and X-CSRF-TOKEN
-            update_url = f"https://groups.roblox.com/v1/groups/{GROUP_ID}/users/{user_id}"
-            headers = {
-                "Cookie": ROBLOX_COOKIE,
-                "X-CSRF-TOKEN": xcsrf_token,
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "roleId": target_role_id
-            }  # ✅ Use real roleId, not rank number
-            async with session.patch(update_url, headers=headers,
-                                     json=payload) as resp:
-                if resp.status == 200:
-                    embed = discord.Embed(
-                        title="✅ Promoted to 〆 Contributor",
-                        description=
-                        f"`{username}` ({display_name}) has been set to **〆 Contributor** in 1cy.",
-                        color=discord.Color.green())
-                    embed.set_thumbnail(
-                        url=
-                        f"https://www.roblox.com/headshot-thumbnail/image?userId={user_id}&width=150&height=150&format=png"
-                    )
-                    embed.set_footer(text="Neroniel")
-                    embed.timestamp = datetime.now(PH_TIMEZONE)
-                    await interaction.followup.send(embed=embed,
-                                                    ephemeral=False)
-                elif resp.status == 403:
-                    await interaction.followup.send(
-                        "❌ Permission denied. Your cookie may be invalid, expired, or lack group management rights.",
-                        ephemeral=False)
-                elif resp.status == 400:
-                    await interaction.followup.send(
-                        "❌ Invalid request. This usually means the roleId is wrong or the user isn’t in the group.",
-                        ephemeral=False)
-                else:
-                    error_text = await resp.text()
-                    await interaction.followup.send(
-                        f"❌ Failed to update rank (HTTP {resp.status}): `{error_text}`",
-                        ephemeral=False)
 
     except Exception as e:
         await interaction.followup.send(f"❌ Error: {str(e)}", ephemeral=False)
@@ -4244,136 +6135,135 @@ async def roblox_game(interaction: discord.Interaction, id: str):
             ephemeral=True)
 
     try:
-        async with aiohttp.ClientSession() as session:
-
-            # ----------------------------------------------
-            # 2️⃣ Convert Place → Universe
-            # ----------------------------------------------
-            universe_url = f"https://apis.roblox.com/universes/v1/places/{place_id}/universe"
-            async with session.get(universe_url) as uni_resp:
-                if uni_resp.status != 200:
-                    raise Exception(
-                        f"HTTP {uni_resp.status}: Invalid or private Place ID")
-
-                uni_data = await uni_resp.json()
-                universe_id = uni_data.get("universeId")
-                if not universe_id:
-                    raise Exception("Unable to extract Universe ID.")
-
-            # ----------------------------------------------
-            # 3️⃣ Fetch game info
-            # ----------------------------------------------
-            game_url = f"https://games.roblox.com/v1/games?universeIds={universe_id}"
-            async with session.get(game_url) as resp:
-                if resp.status != 200:
-                    raise Exception(
-                        f"HTTP {resp.status}: Failed to fetch game info.")
 
-                data = await resp.json()
-                if not data.get("data"):
-                    raise Exception("Game not found or private.")
-
-            game = data["data"][0]
-            game_name = game.get("name", "Unknown Game")
-            description = game.get("description", "No description available.")
-            visits = game.get("visits", 0)
-            playing = game.get("playing", 0)
-            favorites = game.get("favoritedCount", 0)
-            max_players = game.get("maxPlayers", "N/A")
-            created_at = game.get("created")
-            updated_at = game.get("updated")
-
-            creator = game.get("creator", {})
-            creator_name = creator.get("name", "Unknown Creator")
-            creator_id = creator.get("id", 0)
-            creator_type = creator.get("type", "User")
-
-            # ----------------------------------------------
-            # Verified badge
-            # ----------------------------------------------
-            verified_emoji = ""
-            if creator.get("hasVerifiedBadge") or creator.get("isVerified"):
-                verified_emoji = "<:RobloxVerified:1400310297184702564>"
-
-            creator_display = f"{creator_name} {verified_emoji}" if verified_emoji else creator_name
-            if creator_type == "Group":
-                creator_link = f"[{creator_display}](https://www.roblox.com/groups/{creator_id})"
-            else:
-                creator_link = f"[{creator_display}](https://www.roblox.com/users/{creator_id}/profile)"
-
-            # ----------------------------------------------
-            # 3.5️⃣ Fetch game icon thumbnail
-            # ----------------------------------------------
-            thumbnail_url = None
-            thumbnail_api = f"https://thumbnails.roblox.com/v1/games/icons?universeIds={universe_id}&size=150x150&format=Png&isCircular=false"
-            async with session.get(thumbnail_api) as thumb_resp:
-                if thumb_resp.status == 200:
-                    thumb_data = await thumb_resp.json()
-                    if thumb_data.get("data"):
-                        thumbnail_url = thumb_data["data"][0].get("imageUrl")
-
-            # ----------------------------------------------
-            # 4️⃣ Fetch Likes / Dislikes
-            # ----------------------------------------------
-            votes_url = f"https://games.roblox.com/v1/games/votes?universeIds={universe_id}"
-            likes = dislikes = 0
-            async with session.get(votes_url) as votes_resp:
-                if votes_resp.status == 200:
-                    votes_json = await votes_resp.json()
-                    if votes_json.get("data"):
-                        vote_data = votes_json["data"][0]
-                        likes = vote_data.get("upVotes", 0)
-                        dislikes = vote_data.get("downVotes", 0)
-
-            # ----------------------------------------------
-            # 5️⃣ Convert Created / Updated to Discord Timestamps
-            # ----------------------------------------------
-            from dateutil.parser import isoparse
-            created_unix = int(
-                isoparse(created_at).timestamp()) if created_at else 0
-            updated_unix = int(
-                isoparse(updated_at).timestamp()) if updated_at else 0
-
-            # ----------------------------------------------
-            # 6️⃣ Build Links
-            # ----------------------------------------------
-            game_link = f"https://www.roblox.com/games/{place_id}"
-            game_link_md = f"[{game_name}]({game_link})"
-
-            # ----------------------------------------------
-            # 7️⃣ Build the Embed
-            # ----------------------------------------------
-            embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
-
-            full_text = f"**{game_link_md}**\n\n{description}"
-            if len(full_text) > 1024:
-                full_text = full_text[:1000] + "... *(truncated)*"
-
-            embed.add_field(name="", value=full_text, inline=False)
-            embed.add_field(name="Creator", value=creator_link, inline=True)
-            embed.add_field(name="Playing", value=f"{playing:,}", inline=True)
-            embed.add_field(name="Visits", value=f"{visits:,}", inline=True)
-            embed.add_field(name="Likes | Dislikes | Favorites",
-                            value=f"{likes:,} | {dislikes:,} | {favorites:,}",
-                            inline=True)
-            embed.add_field(
-                name="Created | Updated",
-                value=f"<t:{created_unix}:f> | <t:{updated_unix}:f>",
-                inline=True)
-            embed.add_field(name="Max Server Size",
-                            value=str(max_players),
-                            inline=True)
-
-            if thumbnail_url:
-                embed.set_thumbnail(url=thumbnail_url)
-
-            embed.set_footer(text="Neroniel • /roblox game")
-            embed.timestamp = datetime.now(PH_TIMEZONE)
+        # ----------------------------------------------
+        # 2️⃣ Convert Place → Universe
+        # ----------------------------------------------
+        universe_url = f"https://apis.roblox.com/universes/v1/places/{place_id}/universe"
+        async with http_pool.get(universe_url) as uni_resp:
+            if uni_resp.status != 200:
+                raise Exception(
+                    f"HTTP {uni_resp.status}: Invalid or private Place ID")
+
+            uni_data = await uni_resp.json()
+            universe_id = uni_data.get("universeId")
+            if not universe_id:
+                raise Exception("Unable to extract Universe ID.")
+
+        # ----------------------------------------------
+        # 3️⃣ Fetch game info
+        # ----------------------------------------------
+        game_url = f"https://games.roblox.com/v1/games?universeIds={universe_id}"
+        async with http_pool.get(game_url) as resp:
+            if resp.status != 200:
+                raise Exception(
+                    f"HTTP {resp.status}: Failed to fetch game info.")
+
+            data = await resp.json()
+            if not data.get("data"):
+                raise Exception("Game not found or private.")
+
+        game = data["data"][0]
+        game_name = game.get("name", "Unknown Game")
+        description = game.get("description", "No description available.")
+        visits = game.get("visits", 0)
+        playing = game.get("playing", 0)
+        favorites = game.get("favoritedCount", 0)
+        max_players = game.get("maxPlayers", "N/A")
+        created_at = game.get("created")
+        updated_at = game.get("updated")
+
+        creator = game.get("creator", {})
+        creator_name = creator.get("name", "Unknown Creator")
+        creator_id = creator.get("id", 0)
+        creator_type = creator.get("type", "User")
+
+        # ----------------------------------------------
+        # Verified badge
+        # ----------------------------------------------
+        verified_emoji = ""
+        if creator.get("hasVerifiedBadge") or creator.get("isVerified"):
+            verified_emoji = "<:RobloxVerified:1400310297184702564>"
+
+        creator_display = f"{creator_name} {verified_emoji}" if verified_emoji else creator_name
+        if creator_type == "Group":
+            creator_link = f"[{creator_display}](https://www.roblox.com/groups/{creator_id})"
+        else:
+            creator_link = f"[{creator_display}](https://www.roblox.com/users/{creator_id}/profile)"
+
+        # ----------------------------------------------
+        # 3.5️⃣ Fetch game icon thumbnail
+        # ----------------------------------------------
+        thumbnail_url = None
+        thumbnail_api = f"https://thumbnails.roblox.com/v1/games/icons?universeIds={universe_id}&size=150x150&format=Png&isCircular=false"
+        async with http_pool.get(thumbnail_api) as thumb_resp:
+            if thumb_resp.status == 200:
+                thumb_data = await thumb_resp.json()
+                if thumb_data.get("data"):
+                    thumbnail_url = thumb_data["data"][0].get("imageUrl")
+
+        # ----------------------------------------------
+        # 4️⃣ Fetch Likes / Dislikes
+        # ----------------------------------------------
+        votes_url = f"https://games.roblox.com/v1/games/votes?universeIds={universe_id}"
+        likes = dislikes = 0
+        async with http_pool.get(votes_url) as votes_resp:
+            if votes_resp.status == 200:
+                votes_json = await votes_resp.json()
+                if votes_json.get("data"):
+                    vote_data = votes_json["data"][0]
+                    likes = vote_data.get("upVotes", 0)
+                    dislikes = vote_data.get("downVotes", 0)
+
+        # ----------------------------------------------
+        # 5️⃣ Convert Created / Updated to Discord Timestamps
+        # ----------------------------------------------
+        from dateutil.parser import isoparse
+        created_unix = int(
+            isoparse(created_at).timestamp()) if created_at else 0
+        updated_unix = int(
+            isoparse(updated_at).timestamp()) if updated_at else 0
+
+        # ----------------------------------------------
+        # 6️⃣ Build Links
+        # ----------------------------------------------
+        game_link = f"https://www.roblox.com/games/{place_id}"
+        game_link_md = f"[{game_name}]({game_link})"
+
+        # ----------------------------------------------
+        # 7️⃣ Build the Embed
+        # ----------------------------------------------
+        embed = discord.Embed(color=discord.Color.from_rgb(0, 0, 0))
+
+        full_text = f"**{game_link_md}**\n\n{description}"
+        if len(full_text) > 1024:
+            full_text = full_text[:1000] + "... *(truncated)*"
+
+        embed.add_field(name="", value=full_text, inline=False)
+        embed.add_field(name="Creator", value=creator_link, inline=True)
+        embed.add_field(name="Playing", value=f"{playing:,}", inline=True)
+        embed.add_field(name="Visits", value=f"{visits:,}", inline=True)
+        embed.add_field(name="Likes | Dislikes | Favorites",
+                        value=f"{likes:,} | {dislikes:,} | {favorites:,}",
+                        inline=True)
+        embed.add_field(
+            name="Created | Updated",
+            value=f"<t:{created_unix}:f> | <t:{updated_unix}:f>",
+            inline=True)
+        embed.add_field(name="Max Server Size",
+                        value=str(max_players),
+                        inline=True)
+
+        if thumbnail_url:
+            embed.set_thumbnail(url=thumbnail_url)
 
-            # ----------------------------------------------
-            # 8️⃣ Send embed
-            # ----------------------------------------------
-            return await interaction.followup.send(embed=embed)
+        embed.set_footer(text="Neroniel • /roblox game")
+        embed.timestamp = datetime.now(PH_TIMEZONE)
+
+        # ----------------------------------------------
+        # 8️⃣ Send embed
+        # ----------------------------------------------
+        return await interaction.followup.send(embed=embed)
 
     except Exception as e:
         return await interaction.followup.send(
@@ -4392,90 +6282,137 @@ async def on_ready():
     print(f"Bot is ready! Logged in as {bot.user}")
     await bot.tree.sync()
     print("All commands synced!")
-    # Start background tasks after bot is ready
-    if reminders_collection is not None:
-        if not check_reminders.is_running():
-            print("✅ Starting reminder checker...")
-            check_reminders.start()
+    # Start background tasks after bot is ready. The scheduler goes first so
+    # a failed restore step below can't leave jobs unfired
+    try:
+        await scheduler.load()
+    except Exception as e:
+        print(f"[SCHEDULER] Failed to load jobs: {e}")
+    print("✅ Starting scheduler...")
+    scheduler.start()
+    if giveaway_counters_collection is not None:
+        if not flush_giveaway_counters.is_running():
+            flush_giveaway_counters.start()
+    if conversations_collection is not None:
+        if not flush_conversation_turns.is_running():
+            flush_conversation_turns.start()
+    try:
+        await bot.ai_threads.load()
+    except Exception as e:
+        print(f"[AI] Failed to restore AI threads: {e}")
+
+    # Warm the rate cache so conversions never hit the database
+    if rates_collection is not None:
+        try:
+            await warm_rate_cache()
+        except Exception as e:
+            print(f"[!] Failed to warm rate cache: {e}")
 
     # Restore giveaways
     if giveaways_collection is not None:
-        active_giveaways = giveaways_collection.find({"ended": {"$ne": True}})
-        for gw in active_giveaways:
-            # Ensure end_time is timezone-aware (MongoDB returns naive datetime)
-            end_time = gw["end_time"]
-            if end_time.tzinfo is None:
-                # MongoDB stores naive datetimes → we stored them as UTC, so assume UTC
-                end_time = pytz.UTC.localize(end_time)
-            else:
-                # Ensure it's in UTC (normalize just in case)
-                end_time = end_time.astimezone(pytz.UTC)
-
-            # Now convert "now" to UTC for fair comparison
-            now_utc = datetime.now(pytz.UTC)
+        try:
+            await backfill_entry_counts()
+            active_giveaways = await find_active_giveaways()
+            bot.active_giveaways.clear()
+            for gw in active_giveaways:
+                # Ensure end_time is timezone-aware (MongoDB returns naive datetime)
+                end_time = gw["end_time"]
+                if end_time.tzinfo is None:
+                    # MongoDB stores naive datetimes → we stored them as UTC, so assume UTC
+                    end_time = pytz.UTC.localize(end_time)
+                else:
+                    # Ensure it's in UTC (normalize just in case)
+                    end_time = end_time.astimezone(pytz.UTC)
+
+                # Now convert "now" to UTC for fair comparison
+                now_utc = datetime.now(pytz.UTC)
+
+                # Giveaways started before the scheduler existed have no job yet
+                if f"giveaway_end:{gw['_id']}" not in scheduler.jobs:
+                    await scheduler.schedule("giveaway_end", gw["_id"], end_time,
+                                             {"giveaway_id": gw["_id"]})
+
+                if end_time > now_utc:
+                    index_giveaway(gw)
+                    # Reattach view to message
+                    guild = bot.get_guild(int(gw["guild_id"]))
+                    if guild:
+                        channel = guild.get_channel(int(gw["channel_id"]))
+                        if channel:
+                            try:
+                                msg = await channel.fetch_message(
+                                    int(gw["message_id"]))
+                                view = PersistentGiveawayView(
+                                    giveaway_id=gw["_id"],
+                                    host_id=int(gw["host_id"]),
+                                    prize=gw["prize"],
+                                    end_time=gw["end_time"],
+                                    winner_count=gw["winner_count"],
+                                    required_roles=gw["required_roles"],
+                                    message_requirement=gw.get(
+                                        "message_requirement"),
+                                    invite_requirement=gw.get(
+                                        "invite_requirement"))
+                                await msg.edit(view=view)
+                            except Exception as e:
+                                print(f"[GIVEAWAY] Failed to restore: {e}")
+
+            # Rehydrate message/invite progress for giveaways still running
+            running_ids = [
+                gid for guild_giveaways in bot.active_giveaways.values()
+                for gid in guild_giveaways
+            ]
+            await bot.giveaway_message_counts.load(running_ids)
+            await bot.giveaway_invite_counts.load(running_ids)
+        except Exception as e:
+            print(f"[GIVEAWAY] Failed to restore giveaways: {e}")
 
-            if end_time <= now_utc:
-                asyncio.create_task(end_giveaway_now(gw["_id"]))
-            else:
-                delay = (end_time - now_utc).total_seconds()
-                asyncio.create_task(end_giveaway_later(gw["_id"], delay))
-                # Reattach view to message
-                guild = bot.get_guild(int(gw["guild_id"]))
-                if guild:
-                    channel = guild.get_channel(int(gw["channel_id"]))
-                    if channel:
-                        try:
-                            msg = await channel.fetch_message(
-                                int(gw["message_id"]))
-                            view = PersistentGiveawayView(
-                                giveaway_id=gw["_id"],
-                                host_id=int(gw["host_id"]),
-                                prize=gw["prize"],
-                                end_time=gw["end_time"],
-                                winner_count=gw["winner_count"],
-                                required_roles=gw["required_roles"],
-                                message_requirement=gw.get(
-                                    "message_requirement"))
-                            await msg.edit(view=view)
-                        except Exception as e:
-                            print(f"[GIVEAWAY] Failed to restore: {e}")
+    # Same for reminders created before the scheduler existed
+    if reminders_collection is not None:
+        try:
+            for reminder in await find_pending_reminders():
+                if f"reminder:{reminder['_id']}" not in scheduler.jobs:
+                    await scheduler.schedule("reminder", reminder["_id"],
+                                             reminder["reminder_time"])
+        except Exception as e:
+            print(f"[REMINDER] Failed to backfill reminders: {e}")
 
     # Start 1cy member count status loop
     GROUP_ID = int(os.getenv("GROUP_ID"))
 
-    # Create a persistent ClientSession for this loop
-    async with aiohttp.ClientSession() as session:
-        while True:
-            try:
-                # Use aiohttp instead of requests
-                async with session.get(
-                        f"https://groups.roblox.com/v1/groups/{GROUP_ID}"
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        member_count = data.get('memberCount', 0)
-                        await bot.change_presence(
-                            status=discord.Status.dnd,
-                            activity=discord.Activity(
-                                type=discord.ActivityType.watching,
-                                name=f"1cy | {member_count:,} Members"))
-                    else:
-                        print(
-                            f"[WARNING] Roblox API returned status {response.status}"
-                        )
-                        await bot.change_presence(
-                            status=discord.Status.dnd,
-                            activity=discord.Activity(
-                                type=discord.ActivityType.watching,
-                                name="1cy"))
-            except Exception as e:
-                print(f"[ERROR] Failed to fetch group info: {str(e)}")
-                await bot.change_presence(
-                    status=discord.Status.dnd,
-                    activity=discord.Activity(
-                        type=discord.ActivityType.watching, name="1cy"))
-            # Wait 60 seconds before next update
-            await asyncio.sleep(60)
-
-
-bot.run(os.getenv('DISCORD_TOKEN'))
+    while True:
+        try:
+            # Use aiohttp instead of requests
+            async with http_pool.get(
+                    f"https://groups.roblox.com/v1/groups/{GROUP_ID}"
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    member_count = data.get('memberCount', 0)
+                    await bot.change_presence(
+                        status=discord.Status.dnd,
+                        activity=discord.Activity(
+                            type=discord.ActivityType.watching,
+                            name=f"1cy | {member_count:,} Members"))
+                else:
+                    print(
+                        f"[WARNING] Roblox API returned status {response.status}"
+                    )
+                    await bot.change_presence(
+                        status=discord.Status.dnd,
+                        activity=discord.Activity(
+                            type=discord.ActivityType.watching,
+                            name="1cy"))
+        except Exception as e:
+            print(f"[ERROR] Failed to fetch group info: {str(e)}")
+            await bot.change_presence(
+                status=discord.Status.dnd,
+                activity=discord.Activity(
+                    type=discord.ActivityType.watching, name="1cy"))
+        # Wait 60 seconds before next update
+        await asyncio.sleep(60)
+
+
+if __name__ == "__main__":
+    server_thread.start()
+    bot.run(os.getenv('DISCORD_TOKEN'))